@@ -0,0 +1,66 @@
+"""
+Import-time benchmark.
+
+Measures, in fresh interpreters, how long `import notionapi` takes and what the first
+access to the lazily loaded block models costs on top. Dependencies (requests,
+pydantic) are imported before the clock starts so that only this package is measured.
+
+Usage:
+    python benchmarks/bench_import.py [--runs N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "import notionapi": "import notionapi",
+    "import notionapi + blocks": "import notionapi; notionapi.ParagraphBlock",
+    "from notionapi import *": "from notionapi import *",
+}
+
+TIMER = """
+import time, requests, pydantic, concurrent.futures
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(statement: str, runs: int) -> list:
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", TIMER.format(statement=statement)],
+            check=True, capture_output=True, text=True, env=env
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per scenario")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    for name, statement in SCENARIOS.items():
+        timings = measure(statement, args.runs)
+        results[name] = {"median_ms": statistics.median(timings), "min_ms": min(timings)}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, result in results.items():
+        print(f"{name:30} median {result['median_ms']:7.1f} ms   min {result['min_ms']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Interning memory benchmark.
+
+Parses a synthetic query result, in which a handful of users, parents and select
+options repeat in every row, with and without an InternPool, and reports the memory
+the parsed pages hold (traced with tracemalloc) and the parse time.
+
+Usage:
+    python benchmarks/bench_interning.py [--pages N] [--users N]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notionapi import InternPool, PageObject
+
+
+def build_pages(count: int, users: int) -> list:
+    people = [
+        {"object": "user", "id": f"user-{index:04d}-0000-0000-0000-000000000000", "name": f"User {index}",
+         "avatar_url": f"https://example.com/avatars/{index}.png", "type": "person"}
+        for index in range(users)
+    ]
+    options = [{"id": f"opt{index}", "name": f"Option {index}", "color": "blue"} for index in range(5)]
+    pages = []
+    for index in range(count):
+        pages.append({
+            "object": "page",
+            "id": f"page-{index:08d}",
+            "created_time": "2024-01-01T00:00:00.000Z",
+            "last_edited_time": "2024-01-02T00:00:00.000Z",
+            "created_by": people[index % users],
+            "last_edited_by": people[(index + 1) % users],
+            "parent": {"type": "database_id", "database_id": "db-00000000-0000-0000-0000-000000000000"},
+            "archived": False,
+            "url": f"https://www.notion.so/page-{index:08d}",
+            "properties": {
+                "Stage": {"id": "%3AsT", "type": "select", "select": options[index % 5]},
+                "Tags": {"id": "tG%3D", "type": "multi_select", "multi_select": options[:index % 4 + 1]},
+                "Owner": {"id": "oW", "type": "people", "people": [people[index % users]]},
+                "Score": {"id": "sC", "type": "number", "number": index},
+            },
+        })
+    # Round-trip through JSON so that no strings are shared before parsing, as with a real response
+    return json.loads(json.dumps(pages))
+
+
+def measure(pages: list, make_pool) -> dict:
+    # Timed without tracing, which would slow down the allocation-heavy plain parse the most
+    gc.collect()
+    started = time.perf_counter()
+    pool = make_pool()
+    parsed = [PageObject.from_dict(page, pool=pool) for page in pages]
+    elapsed = time.perf_counter() - started
+    del parsed, pool
+
+    gc.collect()
+    tracemalloc.start()
+    pool = make_pool()
+    parsed = [PageObject.from_dict(page, pool=pool) for page in pages]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed, pool
+    return {"bytes": size, "seconds": elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=5000, help="pages in the result set")
+    parser.add_argument("--users", type=int, default=5, help="distinct users")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    for name, make_pool in (("plain", lambda: None), ("interned", InternPool)):
+        pages = build_pages(args.pages, args.users)
+        results[name] = measure(pages, make_pool)
+
+    if args.json:
+        print(json.dumps({"pages": args.pages, "results": results}, indent=2))
+        return
+    for name, result in results.items():
+        print(f"{name:9} {result['bytes'] / 1024 / 1024:8.2f} MiB {result['bytes'] / args.pages:8.0f} bytes/page "
+              f"{result['seconds'] * 1000:8.1f} ms")
+    saved = 1 - results["interned"]["bytes"] / results["plain"]["bytes"]
+    print(f"saved     {saved:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Process-pool decoding benchmark.
+
+Exports a synthetic database (see fixtures.py) with `DatabaseObject.iter_rows`, once
+decoding in this process and once in a process pool, against an in-memory transport
+serving pre-encoded result pages, so that only the client is measured. It reports the
+rows per second and the CPU time the parent process spends per row: the workers send
+back plain rows, which are far cheaper to receive than the pages are to decode, so
+the parent's share bounds how far the export scales with cores.
+
+Usage:
+    python benchmarks/bench_processes.py [--pages N] [--processes N] [--text-size N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import Fixtures
+
+from notionapi import InMemoryTransport, NotionAPI, TransportResponse
+
+
+def build_handler(pages: int, text_size: int):
+    fixtures = Fixtures(text_size=text_size)
+    results = [fixtures.query(100) for _ in range((pages + 99) // 100)]
+    schema = {name: {"id": value["id"], "name": name, "type": value["type"], value["type"]: {}}
+              for name, value in results[0]["results"][0]["properties"].items()}
+    bodies = []
+    for index, result in enumerate(results):
+        last = index == len(results) - 1
+        result.update(next_cursor=None if last else str(index + 1), has_more=not last)
+        bodies.append(json.dumps(result).encode("utf-8"))
+    database = json.dumps({"object": "database", "id": "bench", "properties": schema}).encode("utf-8")
+
+    def handler(method, url, headers, params, body):
+        if method == "GET":
+            return TransportResponse(200, database, {}, url)
+        return TransportResponse(200, bodies[int((body or {}).get("start_cursor") or 0)], {}, url)
+
+    return handler
+
+
+def measure(handler, executor) -> dict:
+    api = NotionAPI("bench", transport=InMemoryTransport(handler))
+    api.database.codec("bench")
+    wall, cpu = time.perf_counter(), time.process_time()
+    rows = sum(1 for _ in api.database.iter_rows("bench", executor=executor))
+    return {"rows": rows, "seconds": time.perf_counter() - wall, "parent_cpu_seconds": time.process_time() - cpu}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=10000, help="pages in the database")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--text-size", type=int, default=200, help="characters per rich text value")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    handler = build_handler(args.pages, args.text_size)
+    results = {"serial": measure(handler, None)}
+    with ProcessPoolExecutor(args.processes) as executor:
+        # Started before measuring, so that worker startup isn't counted
+        list(executor.map(abs, range(args.processes)))
+        results[f"{args.processes} processes"] = measure(handler, executor)
+
+    if args.json:
+        print(json.dumps({"pages": args.pages, "cores": os.cpu_count(), "results": results}, indent=2))
+        return
+    for name, result in results.items():
+        print(f"{name:13} {result['rows'] / result['seconds']:9.0f} rows/s "
+              f"{result['parent_cpu_seconds'] / result['rows'] * 1e6:7.1f} us parent CPU/row")
+    serial, pooled = results.values()
+    print(f"speedup       {serial['seconds'] / pooled['seconds']:9.2f}x on {os.cpu_count()} cores, "
+          f"parent CPU {serial['parent_cpu_seconds'] / pooled['parent_cpu_seconds']:.1f}x lower")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Request-body serialization benchmark.
+
+Builds large append and update payloads and compares the previous way of building
+request bodies (`.dict()` on every model, then the standard json module, as requests
+does for `json=`) with `notionapi.serialization.encode_json`.
+
+Usage:
+    python benchmarks/bench_serialization.py [--blocks N] [--properties N] [--repeat N]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notionapi import ParagraphBlock, ParagraphContent, BulletedListItemBlock, BulletedListItemContent
+from notionapi import RichTextObject, DateObject, TextType, text_to_rich_text, block_to_dict
+from notionapi.serialization import encode_json, orjson
+
+
+def build_append_payload(count: int) -> dict:
+    children = []
+    for index in range(count):
+        rich_text = text_to_rich_text(f"Paragraph {index} " + "lorem ipsum " * 20)
+        rich_text += text_to_rich_text(" bold part", annotations={"bold": True})
+        if index % 2:
+            children.append(ParagraphBlock(paragraph=ParagraphContent(rich_text=rich_text, color="default")))
+        else:
+            children.append(BulletedListItemBlock(bulleted_list_item=BulletedListItemContent(rich_text=rich_text, color="default")))
+    return {"children": children}
+
+
+def build_update_payload(count: int) -> dict:
+    properties = {}
+    for index in range(count):
+        if index % 2:
+            properties[f"Text {index}"] = RichTextObject(rich_text=[TextType(text={"content": f"value {index}", "link": None})])
+        else:
+            date = DateObject()
+            date.default = "2024-06-18"
+            properties[f"Date {index}"] = date
+    return {"properties": properties}
+
+
+def encode_with_dict(payload: dict) -> bytes:
+    data = {}
+    for key, value in payload.items():
+        if isinstance(value, list):
+            data[key] = [item.dict() for item in value]
+        else:
+            data[key] = {name: item.dict() for name, item in value.items()}
+    return json.dumps(data).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--blocks", type=int, default=1000, help="blocks in the append payload")
+    parser.add_argument("--properties", type=int, default=100, help="properties in the update payload")
+    parser.add_argument("--repeat", type=int, default=20, help="encodings per measurement")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    payloads = {
+        "append": build_append_payload(args.blocks),
+        "update": build_update_payload(args.properties),
+    }
+
+    results = {}
+    for name, payload in payloads.items():
+        before = min(timeit.repeat(lambda: encode_with_dict(payload), number=args.repeat, repeat=3)) / args.repeat
+        after = min(timeit.repeat(lambda: encode_json(payload), number=args.repeat, repeat=3)) / args.repeat
+        results[name] = {
+            "dict_json_ms": before * 1000,
+            "encode_json_ms": after * 1000,
+            "dict_json_bytes": len(encode_with_dict(payload)),
+            "encode_json_bytes": len(encode_json(payload)),
+        }
+
+    if args.json:
+        print(json.dumps({"orjson": orjson is not None, "results": results}, indent=2))
+        return
+    print(f"orjson available: {orjson is not None}")
+    for name, result in results.items():
+        print(
+            f"{name:7} .dict()+json {result['dict_json_ms']:8.2f} ms {result['dict_json_bytes']:>9} bytes   "
+            f"encode_json {result['encode_json_ms']:8.2f} ms {result['encode_json_bytes']:>9} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
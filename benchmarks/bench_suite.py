@@ -0,0 +1,264 @@
+"""
+Parsing and serialization benchmark suite.
+
+Measures the hot paths of the client on synthetic payloads (see fixtures.py):
+
+- page_from_dict: PageObject.from_dict on single pages
+- query_from_dict: DatabaseQuery.from_dict on result pages of 100 pages
+- block_from_dict: BlockObject.from_dict on a flattened block tree
+- initialize_type: initialize_type on every property value of the pages
+- serialize_update: encode_json on update bodies built from parsed page properties
+- serialize_append: encode_json on append bodies of nested block models
+
+For each, it reports the best time over several runs, what one run allocates (peak and
+retained bytes and blocks, traced with tracemalloc) and the peak RSS of the process.
+Every case runs in a fresh interpreter so that peak RSS isn't inflated by earlier
+cases. Save the results as a baseline and compare later runs against it:
+
+Usage:
+    python benchmarks/bench_suite.py --save baseline.json
+    python benchmarks/bench_suite.py --baseline baseline.json [--max-regression 10]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import DEFAULT_PROPERTY_MIX, Fixtures, parse_mix
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Metrics compared against a baseline, all lower is better
+COMPARED = ("seconds_per_item", "peak_bytes", "retained_bytes", "peak_rss_bytes")
+
+
+def _request_blocks(blocks: List[Dict[str, Any]]) -> List[Any]:
+    # Rebuilds the flattened tree as block models with nested children, as appended
+    from notionapi import (BulletedListItemBlock, BulletedListItemContent, Heading2Block, Heading2Content, NumberedListItemBlock,
+                           NumberedListItemContent, ParagraphBlock, ParagraphContent, QuoteBlock, QuoteContent, TextType,
+                           ToDoBlock, ToDoContent, block_to_dict)
+    models = {
+        "paragraph": (ParagraphBlock, ParagraphContent), "heading_2": (Heading2Block, Heading2Content),
+        "bulleted_list_item": (BulletedListItemBlock, BulletedListItemContent),
+        "numbered_list_item": (NumberedListItemBlock, NumberedListItemContent),
+        "to_do": (ToDoBlock, ToDoContent), "quote": (QuoteBlock, QuoteContent),
+    }
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    for block in blocks:
+        children.setdefault(block["parent"]["block_id"], []).append(block)
+
+    def build(block: Dict[str, Any]) -> Any:
+        block_cls, content_cls = models[block["type"]]
+        content = dict(block[block["type"]], rich_text=[TextType(**item) for item in block[block["type"]]["rich_text"]])
+        nested = [block_to_dict(build(child)) for child in children.get(block["id"], [])]
+        if nested:
+            content["children"] = nested
+        return block_cls(**{block["type"]: content_cls(**content)})
+
+    ids = {block["id"] for block in blocks}
+    return [build(block) for block in blocks if block["parent"]["block_id"] not in ids]
+
+
+def build_case(name: str, args: argparse.Namespace) -> Tuple[Any, Callable[[Any], Any], int]:
+    """
+    Returns the input of a case, the function to measure and the number of items it processes.
+    """
+    from notionapi import BlockObject, DatabaseQuery, PageObject, initialize_type
+    from notionapi.serialization import encode_json
+
+    fixtures = Fixtures(parse_mix(args.properties) if args.properties else None, text_size=args.text_size, seed=args.seed)
+    if name == "page_from_dict":
+        return fixtures.pages(args.pages), lambda pages: [PageObject.from_dict(page) for page in pages], args.pages
+    if name == "query_from_dict":
+        count = max(args.pages // 100, 1)
+        queries = [fixtures.query(100) for _ in range(count)]
+        return queries, lambda queries: [DatabaseQuery.from_dict(query) for query in queries], count * 100
+    if name == "block_from_dict":
+        blocks = fixtures.block_tree(args.blocks, depth=args.depth, fanout=args.fanout)
+        return blocks, lambda blocks: [BlockObject.from_dict(block) for block in blocks], len(blocks)
+    if name == "initialize_type":
+        values = [(value["type"], value) for page in fixtures.pages(args.pages) for value in page["properties"].values()]
+        return values, lambda values: [initialize_type(type_name, **value) for type_name, value in values], len(values)
+    if name == "serialize_update":
+        bodies = [{"properties": PageObject.from_dict(page).properties} for page in fixtures.pages(args.pages)]
+        return bodies, lambda bodies: [encode_json(body) for body in bodies], len(bodies)
+    if name == "serialize_append":
+        models = _request_blocks(fixtures.block_tree(args.blocks, depth=args.depth, fanout=args.fanout))
+        # One request body per 100 top-level blocks, as BlockAPI.append sends them
+        bodies = [{"children": models[start:start + 100]} for start in range(0, len(models), 100)]
+        return bodies, lambda bodies: [encode_json(body) for body in bodies], len(models)
+    raise ValueError(f"Unknown case: {name}")
+
+
+CASES = ("page_from_dict", "query_from_dict", "block_from_dict", "initialize_type", "serialize_update", "serialize_append")
+
+
+def _peak_rss() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_case(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    data, function, items = build_case(name, args)
+    function(data)
+
+    timings = []
+    for _ in range(args.repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = function(data)
+        timings.append(time.perf_counter() - started)
+        del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = function(data)
+    _, peak = tracemalloc.get_traced_memory()
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    statistics = snapshot.statistics("filename")
+    del result
+
+    best = min(timings)
+    return {
+        "items": items,
+        "seconds": best,
+        "seconds_per_item": best / items,
+        "peak_bytes": peak,
+        "retained_bytes": sum(stat.size for stat in statistics),
+        "retained_blocks": sum(stat.count for stat in statistics),
+        "peak_rss_bytes": _peak_rss(),
+    }
+
+
+def _environment() -> Dict[str, Any]:
+    import pydantic
+    from notionapi.serialization import orjson
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "pydantic": pydantic.VERSION,
+        "orjson": orjson is not None,
+    }
+
+
+def _parameters(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "pages": args.pages, "blocks": args.blocks, "depth": args.depth, "fanout": args.fanout, "text_size": args.text_size,
+        "properties": args.properties or ",".join(f"{name}={count}" for name, count in DEFAULT_PROPERTY_MIX.items()),
+        "repeat": args.repeat, "seed": args.seed,
+    }
+
+
+def _child_arguments(args: argparse.Namespace) -> List[str]:
+    arguments = ["--pages", str(args.pages), "--blocks", str(args.blocks), "--depth", str(args.depth), "--fanout", str(args.fanout),
+                 "--text-size", str(args.text_size), "--repeat", str(args.repeat), "--seed", str(args.seed)]
+    if args.properties:
+        arguments += ["--properties", args.properties]
+    return arguments
+
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    results = {}
+    for name in args.cases.split(","):
+        if name not in CASES:
+            raise SystemExit(f"Unknown case: {name}; choose from {', '.join(CASES)}")
+        if args.in_process:
+            results[name] = run_case(name, args)
+            continue
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--case", name] + _child_arguments(args),
+                                check=True, stdout=subprocess.PIPE, text=True).stdout
+        results[name] = json.loads(output)
+    return {"environment": _environment(), "parameters": _parameters(args), "results": results}
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], max_regression: Optional[float]) -> List[str]:
+    """
+    Prints each compared metric next to its baseline, returning the regressions beyond `max_regression` percent.
+    """
+    if report["parameters"] != baseline.get("parameters"):
+        print("warning: the baseline was measured with other parameters", file=sys.stderr)
+    regressions = []
+    print(f"{'case':18} {'metric':18} {'baseline':>14} {'current':>14} {'change':>8}")
+    for name, result in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        for metric in COMPARED:
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new / old - 1) * 100
+            print(f"{name:18} {metric:18} {old:14.6g} {new:14.6g} {change:+7.1f}%")
+            # Peak RSS is too coarse to fail on
+            if max_regression is not None and metric != "peak_rss_bytes" and change > max_regression:
+                regressions.append(f"{name} {metric} {change:+.1f}%")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=2000, help="pages for the page, query, property and update cases")
+    parser.add_argument("--blocks", type=int, default=200, help="top-level blocks for the block cases")
+    parser.add_argument("--depth", type=int, default=3, help="nesting depth of the block trees")
+    parser.add_argument("--fanout", type=int, default=2, help="children per nested block")
+    parser.add_argument("--text-size", type=int, default=200, help="characters per rich text value")
+    parser.add_argument("--properties", help="property mix, such as title=1,rich_text=3,number=2 (default: %s)"
+                        % ",".join(f"{name}={count}" for name, count in DEFAULT_PROPERTY_MIX.items()))
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case, the best is reported")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the fixtures")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated cases to run")
+    parser.add_argument("--in-process", action="store_true", help="run all cases in this interpreter, sharing its peak RSS")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    parser.add_argument("--save", metavar="PATH", help="save the results as a baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--max-regression", type=float, metavar="PERCENT",
+                        help="exit with status 1 if a time or memory metric is this much worse than the baseline")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case, args)))
+        return
+
+    report = run_suite(args)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.max_regression)
+        if regressions:
+            print("regressions: " + "; ".join(regressions), file=sys.stderr)
+            sys.exit(1)
+        return
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{'case':18} {'items':>7} {'us/item':>9} {'peak KiB':>10} {'retained KiB':>13} {'blocks':>9} {'peak RSS MiB':>13}")
+    for name, result in report["results"].items():
+        rss = f"{result['peak_rss_bytes'] / 1024 / 1024:13.1f}" if result["peak_rss_bytes"] is not None else f"{'-':>13}"
+        print(f"{name:18} {result['items']:7} {result['seconds_per_item'] * 1e6:9.1f} {result['peak_bytes'] / 1024:10.0f} "
+              f"{result['retained_bytes'] / 1024:13.0f} {result['retained_blocks']:9} {rss}")
+
+
+if __name__ == "__main__":
+    main()
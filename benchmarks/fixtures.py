@@ -0,0 +1,193 @@
+"""
+Synthetic API payloads for the benchmarks.
+
+Generates pages, query results and block trees shaped like real API responses, with a
+configurable property mix, rich text size and nesting depth. Generation is seeded, so
+that the same arguments always produce the same payloads and results stay comparable.
+"""
+import json
+import random
+from typing import Any, Dict, List, Optional
+
+PROPERTY_TYPES = ("title", "rich_text", "number", "select", "multi_select", "date", "people", "relation", "checkbox", "url", "formula")
+
+# How many properties of each type a page has by default. Checkbox values don't parse
+# with the current CheckboxObject model, so they are only generated when asked for.
+DEFAULT_PROPERTY_MIX = {
+    "title": 1, "rich_text": 3, "number": 2, "select": 2, "multi_select": 1, "date": 1,
+    "people": 1, "relation": 1, "url": 1, "formula": 1,
+}
+
+BLOCK_TYPES = ("paragraph", "heading_2", "bulleted_list_item", "numbered_list_item", "to_do", "quote")
+
+_WORDS = ("lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit", "sed", "do", "eiusmod", "tempor")
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """
+    Parses a property mix like "title=1,rich_text=3,number=2".
+    """
+    mix = {}
+    for item in text.split(","):
+        name, _, count = item.partition("=")
+        if name.strip() not in PROPERTY_TYPES:
+            raise ValueError(f"Unknown property type: {name.strip()}")
+        mix[name.strip()] = int(count or 1)
+    return mix
+
+
+class Fixtures:
+    """
+    Builds synthetic payloads.
+
+    Args:
+        property_mix (Optional[Dict[str, int]], optional): How many properties of each type a page has. Defaults to DEFAULT_PROPERTY_MIX.
+        text_size (int, optional): Characters per rich text value, split into items of at most 2000. Defaults to 200.
+        users (int, optional): Distinct users that pages and blocks are created by. Defaults to 5.
+        seed (int, optional): The random seed. Defaults to 0.
+    """
+
+    def __init__(self, property_mix: Optional[Dict[str, int]] = None, text_size: int = 200, users: int = 5, seed: int = 0):
+        self.property_mix = property_mix or DEFAULT_PROPERTY_MIX
+        self.text_size = text_size
+        self.random = random.Random(seed)
+        self.users = [{"object": "user", "id": f"{index:08x}-0000-0000-0000-000000000000"} for index in range(users)]
+        self.options = [{"id": f"opt{index}", "name": f"Option {index}", "color": "blue"} for index in range(8)]
+        self._ids = 0
+
+    def _id(self) -> str:
+        self._ids += 1
+        return f"{self._ids:08x}-1111-2222-3333-444444444444"
+
+    def _text(self, size: int) -> str:
+        words = []
+        length = 0
+        while length < size:
+            word = self.random.choice(_WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)[:size]
+
+    def rich_text(self, size: Optional[int] = None) -> List[Dict[str, Any]]:
+        text = self._text(self.text_size if size is None else size)
+        return [
+            {
+                "type": "text",
+                "text": {"content": text[start:start + 2000], "link": None},
+                "annotations": {"bold": False, "italic": False, "strikethrough": False, "underline": False, "code": False, "color": "default"},
+                "plain_text": text[start:start + 2000],
+                "href": None,
+            }
+            for start in range(0, max(len(text), 1), 2000)
+        ]
+
+    def _property(self, property_type: str) -> Dict[str, Any]:
+        value: Dict[str, Any] = {"id": self._id()[:4], "type": property_type}
+        if property_type in ("title", "rich_text"):
+            value[property_type] = self.rich_text(32 if property_type == "title" else None)
+        elif property_type == "number":
+            value["number"] = self.random.randint(0, 10_000)
+        elif property_type == "select":
+            value["select"] = self.random.choice(self.options)
+        elif property_type == "multi_select":
+            value["multi_select"] = self.random.sample(self.options, self.random.randint(1, 4))
+        elif property_type == "date":
+            value["date"] = {"start": f"2024-{self.random.randint(1, 12):02d}-{self.random.randint(1, 28):02d}", "end": None, "time_zone": None}
+        elif property_type == "people":
+            value["people"] = [self.random.choice(self.users)]
+        elif property_type == "relation":
+            value["relation"] = [{"id": self._id()} for _ in range(self.random.randint(1, 3))]
+            value["has_more"] = False
+        elif property_type == "checkbox":
+            value["checkbox"] = self.random.random() < 0.5
+        elif property_type == "url":
+            value["url"] = f"https://example.com/{self._id()}"
+        elif property_type == "formula":
+            value["formula"] = {"type": "string", "string": self._text(20)}
+        return value
+
+    def page(self, database_id: str = "db000000-0000-0000-0000-000000000000") -> Dict[str, Any]:
+        page_id = self._id()
+        properties = {}
+        for property_type, count in self.property_mix.items():
+            for index in range(count):
+                name = "Name" if property_type == "title" else f"{property_type} {index}"
+                properties[name] = self._property(property_type)
+        return {
+            "object": "page",
+            "id": page_id,
+            "created_time": "2024-01-01T00:00:00.000Z",
+            "last_edited_time": "2024-01-02T00:00:00.000Z",
+            "created_by": self.random.choice(self.users),
+            "last_edited_by": self.random.choice(self.users),
+            "cover": None,
+            "icon": None,
+            "parent": {"type": "database_id", "database_id": database_id},
+            "archived": False,
+            "in_trash": False,
+            "properties": properties,
+            "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+            "public_url": None,
+        }
+
+    def pages(self, count: int) -> List[Dict[str, Any]]:
+        return _fresh([self.page() for _ in range(count)])
+
+    def query(self, page_size: int = 100) -> Dict[str, Any]:
+        """
+        Returns one result page of a database query.
+        """
+        return _fresh({
+            "object": "list",
+            "results": [self.page() for _ in range(page_size)],
+            "next_cursor": self._id(),
+            "has_more": True,
+            "type": "page_or_database",
+            "page_or_database": {},
+        })
+
+    def block(self, parent_id: str, block_type: Optional[str] = None, has_children: bool = False) -> Dict[str, Any]:
+        block_type = block_type or self.random.choice(BLOCK_TYPES)
+        content: Dict[str, Any] = {"rich_text": self.rich_text(), "color": "default"}
+        if block_type == "to_do":
+            content["checked"] = False
+        elif block_type == "heading_2":
+            content["is_toggleable"] = False
+        return {
+            "object": "block",
+            "id": self._id(),
+            "parent": {"type": "block_id", "block_id": parent_id},
+            "created_time": "2024-01-01T00:00:00.000Z",
+            "last_edited_time": "2024-01-02T00:00:00.000Z",
+            "created_by": self.random.choice(self.users),
+            "last_edited_by": self.random.choice(self.users),
+            "has_children": has_children,
+            "archived": False,
+            "in_trash": False,
+            "type": block_type,
+            block_type: content,
+        }
+
+    def block_tree(self, count: int, depth: int = 2, fanout: int = 3) -> List[Dict[str, Any]]:
+        """
+        Returns `count` top-level blocks, each with `fanout` children per level down to `depth`
+        levels, flattened depth first as a full walk would retrieve them.
+        """
+        blocks = []
+
+        def add(parent_id: str, level: int) -> None:
+            block = self.block(parent_id, has_children=level < depth)
+            blocks.append(block)
+            if level < depth:
+                for _ in range(fanout):
+                    add(block["id"], level + 1)
+
+        root = self._id()
+        for _ in range(count):
+            add(root, 1)
+        return _fresh(blocks)
+
+
+def _fresh(value: Any) -> Any:
+    # Round-trip through JSON so that no objects or strings are shared, as with a real response
+    return json.loads(json.dumps(value))
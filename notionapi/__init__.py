@@ -1,3 +1,67 @@
+import importlib
 from .notionapi import *
 from .types import *
-from .blocks import *
+from .serialization import *
+from .transport import *
+from .deadlines import DeadlineExceeded, deadline
+
+# Block models, the Markdown importer, rarely used property models and optional
+# tools are only built on first access, which keeps `import notionapi` cheap. Each
+# module is listed with the names it exports, so a lookup imports only that module.
+_LAZY_MODULES = {
+    ".blocks": (
+        "BookmarkContent", "BookmarkBlock", "BreadcrumbBlock", "BulletedListItemContent", "BulletedListItemBlock", "CalloutContent",
+        "CalloutBlock", "ChildDatabaseContent", "ChildDatabaseBlock", "ChildPageContent", "ChildPageBlock", "CodeContent", "CodeBlock",
+        "ColumnListContent", "ColumnListBlock", "ColumnContent", "ColumnBlock", "DividerContent", "DividerBlock", "EmbedContent",
+        "EmbedBlock", "EquationContent", "EquationBlock", "FileContent", "FileBlock", "Heading1Content", "Heading1Block",
+        "Heading2Content", "Heading2Block", "Heading3Content", "Heading3Block", "ImageContent", "ImageBlock", "LinkPreviewContent",
+        "LinkPreviewBlock", "MentionContent", "MentionBlock", "NumberedListItemContent", "NumberedListItemBlock", "ParagraphContent",
+        "ParagraphBlock", "PDFContent", "PDFBlock", "QuoteContent", "QuoteBlock", "SyncedBlockContent", "SyncedBlock", "TableContent",
+        "TableBlock", "TableRowContent", "TableRowBlock", "TableOfContentsContent", "TableOfContentsBlock", "TemplateContent",
+        "TemplateBlock", "ToDoContent", "ToDoBlock", "ToggleContent",
+    ),
+    ".markdown": (
+        "RICH_TEXT_ITEMS_LIMIT", "CODE_LANGUAGES", "CODE_LANGUAGE_ALIASES", "parse_inline", "markdown_to_blocks", "rich_text_to_markdown",
+        "blocks_to_markdown",
+    ),
+    ".extra_types": (
+        "CreatedByObject", "EmailType", "EmailObject", "FileObject", "FilesType", "FilesObject", "LastEditedByType", "LastEditedByObject",
+        "NumberType", "NumberObject", "PhoneNumberType", "PhoneNumberObject", "StatusType", "StatusObject", "UniqueIDType",
+        "UniqueIDObject", "VerificationType", "VerificationObject",
+    ),
+    ".poller": ("ChangeEvent", "ChangePoller"),
+    ".ratelimit": ("DEFAULT_RATE", "RateLimiter"),
+    ".crawler": ("CrawlItem", "WorkspaceCrawler"),
+    ".scheduler": ("PriorityClass", "DEFAULT_CLASSES", "RequestScheduler", "ScheduledTransport"),
+    ".pool": ("PooledNotionAPI",),
+    ".writebuffer": ("WriteBehindBuffer",),
+    ".codec": ("PropertyValueError", "READ_ONLY_TYPES", "DatabaseCodec"),
+    ".checkpoint": (
+        "CheckpointStore", "MemoryCheckpointStore", "FileCheckpointStore", "query_hash", "query_checkpoint", "query_checkpoint_key",
+        "walk_checkpoint_key",
+    ),
+    ".tables": ("cell_to_rich_text", "cell_text", "table_values", "table_row_block", "table_block", "to_dataframe"),
+    ".bulk": (
+        "BulkResult", "RETRIED_STATUS_CODES", "RETRIED", "CREATE_RETRIED", "run_bulk", "matching_page_ids", "bulk_checkpoint_key",
+        "KeyIndex", "UpsertResult", "upsert_rows",
+    ),
+    ".mirror": ("MirrorResult", "DatabaseMirror"),
+}
+
+_LAZY_NAMES = {name: module_name for module_name, names in _LAZY_MODULES.items() for name in names}
+
+
+def __getattr__(name: str):
+    if name == "__all__":
+        names = [name for name in globals() if not name.startswith("_")]
+        return sorted(set(names) | set(_LAZY_NAMES))
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return __getattr__("__all__")
@@ -1,6 +1,7 @@
-from typing import List, Optional, Dict, Any
+from typing import ClassVar, List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel
 from .types import *
+from .serialization import block_to_dict, get_block_type, get_block_children
 
 
 #
@@ -8,7 +9,7 @@ from .types import *
 #
 
 class BookmarkContent(BaseModel):
-    caption: List[RichTextObject]
+    caption: List[TextType]
     url: str
 
 class BookmarkBlock(BaseModel):
@@ -30,7 +31,7 @@ class BreadcrumbBlock(BaseModel):
 #
 
 class BulletedListItemContent(BaseModel):
-    rich_text: List[RichTextObject]
+    rich_text: List[TextType]
     color: str
     children: Optional[List[Dict[str, Any]]] = None
 
@@ -44,7 +45,7 @@ class BulletedListItemBlock(BaseModel):
 #
 
 class CalloutContent(BaseModel):
-    rich_text: List[RichTextObject]
+    rich_text: List[TextType]
     icon: Optional[Dict[str, Any]] = None
     color: str
 
@@ -82,8 +83,8 @@ class ChildPageBlock(BaseModel):
 #
 
 class CodeContent(BaseModel):
-    caption: List[RichTextObject]
-    rich_text: List[RichTextObject]
+    caption: List[TextType]
+    rich_text: List[TextType]
     language: str
 
 class CodeBlock(BaseModel):
@@ -151,7 +152,7 @@ class EquationBlock(BaseModel):
 #
 
 class FileContent(BaseModel):
-    caption: List[RichTextObject]
+    caption: List[TextType]
     file_type: str
     file: Dict[str, Any]
     name: str
@@ -166,7 +167,7 @@ class FileBlock(BaseModel):
 #
 
 class Heading1Content(BaseModel):
-    rich_text: List[RichTextObject]
+    rich_text: List[TextType]
     color: str
     is_toggleable: bool
 
@@ -175,7 +176,7 @@ class Heading1Block(BaseModel):
     heading_1: Heading1Content
 
 class Heading2Content(BaseModel):
-    rich_text: List[RichTextObject]
+    rich_text: List[TextType]
     color: str
     is_toggleable: bool
 
@@ -184,7 +185,7 @@ class Heading2Block(BaseModel):
     heading_2: Heading2Content
 
 class Heading3Content(BaseModel):
-    rich_text: List[RichTextObject]
+    rich_text: List[TextType]
     color: str
     is_toggleable: bool
 
@@ -201,10 +202,14 @@ class ImageContent(BaseModel):
     image_type: str = "external"
     external: Dict[str, Any] = {"url": ""}
 
+    serialize_exclude: ClassVar[Tuple[str, ...]] = ('image_type',)
+
 class ImageBlock(BaseModel):
     type: str = "image"
     image: ImageContent = ImageContent()
 
+    serialize_exclude: ClassVar[Tuple[str, ...]] = ('type',)
+
     def __init__(self, image_url: str = None, **kwargs):
         """
         Initializes an ImageBlock with an optional image URL. If an image URL is provided, it sets the URL in the image content.
@@ -262,7 +267,7 @@ class MentionBlock(BaseModel):
 #
 
 class NumberedListItemContent(BaseModel):
-    rich_text: List[RichTextObject]
+    rich_text: List[TextType]
     color: str
     children: Optional[List[Dict[str, Any]]] = None
 
@@ -276,7 +281,7 @@ class NumberedListItemBlock(BaseModel):
 #
 
 class ParagraphContent(BaseModel):
-    rich_text: List[RichTextObject]
+    rich_text: List[TextType]
     color: str
     children: Optional[List[Dict[str, Any]]] = None
 
@@ -290,7 +295,7 @@ class ParagraphBlock(BaseModel):
 #
 
 class PDFContent(BaseModel):
-    caption: List[RichTextObject]
+    caption: List[TextType]
     pdf_type: str
     external: Dict[str, Any]
 
@@ -304,7 +309,7 @@ class PDFBlock(BaseModel):
 #
 
 class QuoteContent(BaseModel):
-    rich_text: List[RichTextObject]
+    rich_text: List[TextType]
     color: str
     children: Optional[List[Dict[str, Any]]] = None
 
@@ -334,13 +339,14 @@ class TableContent(BaseModel):
     table_width: int
     has_column_header: bool
     has_row_header: bool
+    children: Optional[List[Dict[str, Any]]] = None
 
 class TableBlock(BaseModel):
     type: str = "table"
     table: TableContent
 
 class TableRowContent(BaseModel):
-    cells: List[List[RichTextObject]]
+    cells: List[List[TextType]]
 
 class TableRowBlock(BaseModel):
     type: str = "table_row"
@@ -359,7 +365,7 @@ class TableOfContentsBlock(BaseModel):
 #
 
 class TemplateContent(BaseModel):
-    rich_text: List[RichTextObject]
+    rich_text: List[TextType]
     children: Optional[List[Dict[str, Any]]] = None
 
 class TemplateBlock(BaseModel):
@@ -372,7 +378,7 @@ class TemplateBlock(BaseModel):
 #
 
 class ToDoContent(BaseModel):
-    rich_text: List[RichTextObject]
+    rich_text: List[TextType]
     checked: Optional[bool] = None
     color: str
     children: Optional[List[Dict[str, Any]]] = None
@@ -387,7 +393,7 @@ class ToDoBlock(BaseModel):
 #
 
 class ToggleContent(BaseModel):
-    rich_text: List[RichTextObject]
+    rich_text: List[TextType]
     color: str
     children: Optional[List[Any]] = None
 
@@ -0,0 +1,316 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, List, Optional, Union
+
+import requests
+from pydantic import BaseModel
+
+from .checkpoint import CheckpointStore, query_hash
+from .deadlines import DeadlineExceeded, propagate, remaining
+from .ratelimit import RateLimiter
+
+
+class BulkResult(BaseModel):
+    """
+    The outcome of a bulk operation on pages.
+
+    Attributes:
+        matched (int): How many pages were found to work on.
+        succeeded (List[str]): The IDs of the pages that were changed, or would be in a dry run.
+        failed (Dict[str, str]): The error for each page that couldn't be changed, by page ID.
+    """
+    matched: int = 0
+    succeeded: List[str] = []
+    failed: Dict[str, str] = {}
+
+
+# Status codes worth retrying: conflicts, rate limiting and server errors
+RETRIED_STATUS_CODES = (409, 429, 500, 502, 503, 504)
+
+# What idempotent requests are retried on: lost connections and the status codes above
+RETRIED = (requests.exceptions.ConnectionError,) + RETRIED_STATUS_CODES
+
+# What creates are retried on: only rate limiting, which the server rejects before applying the
+# request. After a lost connection, a conflict or a server error the page may exist already, and
+# creating it again would duplicate it.
+CREATE_RETRIED = (429,)
+
+
+def _retry_after(error: Exception, retry_on: Collection = RETRIED) -> Optional[float]:
+    """
+    Returns how long to wait before retrying a failed request, or None if it shouldn't be retried.
+
+    `retry_on` holds the status codes and exception types to retry.
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        errors = tuple(entry for entry in retry_on if isinstance(entry, type))
+        return 0.0 if errors and isinstance(error, errors) else None
+    if response.status_code not in retry_on:
+        return None
+    try:
+        return float(response.headers.get("Retry-After", 1)) if response.status_code == 429 else 0.0
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def run_bulk(page_ids: Iterable[str], work: Callable[[str], Any], concurrency: int = 4, limiter: Optional[RateLimiter] = None,
+             max_retries: int = 2, progress: Optional[Callable[[BulkResult], None]] = None, checkpoint: Optional[CheckpointStore] = None,
+             key: Optional[str] = None, checkpoint_every: int = 100,
+             retry_on: Union[Collection, Callable[[str], Collection]] = RETRIED) -> BulkResult:
+    """
+    Runs `work` on each page ID with at most `concurrency` requests in flight, taking IDs
+    from the iterable only as workers free up.
+
+    Failed requests are retried up to `max_retries` times if their error is in `retry_on`,
+    status codes and exception types, or in what `retry_on` returns for the page ID. By
+    default they are retried after lost connections, rate limiting, conflicts and server
+    errors, which suits idempotent work only; creates should pass CREATE_RETRIED. A 429
+    pauses the limiter for its Retry-After time, or without a limiter holds back all
+    further requests for that long.
+    With a checkpoint store, the pages done and failed so far are saved every
+    `checkpoint_every` pages under `key`, pages done in an earlier run are skipped, and
+    the checkpoint is deleted at the end.
+    """
+    result = BulkResult()
+    state = checkpoint.load(key) if checkpoint is not None else None
+    if state is not None:
+        result = BulkResult(matched=state["matched"], succeeded=state["succeeded"], failed=state["failed"])
+    done = set(result.succeeded)
+    attempts: Dict[str, int] = {}
+
+    def save() -> None:
+        if checkpoint is not None:
+            checkpoint.save(key, {"kind": "bulk", "matched": result.matched, "succeeded": result.succeeded, "failed": result.failed})
+
+    def call(page_id: str) -> Any:
+        if limiter and not limiter.acquire(timeout=remaining()):
+            raise DeadlineExceeded("Deadline exceeded waiting for the rate limit")
+        return work(page_id)
+
+    call = propagate(call)
+    pending: List[str] = []
+    source: Iterator[str] = iter(page_ids)
+    exhausted = False
+    in_flight: Dict[Any, str] = {}
+    unsaved = 0
+    stopped: Optional[DeadlineExceeded] = None
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            while stopped is None and len(in_flight) < concurrency and (pending or not exhausted):
+                if pending:
+                    page_id = pending.pop()
+                else:
+                    try:
+                        page_id = next(source, None)
+                    except DeadlineExceeded as e:
+                        stopped, page_id = e, None
+                    if page_id is None:
+                        exhausted = True
+                        break
+                    if page_id in done:
+                        continue
+                    if page_id not in result.failed:
+                        result.matched += 1
+                result.failed.pop(page_id, None)
+                in_flight[executor.submit(call, page_id)] = page_id
+            if not in_flight:
+                break
+
+            finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in finished:
+                page_id = in_flight.pop(future)
+                try:
+                    future.result()
+                except DeadlineExceeded as e:
+                    # Requests already sent may still succeed, so they are waited for and recorded
+                    # before saving; pages that ran out of time are found again when resuming
+                    stopped = e
+                    result.matched -= 1
+                    continue
+                except Exception as e:
+                    delay = _retry_after(e, retry_on(page_id) if callable(retry_on) else retry_on)
+                    attempts[page_id] = attempts.get(page_id, 0) + 1
+                    if delay is not None and attempts[page_id] <= max_retries:
+                        if delay and limiter:
+                            limiter.pause(delay)
+                        elif delay:
+                            # Nothing else paces the requests, so none is sent before Retry-After
+                            try:
+                                left = remaining()
+                            except DeadlineExceeded as e:
+                                stopped = e
+                            else:
+                                time.sleep(delay if left is None else min(delay, left))
+                        pending.append(page_id)
+                        continue
+                    result.failed[page_id] = str(e)
+                else:
+                    result.succeeded.append(page_id)
+                    done.add(page_id)
+
+                if progress:
+                    progress(result)
+                unsaved += 1
+                if unsaved >= checkpoint_every:
+                    save()
+                    unsaved = 0
+
+    if stopped is not None:
+        result.matched -= len(pending)
+        save()
+        raise stopped
+    if checkpoint is not None:
+        checkpoint.delete(key)
+    return result
+
+
+def matching_page_ids(database: Any, database_id: str, filter: Optional[Dict[str, Any]], repeat: bool) -> Iterator[str]:
+    """
+    Yields the IDs of the pages matching a filter, each once.
+
+    Archiving pages while paginating can make the remaining cursor pages skip rows, so
+    with `repeat` the query is run again after each pass until a pass finds nothing new.
+    """
+    seen = set()
+    while True:
+        found = 0
+        query: Dict[str, Any] = {"page_size": 100}
+        if filter:
+            query["filter"] = filter
+        while True:
+            # Only the IDs are needed, so only the title, which every page has, is retrieved
+            data = database._query(database_id, query, filter_properties=["title"])
+            for page in data.get("results", []):
+                if page["id"] not in seen:
+                    seen.add(page["id"])
+                    found += 1
+                    yield page["id"]
+            if not data.get("has_more"):
+                break
+            query["start_cursor"] = data.get("next_cursor")
+        if not repeat or not found:
+            return
+
+
+def bulk_checkpoint_key(kind: str, scope: str, target: Any) -> str:
+    return f"{kind}:{scope}:{query_hash({'target': target})}"
+
+
+class KeyIndex:
+    """
+    Maps the values of a key property to the pages of a database, with each page's decoded property values.
+
+    Built by `DatabaseObject.key_index` with one scan, and kept up to date by
+    `DatabaseObject.upsert_many` as it creates and updates pages, so that it can be
+    passed to later upserts instead of scanning again.
+
+    Attributes:
+        key_property (str): The name of the key property.
+        pages (Dict[Any, str]): The page ID for each key value.
+        values (Dict[str, Dict[str, Any]]): The decoded property values of each page, by page ID.
+        duplicates (List[str]): Pages whose key an earlier page already had; upserts leave them alone.
+    """
+
+    def __init__(self, key_property: str):
+        self.key_property = key_property
+        self.pages: Dict[Any, str] = {}
+        self.values: Dict[str, Dict[str, Any]] = {}
+        self.duplicates: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.pages
+
+    def add(self, page_id: str, values: Dict[str, Any]) -> None:
+        key = values.get(self.key_property)
+        if self.pages.get(key, page_id) != page_id:
+            self.duplicates.append(page_id)
+            return
+        self.pages[key] = page_id
+        self.values[page_id] = values
+
+
+class UpsertResult(BaseModel):
+    """
+    The outcome of an upsert.
+
+    Attributes:
+        created (Dict[Any, str]): The ID of each new page, by key.
+        updated (List[str]): The IDs of the pages whose properties changed.
+        unchanged (int): How many rows already matched their page.
+        failed (Dict[Any, str]): The error for each row that couldn't be written, including invalid values, by key.
+    """
+    created: Dict[Any, str] = {}
+    updated: List[str] = []
+    unchanged: int = 0
+    failed: Dict[Any, str] = {}
+
+
+def upsert_rows(database: Any, database_id: str, key_property: str, rows: Iterable[Dict[str, Any]], index: Optional[KeyIndex] = None,
+                concurrency: int = 4, allow_new_options: bool = False, limiter: Optional[RateLimiter] = None, max_retries: int = 2,
+                progress: Optional[Callable[[BulkResult], None]] = None) -> UpsertResult:
+    """
+    Implements DatabaseObject.upsert_many; see there.
+    """
+    from .codec import PropertyValueError
+
+    codec = database.codec(database_id, allow_new_options=allow_new_options)
+    if key_property not in codec.types:
+        raise ValueError(f"No property {key_property!r} in database {database_id}")
+    if index is None:
+        index = database.key_index(database_id, key_property)
+
+    # Later rows for the same key win, so that every key is written once
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for row in rows:
+        merged.setdefault(row[key_property], {}).update(row)
+
+    result = UpsertResult()
+    operations: Dict[str, tuple] = {}
+    for key, values in merged.items():
+        try:
+            encoded = codec.encode(values)
+        except PropertyValueError as e:
+            result.failed[key] = str(e)
+            continue
+        # Compared as decoded, so that equal values in different notations don't count as changes
+        decoded = codec.decode({"properties": encoded})
+        page_id = index.pages.get(key)
+        if page_id is None:
+            operations[str(len(operations))] = (key, None, encoded, decoded)
+            continue
+        current = index.values[page_id]
+        changed = {name: encoded[name] for name in encoded if decoded[name] != current.get(name)}
+        if changed:
+            operations[str(len(operations))] = (key, page_id, changed, {name: decoded[name] for name in changed})
+        else:
+            result.unchanged += 1
+
+    def write(operation_id: str) -> None:
+        key, page_id, properties, decoded = operations[operation_id]
+        if page_id is None:
+            page = database.api.page._create({"parent": {"database_id": database_id}, "properties": properties})
+            operations[operation_id] = (key, page["id"], properties, decoded)
+        else:
+            database.api.page._patch_properties(page_id, properties)
+
+    def retry_on(operation_id: str) -> Collection:
+        # Updates are idempotent, creates only safe to repeat when the server rejected them
+        return RETRIED if operations[operation_id][1] is not None else CREATE_RETRIED
+
+    outcome = run_bulk(list(operations), write, concurrency=concurrency, limiter=limiter, max_retries=max_retries, progress=progress,
+                       retry_on=retry_on)
+    for operation_id in outcome.succeeded:
+        key, page_id, _, decoded = operations[operation_id]
+        if key in index:
+            result.updated.append(page_id)
+            index.values[page_id].update(decoded)
+        else:
+            result.created[key] = page_id
+            index.add(page_id, decoded)
+    for operation_id, error in outcome.failed.items():
+        result.failed[operations[operation_id][0]] = error
+    return result
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class CheckpointStore:
+    """
+    Where resumable iterators keep their progress. Implement `load`, `save` and `delete`
+    to keep checkpoints in a database, a cache or object storage.
+
+    States are small JSON-serializable dicts, identified by a string key.
+    """
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the state saved under `key`, or None.
+        """
+        raise NotImplementedError
+
+    def save(self, key: str, state: Dict[str, Any]) -> None:
+        """
+        Saves `state` under `key`, replacing any earlier state.
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """
+        Removes the state saved under `key`, if any.
+        """
+        raise NotImplementedError
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """
+    Keeps checkpoints in memory, to resume after errors within one process.
+    """
+
+    def __init__(self):
+        self.states: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, key):
+        with self._lock:
+            state = self.states.get(key)
+            return json.loads(json.dumps(state)) if state is not None else None
+
+    def save(self, key, state):
+        with self._lock:
+            self.states[key] = json.loads(json.dumps(state))
+
+    def delete(self, key):
+        with self._lock:
+            self.states.pop(key, None)
+
+
+class FileCheckpointStore(CheckpointStore):
+    """
+    Keeps each checkpoint in a JSON file in a directory, to resume after the process dies.
+    Files are replaced atomically, so a crash while saving leaves the previous checkpoint.
+
+    Args:
+        directory (str): The directory for the checkpoint files, created if missing.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, key):
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key, state):
+        path = self._path(key)
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(dict(state, key=key), f)
+        os.replace(temporary, path)
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+def query_hash(query: Dict[str, Any]) -> str:
+    """
+    Returns a hash of a database query identifying it across runs, ignoring its start_cursor.
+    """
+    canonical = {key: value for key, value in query.items() if key != "start_cursor"}
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def _projected(query: Dict[str, Any], properties: Optional[List[str]]) -> Dict[str, Any]:
+    # Rows saved under one projection lack the values of another, so it is part of the query's identity
+    return query if properties is None else {**query, "filter_properties": sorted(properties)}
+
+
+def query_checkpoint(database_id: str, query: Dict[str, Any], next_cursor: Optional[str], rows_processed: int,
+                     properties: Optional[List[str]] = None) -> Dict[str, Any]:
+    return {
+        "kind": "query",
+        "database_id": database_id,
+        "query_hash": query_hash(_projected(query, properties)),
+        "next_cursor": next_cursor,
+        "rows_processed": rows_processed,
+        "updated": time.time(),
+    }
+
+
+def query_checkpoint_key(database_id: str, query: Dict[str, Any], properties: Optional[List[str]] = None) -> str:
+    return f"query:{database_id}:{query_hash(_projected(query, properties))}"
+
+
+def walk_checkpoint_key(block_id: str, max_depth: Optional[int]) -> str:
+    return f"walk:{block_id}:{max_depth}"
@@ -0,0 +1,428 @@
+"""
+The `notionapi` command, for running and tuning large transfers without writing Python.
+
+    notionapi export database DATABASE_ID [-o rows.ndjson] [--properties Name,Status] [--filter JSON] [--raw] [--processes 4]
+    notionapi export page PAGE_ID [-o page.md] [--format markdown|ndjson]
+    notionapi sync DATABASE_ID mirror.ndjson [--reconcile] [--every SECONDS]
+    notionapi import DATABASE_ID rows.csv [--key ExtID] [--concurrency 4] [--allow-new-options]
+    notionapi bench [--pages 5000] [--latency 0.05] [--mode rows|pages] [--processes 4]
+
+Commands that talk to Notion take the token from --token or the NOTION_TOKEN
+environment variable and pace their requests with --rate. While they run, they print
+requests per second, rate limit waits and bytes transferred to stderr.
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+from .notionapi import NotionAPI
+from .ratelimit import DEFAULT_RATE, RateLimiter
+from .transport import HTTPXTransport, InMemoryTransport, MeteredTransport, RequestsTransport, Transport
+
+
+class _Monitor:
+    """
+    Prints the throughput of a command to stderr every `interval` seconds, on one
+    updating line on a terminal, and a summary when it stops.
+    """
+
+    def __init__(self, transport: MeteredTransport, stream: TextIO = sys.stderr, interval: float = 1.0, enabled: bool = True):
+        self.transport = transport
+        self.stream = stream
+        self.interval = interval
+        self.enabled = enabled
+        self.items = 0
+        self.unit = "rows"
+        self._tty = stream.isatty()
+        self._started = time.monotonic()
+        self._first = self._last = (self._started, 0, 0)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> '_Monitor':
+        self.items = 0
+        self._started = time.monotonic()
+        self._first = self._last = (self._started, self.transport.stats()["requests"], 0)
+        self._stopped.clear()
+        if self.enabled:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopped.set()
+        if self.enabled:
+            self._thread.join()
+            self.stream.write(("\r\033[K" if self._tty else "") + self.line(final=True) + "\n")
+            self.stream.flush()
+
+    def _run(self) -> None:
+        ticks = 0
+        while not self._stopped.wait(self.interval):
+            ticks += 1
+            # Off a terminal every line stays, so they are printed less often
+            if self._tty:
+                self.stream.write("\r\033[K" + self.line())
+            elif ticks % 10 == 0:
+                self.stream.write(self.line() + "\n")
+            self.stream.flush()
+
+    def line(self, final: bool = False) -> str:
+        stats = self.transport.stats()
+        now = time.monotonic()
+        if final:
+            since, requests, items = self._first
+        else:
+            since, requests, items = self._last
+            self._last = (now, stats["requests"], self.items)
+        elapsed = max(now - since, 1e-9)
+        total = now - self._started
+        return (f"{self.unit} {self.items} ({(self.items - items) / elapsed:.1f}/s) | "
+                f"requests {stats['requests']} ({(stats['requests'] - requests) / elapsed:.1f}/s), errors {stats['errors']} | "
+                f"rate limit waits {stats['waits']} ({stats['wait_seconds']:.1f}s), 429s {stats['throttled']} | "
+                f"in {_megabytes(stats['bytes_received'])}, out {_megabytes(stats['bytes_sent'])} | "
+                f"{int(total // 60):02d}:{int(total % 60):02d}")
+
+
+def _megabytes(count: int) -> str:
+    return f"{count / 1024 / 1024:.1f} MiB"
+
+
+def _client(args: argparse.Namespace, transport: Optional[Transport] = None, rate: Optional[float] = DEFAULT_RATE):
+    if transport is None:
+        transport = HTTPXTransport() if args.http2 else RequestsTransport(pool_maxsize=max(16, getattr(args, "concurrency", 0)))
+    rate = args.rate if args.rate is not None else rate
+    metered = MeteredTransport(transport, limiter=RateLimiter(rate=rate) if rate else None)
+    token = args.token or os.environ.get("NOTION_TOKEN")
+    if not token and not isinstance(transport, InMemoryTransport):
+        raise SystemExit("error: pass --token or set NOTION_TOKEN")
+    api = NotionAPI(token or "mock", transport=metered, timeout=args.timeout)
+    return api, _Monitor(metered, interval=args.stats_interval, enabled=not args.quiet)
+
+
+def _output(path: Optional[str]) -> TextIO:
+    return sys.stdout if path in (None, "-") else open(path, "w", encoding="utf-8")
+
+
+def _properties(text: Optional[str]) -> Optional[List[str]]:
+    return [name.strip() for name in text.split(",") if name.strip()] if text else None
+
+
+def _executor(processes: Optional[int]):
+    # A process pool for decoding rows, or nothing to decode them in this process
+    if processes:
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(processes)
+    return contextlib.nullcontext()
+
+
+def export_database(args: argparse.Namespace) -> None:
+    api, monitor = _client(args)
+    query: Dict[str, Any] = {"page_size": 100}
+    if args.filter:
+        query["filter"] = json.loads(args.filter)
+    properties = _properties(args.properties)
+    out = _output(args.output)
+    try:
+        with api, monitor:
+            if args.raw:
+                # Page payloads as the API returns them, without decoding
+                database = api.database
+                filter_properties = database._projection(args.database_id, properties)
+                while True:
+                    data = database._query(args.database_id, query, filter_properties=filter_properties)
+                    for page in data.get("results", []):
+                        out.write(json.dumps(page) + "\n")
+                        monitor.items += 1
+                    if not data.get("has_more"):
+                        break
+                    query["start_cursor"] = data.get("next_cursor")
+            else:
+                with _executor(args.processes) as executor:
+                    for page_id, row in api.database.iter_rows(args.database_id, query, properties=properties, executor=executor):
+                        out.write(json.dumps({"id": page_id, "properties": row}, default=str) + "\n")
+                        monitor.items += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def export_page(args: argparse.Namespace) -> None:
+    from .markdown import blocks_to_markdown
+
+    api, monitor = _client(args)
+    monitor.unit = "blocks"
+    out = _output(args.output)
+
+    def counted(blocks):
+        for block in blocks:
+            monitor.items += 1
+            yield block
+
+    try:
+        with api, monitor:
+            blocks = counted(api.page.block.walk(args.page_id, max_depth=args.max_depth))
+            if args.format == "markdown":
+                for chunk in blocks_to_markdown(blocks):
+                    out.write(chunk)
+            else:
+                for block in blocks:
+                    out.write(json.dumps(block) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def sync(args: argparse.Namespace) -> None:
+    from .mirror import DatabaseMirror
+
+    api, monitor = _client(args)
+    mirror = DatabaseMirror(api, args.database_id, args.path, properties=_properties(args.properties))
+
+    def progress(result) -> None:
+        monitor.items = result.fetched
+
+    with api:
+        while True:
+            with monitor:
+                result = mirror.sync(reconcile=args.reconcile, progress=progress)
+            print(f"fetched {result.fetched}, changed {result.changed}, removed {result.removed}, "
+                  f"{result.rows} rows up to {result.watermark}", file=sys.stderr)
+            if not args.every:
+                return
+            time.sleep(args.every)
+
+
+_TRUE = {"true", "yes", "y", "1", "x", "checked"}
+_FALSE = {"false", "no", "n", "0", ""}
+_LIST_TYPES = ("multi_select", "relation", "people", "files")
+
+
+def _csv_value(property_type: str, text: str) -> Any:
+    """
+    Converts a CSV cell to the plain value DatabaseCodec encodes for a property type. Lists are comma-separated.
+    Cells that don't convert are passed on as they are, for the codec to report.
+    """
+    if property_type in ("title", "rich_text"):
+        return text
+    text = text.strip()
+    if property_type in _LIST_TYPES:
+        return [item.strip() for item in text.split(",") if item.strip()]
+    if property_type == "checkbox":
+        lowered = text.lower()
+        return True if lowered in _TRUE else False if lowered in _FALSE else text
+    if not text:
+        return None
+    if property_type == "number":
+        try:
+            return int(text)
+        except ValueError:
+            try:
+                return float(text)
+            except ValueError:
+                return text
+    return text
+
+
+def import_csv(args: argparse.Namespace) -> None:
+    from .bulk import CREATE_RETRIED, run_bulk
+    from .codec import PropertyValueError
+
+    api, monitor = _client(args)
+    with api:
+        codec = api.database.codec(args.database_id, allow_new_options=args.allow_new_options)
+        with open(args.path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            # An "id" column, as in exports, is not a property
+            columns = [column for column in reader.fieldnames or [] if column != "id"]
+            unknown = [column for column in columns if column not in codec.types]
+            if unknown:
+                raise SystemExit(f"error: no such properties in the database: {', '.join(unknown)}")
+            rows = [{column: _csv_value(codec.types[column], row[column] or "") for column in columns} for row in reader]
+
+        def progress(result) -> None:
+            monitor.items = len(result.succeeded) + len(result.failed)
+
+        failed: Dict[Any, str] = {}
+        with monitor:
+            if args.key:
+                result = api.database.upsert_many(args.database_id, args.key, rows, concurrency=args.concurrency,
+                                                  allow_new_options=args.allow_new_options, progress=progress)
+                failed.update(result.failed)
+                summary = f"created {len(result.created)}, updated {len(result.updated)}, unchanged {result.unchanged}"
+            else:
+                bodies: Dict[str, Dict[str, Any]] = {}
+                for line, row in enumerate(rows, start=2):
+                    try:
+                        bodies[str(line)] = {"parent": {"database_id": args.database_id}, "properties": codec.encode(row)}
+                    except PropertyValueError as e:
+                        failed[f"line {line}"] = str(e)
+                # Creates are retried only when rate limited; a row that failed otherwise may have been
+                # created anyway, so it is reported rather than created twice
+                outcome = run_bulk(list(bodies), lambda line: api.page._create(bodies[line]), concurrency=args.concurrency, progress=progress,
+                                   retry_on=CREATE_RETRIED)
+                failed.update({f"line {line}": error for line, error in outcome.failed.items()})
+                summary = f"created {len(outcome.succeeded)}"
+
+    print(f"{summary}, failed {len(failed)}", file=sys.stderr)
+    for key, error in list(failed.items())[:20]:
+        print(f"  {key}: {error}", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+_MOCK_TYPES = ("rich_text", "number", "select", "multi_select", "date", "url")
+
+
+def _mock_database(pages: int, columns: int, text_size: int, latency: float) -> Callable:
+    """
+    Returns an InMemoryTransport handler serving one database of synthetic pages, honoring
+    start_cursor, page_size and filter_properties, after `latency` seconds per request.
+    """
+    schema: Dict[str, Any] = {"Name": {"id": "title", "name": "Name", "type": "title", "title": {}}}
+    options = [{"id": f"o{index}", "name": f"Option {index}", "color": "default"} for index in range(8)]
+    for index in range(columns):
+        property_type = _MOCK_TYPES[index % len(_MOCK_TYPES)]
+        config = {"options": options} if property_type in ("select", "multi_select") else {}
+        schema[f"{property_type} {index}"] = {"id": f"p{index}", "name": f"{property_type} {index}", "type": property_type, property_type: config}
+
+    def text(value: str) -> List[Dict[str, Any]]:
+        return [{"type": "text", "text": {"content": value, "link": None}, "plain_text": value, "href": None,
+                 "annotations": {"bold": False, "italic": False, "strikethrough": False, "underline": False, "code": False, "color": "default"}}]
+
+    def value(property_type: str, row: int) -> Any:
+        if property_type == "rich_text":
+            return text((f"row {row} " * text_size)[:text_size])
+        if property_type == "number":
+            return row
+        if property_type == "select":
+            return options[row % len(options)]
+        if property_type == "multi_select":
+            return options[:row % 4]
+        if property_type == "date":
+            return {"start": f"2024-01-{row % 28 + 1:02d}", "end": None, "time_zone": None}
+        return f"https://example.com/{row}"
+
+    rows = []
+    for row in range(pages):
+        properties = {name: {"id": config["id"], "type": config["type"],
+                             config["type"]: text(f"Page {row}") if config["type"] == "title" else value(config["type"], row)}
+                      for name, config in schema.items()}
+        rows.append({
+            "object": "page", "id": f"{row:08x}-0000-0000-0000-000000000000",
+            "created_time": "2024-01-01T00:00:00.000Z", "last_edited_time": "2024-01-01T00:00:00.000Z",
+            "created_by": {"object": "user", "id": "u1"}, "last_edited_by": {"object": "user", "id": "u1"},
+            "cover": None, "icon": None, "parent": {"type": "database_id", "database_id": "mock"},
+            "archived": False, "in_trash": False, "properties": properties, "url": "", "public_url": None,
+        })
+
+    def handler(method, url, headers, params, body):
+        time.sleep(latency)
+        if method == "GET" and url.endswith("/databases/mock"):
+            return {"object": "database", "id": "mock", "properties": schema}
+        if method == "POST" and url.endswith("/databases/mock/query"):
+            start = int((body or {}).get("start_cursor") or 0)
+            end = min(start + int((body or {}).get("page_size") or 100), pages)
+            results = rows[start:end]
+            wanted = params.get("filter_properties")
+            if wanted:
+                results = [dict(page, properties={name: prop for name, prop in page["properties"].items() if prop["id"] in wanted})
+                           for page in results]
+            return {"object": "list", "results": results, "next_cursor": str(end) if end < pages else None, "has_more": end < pages,
+                    "type": "page_or_database", "page_or_database": {}}
+        return 404, {"object": "error", "status": 404, "code": "object_not_found", "message": f"No mock for {method} {url}"}
+
+    return handler
+
+
+def bench(args: argparse.Namespace) -> None:
+    transport = InMemoryTransport(_mock_database(args.pages, args.columns, args.text_size, args.latency))
+    # The mock is only limited by --rate when it is given
+    api, monitor = _client(args, transport=transport, rate=None)
+    properties = _properties(args.properties)
+
+    with api, monitor:
+        if args.mode == "rows":
+            with _executor(args.processes) as executor:
+                for _ in api.database.iter_rows("mock", {"page_size": 100}, properties=properties, executor=executor):
+                    monitor.items += 1
+        else:
+            for _ in api.database.iter_query("mock", {"page_size": 100}, properties=properties):
+                monitor.items += 1
+
+
+def _parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--token", help="the integration token (default: $NOTION_TOKEN)")
+    common.add_argument("--rate", type=float, help=f"requests per second, 0 for no limit (default: {DEFAULT_RATE:g}, unlimited for bench)")
+    common.add_argument("--timeout", type=float, default=60.0, help="seconds each request may take (default: 60)")
+    common.add_argument("--http2", action="store_true", help="send requests over HTTP/2 (needs httpx[http2])")
+    common.add_argument("--stats-interval", type=float, default=1.0, help="seconds between throughput updates (default: 1)")
+    common.add_argument("--quiet", action="store_true", help="don't print throughput")
+
+    parser = argparse.ArgumentParser(prog="notionapi", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    export = commands.add_parser("export", help="stream a database or a page tree to a file").add_subparsers(dest="kind", metavar="kind")
+    export.required = True
+    database = export.add_parser("database", parents=[common], help="export the rows of a database as NDJSON")
+    database.add_argument("database_id")
+    database.add_argument("-o", "--output", help="the output file (default: stdout)")
+    database.add_argument("--properties", help="comma-separated names or IDs of the only properties to export")
+    database.add_argument("--filter", help="a query filter as JSON")
+    database.add_argument("--raw", action="store_true", help="write the page objects as returned by the API instead of plain values")
+    database.add_argument("--processes", type=int, help="decode rows in this many processes")
+    database.set_defaults(run=export_database)
+
+    page = export.add_parser("page", parents=[common], help="export the block tree of a page as Markdown or NDJSON")
+    page.add_argument("page_id")
+    page.add_argument("-o", "--output", help="the output file (default: stdout)")
+    page.add_argument("--format", choices=("markdown", "ndjson"), default="markdown", help="the output format (default: markdown)")
+    page.add_argument("--max-depth", type=int, help="how many levels of nested blocks to export (default: all)")
+    page.set_defaults(run=export_page)
+
+    mirror = commands.add_parser("sync", parents=[common], help="update a local NDJSON mirror of a database with the rows edited since the last sync")
+    mirror.add_argument("database_id")
+    mirror.add_argument("path", help="the mirror file; its state is kept next to it in PATH.state")
+    mirror.add_argument("--properties", help="comma-separated names or IDs of the only properties to mirror")
+    mirror.add_argument("--reconcile", action="store_true", help="also remove archived pages, listing every page")
+    mirror.add_argument("--every", type=float, help="sync again every this many seconds until interrupted")
+    mirror.set_defaults(run=sync)
+
+    csv_import = commands.add_parser("import", parents=[common], help="create or update database rows from a CSV file")
+    csv_import.add_argument("database_id")
+    csv_import.add_argument("path", help="a CSV file with a header row of property names; lists are comma-separated")
+    csv_import.add_argument("--key", help="a property identifying rows: update the pages with the same key instead of creating duplicates")
+    csv_import.add_argument("--concurrency", type=int, default=4, help="requests in flight at once (default: 4)")
+    csv_import.add_argument("--allow-new-options", action="store_true", help="create select options the database doesn't have yet")
+    csv_import.set_defaults(run=import_csv)
+
+    benchmark = commands.add_parser("bench", parents=[common], help="measure query and parsing throughput against an in-memory mock database")
+    benchmark.add_argument("--pages", type=int, default=5000, help="pages in the mock database (default: 5000)")
+    benchmark.add_argument("--columns", type=int, default=12, help="properties besides the title (default: 12)")
+    benchmark.add_argument("--text-size", type=int, default=100, help="characters per rich text value (default: 100)")
+    benchmark.add_argument("--latency", type=float, default=0.0, help="seconds the mock takes per request (default: 0)")
+    benchmark.add_argument("--mode", choices=("rows", "pages"), default="pages",
+                           help="decode plain values with iter_rows, or parse models with iter_query (default: pages)")
+    benchmark.add_argument("--processes", type=int, help="decode rows in this many processes (rows mode)")
+    benchmark.add_argument("--properties", help="comma-separated names or IDs of the only properties to fetch")
+    benchmark.set_defaults(run=bench)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Runs the `notionapi` command.
+    """
+    args = _parser().parse_args(argv)
+    try:
+        args.run(args)
+    except KeyboardInterrupt:
+        sys.exit(130)
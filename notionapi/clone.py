@@ -0,0 +1,88 @@
+from typing import Any, Dict, List, Optional
+
+from .codec import READ_ONLY_TYPES
+from .diff import RICH_TEXT_KEYS, _canonical_rich_text
+
+
+# Blocks the blocks endpoints can't create, so clones leave them out
+UNCLONABLE_BLOCK_TYPES = ("child_page", "child_database", "link_preview", "unsupported", "template")
+
+# Blocks whose content is a file, which can only be written as an external URL
+FILE_BLOCK_TYPES = ("image", "video", "audio", "file", "pdf")
+
+
+def writable_properties(properties: Dict[str, Any], in_database: bool = True) -> Dict[str, Any]:
+    """
+    Converts the properties of a page read from the API to a payload for creating a page.
+
+    Read-only properties, such as formulas, rollups and unique IDs, are left out, as
+    are files uploaded to Notion, which can't be written back. Outside of a database a
+    page only has a title, so everything else is left out.
+
+    Args:
+        properties (Dict[str, Any]): The `properties` of a page payload.
+        in_database (bool, optional): Whether the new page goes into a database. Defaults to True.
+
+    Returns:
+        Dict[str, Any]: The property payloads by property name.
+    """
+    writable = {}
+    for name, value in properties.items():
+        property_type = value.get("type")
+        content = value.get(property_type)
+        if property_type in READ_ONLY_TYPES or (not in_database and property_type != "title"):
+            continue
+        if property_type in ("title", "rich_text"):
+            writable[name] = {property_type: _canonical_rich_text(content or [])}
+        elif property_type in ("select", "status"):
+            writable[name] = {property_type: {"name": content["name"]} if content else None}
+        elif property_type == "multi_select":
+            writable[name] = {"multi_select": [{"name": option["name"]} for option in content or []]}
+        elif property_type == "people":
+            writable[name] = {"people": [{"object": "user", "id": user["id"]} for user in content or []]}
+        elif property_type == "relation":
+            writable[name] = {"relation": [{"id": item["id"]} for item in content or []]}
+        elif property_type == "files":
+            writable[name] = {"files": [item for item in content or [] if item.get("type") == "external"]}
+        elif property_type in ("number", "checkbox", "url", "email", "phone_number", "date"):
+            writable[name] = {property_type: content}
+    return writable
+
+
+def writable_block(block: Dict[str, Any], children: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Converts a block read from the API to a block that can be appended, with the given children.
+
+    Returns:
+        Optional[Dict[str, Any]]: The block, or None if it can't be created through the API: child pages and
+        databases, link previews, unsupported blocks and files uploaded to Notion.
+    """
+    block_type = block["type"]
+    content = block.get(block_type) or {}
+    if block_type in UNCLONABLE_BLOCK_TYPES or (block_type in FILE_BLOCK_TYPES and content.get("type") != "external"):
+        return None
+
+    writable = {}
+    for key, value in content.items():
+        if value is None:
+            continue
+        writable[key] = _canonical_rich_text(value) if key in RICH_TEXT_KEYS else value
+    if block_type == "table_row":
+        writable["cells"] = [_canonical_rich_text(cell) for cell in content.get("cells", [])]
+    if block_type == "synced_block":
+        # A copy of a synced block references the original; an original is copied as a new original
+        if content.get("synced_from"):
+            return {"type": block_type, block_type: {"synced_from": {"block_id": content["synced_from"]["block_id"]}}}
+        writable["synced_from"] = None
+    if children:
+        writable["children"] = children
+    return {"type": block_type, block_type: writable}
+
+
+def parent_payload(parent: Any) -> Dict[str, Any]:
+    """
+    Returns the parent of a new page: a parent payload as is, or a page ID.
+    """
+    if isinstance(parent, dict):
+        return {key: value for key, value in parent.items() if key in ("page_id", "database_id", "type")}
+    return {"type": "page_id", "page_id": parent}
@@ -0,0 +1,304 @@
+import re
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .types import RICH_TEXT_LIMIT, split_text
+
+
+class PropertyValueError(ValueError):
+    """
+    Raised by DatabaseCodec.encode for values that don't fit the database schema, before any request is sent.
+
+    Attributes:
+        errors (Dict[str, str]): The problem with each invalid property, by property name.
+    """
+
+    def __init__(self, errors: Dict[str, str]):
+        self.errors = errors
+        super().__init__("; ".join(f"{name}: {problem}" for name, problem in errors.items()))
+
+
+# Properties computed by Notion, which can be read but not written
+READ_ONLY_TYPES = (
+    "formula", "rollup", "created_time", "created_by", "last_edited_time", "last_edited_by", "unique_id", "button", "verification",
+)
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:\d{2})?)?$")
+
+
+def _check(condition: bool, problem: str) -> None:
+    if not condition:
+        raise ValueError(problem)
+
+
+def _rich_text(value: Any) -> List[Dict[str, Any]]:
+    _check(isinstance(value, str), f"expected a string, got {type(value).__name__}")
+    return [{"type": "text", "text": {"content": chunk}} for chunk in split_text(value, RICH_TEXT_LIMIT)]
+
+
+def _plain_text(items: List[Dict[str, Any]]) -> str:
+    return "".join(item.get("plain_text", item.get("text", {}).get("content", "")) for item in items)
+
+
+def _date_string(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    _check(isinstance(value, str) and bool(_ISO_DATE.match(value)), f"expected a date, datetime or ISO 8601 string, got {value!r}")
+    return value
+
+
+def _encode_date(value: Any) -> Optional[Dict[str, Any]]:
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        _check("start" in value, "a date dict needs a start")
+        encoded = {"start": _date_string(value["start"])}
+        if value.get("end") is not None:
+            encoded["end"] = _date_string(value["end"])
+        if value.get("time_zone"):
+            encoded["time_zone"] = value["time_zone"]
+        return encoded
+    if isinstance(value, tuple):
+        _check(len(value) == 2, "a date range needs a (start, end) pair")
+        return {"start": _date_string(value[0]), "end": _date_string(value[1]) if value[1] is not None else None}
+    return {"start": _date_string(value)}
+
+
+def _decode_date(value: Optional[Dict[str, Any]]) -> Any:
+    if not value:
+        return None
+    return value["start"] if value.get("end") is None else (value["start"], value["end"])
+
+
+def _ids(value: Any, what: str) -> List[str]:
+    if isinstance(value, str):
+        value = [value]
+    _check(isinstance(value, (list, tuple)) and all(isinstance(item, str) for item in value), f"expected {what} IDs")
+    return list(value)
+
+
+def _compile_encoder(schema: Dict[str, Any], allow_new_options: bool) -> Callable[[Any], Dict[str, Any]]:
+    property_type = schema["type"]
+
+    if property_type in ("title", "rich_text"):
+        return lambda value: {property_type: _rich_text(value if value is not None else "")}
+
+    if property_type == "number":
+        def encode_number(value):
+            _check(value is None or (isinstance(value, (int, float)) and not isinstance(value, bool)),
+                   f"expected a number, got {type(value).__name__}")
+            return {"number": value}
+        return encode_number
+
+    if property_type == "checkbox":
+        def encode_checkbox(value):
+            _check(isinstance(value, bool), f"expected True or False, got {value!r}")
+            return {"checkbox": value}
+        return encode_checkbox
+
+    if property_type in ("select", "status", "multi_select"):
+        options = frozenset(option["name"] for option in schema.get(property_type, {}).get("options", []))
+        # Status options can't be created by writing them
+        strict = property_type == "status" or not allow_new_options
+
+        def option(name):
+            _check(isinstance(name, str), f"expected an option name, got {type(name).__name__}")
+            _check(not strict or name in options, f"unknown option {name!r}")
+            return {"name": name}
+
+        if property_type == "multi_select":
+            def encode_multi_select(value):
+                names = [value] if isinstance(value, str) else value
+                _check(isinstance(names, (list, tuple, set, frozenset)), "expected a list of option names")
+                return {"multi_select": [option(name) for name in names]}
+            return encode_multi_select
+        return lambda value: {property_type: option(value) if value is not None else None}
+
+    if property_type == "date":
+        return lambda value: {"date": _encode_date(value)}
+
+    if property_type in ("url", "email", "phone_number"):
+        def encode_string(value):
+            _check(value is None or isinstance(value, str), f"expected a string, got {type(value).__name__}")
+            return {property_type: value or None}
+        return encode_string
+
+    if property_type == "relation":
+        return lambda value: {"relation": [{"id": page_id} for page_id in _ids(value or [], "page")]}
+
+    if property_type == "people":
+        return lambda value: {"people": [{"object": "user", "id": user_id} for user_id in _ids(value or [], "user")]}
+
+    if property_type == "files":
+        def encode_files(value):
+            urls = _ids(value or [], "file URL")
+            return {"files": [{"name": url.rsplit("/", 1)[-1][:100] or url, "type": "external", "external": {"url": url}} for url in urls]}
+        return encode_files
+
+    if property_type in READ_ONLY_TYPES:
+        def read_only(value):
+            raise ValueError(f"{property_type} properties are read-only")
+        return read_only
+
+    def unsupported(value):
+        raise ValueError(f"{property_type} properties are not supported")
+    return unsupported
+
+
+def _decode_formula(value: Dict[str, Any]) -> Any:
+    result_type = value.get("type")
+    result = value.get(result_type)
+    return _decode_date(result) if result_type == "date" else result
+
+
+def _decode_rollup(value: Dict[str, Any]) -> Any:
+    result_type = value.get("type")
+    if result_type == "array":
+        return [_DECODERS.get(item.get("type"), _raw)(item) for item in value.get("array", [])]
+    if result_type == "date":
+        return _decode_date(value.get("date"))
+    return value.get(result_type)
+
+
+def _decode_unique_id(value: Dict[str, Any]) -> Any:
+    unique_id = value["unique_id"]
+    return f"{unique_id['prefix']}-{unique_id['number']}" if unique_id.get("prefix") else unique_id.get("number")
+
+
+def _raw(value: Dict[str, Any]) -> Any:
+    return value.get(value.get("type"))
+
+
+_DECODERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "title": lambda value: _plain_text(value["title"]),
+    "rich_text": lambda value: _plain_text(value["rich_text"]),
+    "number": lambda value: value["number"],
+    "checkbox": lambda value: value["checkbox"],
+    "select": lambda value: value["select"]["name"] if value["select"] else None,
+    "status": lambda value: value["status"]["name"] if value["status"] else None,
+    "multi_select": lambda value: [option["name"] for option in value["multi_select"]],
+    "date": lambda value: _decode_date(value["date"]),
+    "url": lambda value: value["url"],
+    "email": lambda value: value["email"],
+    "phone_number": lambda value: value["phone_number"],
+    "relation": lambda value: [item["id"] for item in value["relation"]],
+    "people": lambda value: [user["id"] for user in value["people"]],
+    "files": lambda value: [item.get(item.get("type"), {}).get("url") for item in value["files"]],
+    "formula": lambda value: _decode_formula(value["formula"]),
+    "rollup": lambda value: _decode_rollup(value["rollup"]),
+    "created_time": lambda value: value["created_time"],
+    "last_edited_time": lambda value: value["last_edited_time"],
+    "created_by": lambda value: value["created_by"]["id"],
+    "last_edited_by": lambda value: value["last_edited_by"]["id"],
+    "unique_id": _decode_unique_id,
+}
+
+
+class DatabaseCodec:
+    """
+    Encoder and decoder for the properties of one database, compiled from its schema.
+
+    Encoding takes plain Python values and produces the property payloads the API
+    expects, checking them against the schema first:
+
+    - title, rich_text, url, email, phone_number: str
+    - number: int or float
+    - checkbox: bool
+    - select, status: an option name; multi_select: a list of option names
+    - date: a date, datetime or ISO 8601 string, a (start, end) tuple, or a dict with start, end and time_zone
+    - relation: page IDs; people: user IDs; files: external file URLs
+
+    Decoding turns page payloads into dicts of the same plain values, with dates as
+    their start string, or a (start, end) tuple for ranges. Both directions look up a
+    function per property once, when the codec is built, instead of dispatching on the
+    type of every value.
+
+    Args:
+        properties (Dict[str, Any]): The `properties` of the database object, by property name.
+        allow_new_options (bool, optional): Whether select and multi-select values may name options the schema
+            doesn't have yet, which Notion then creates. Defaults to False.
+    """
+
+    def __init__(self, properties: Dict[str, Any], allow_new_options: bool = False):
+        self.properties = properties
+        self.allow_new_options = allow_new_options
+        self.types = {name: schema["type"] for name, schema in properties.items()}
+        self._names_by_id = {schema.get("id"): name for name, schema in properties.items()}
+        self._encoders = {name: _compile_encoder(schema, allow_new_options) for name, schema in properties.items()}
+        self._decoders: List[Tuple[str, Callable[[Dict[str, Any]], Any]]] = [
+            (name, _DECODERS.get(schema["type"], _raw)) for name, schema in properties.items()
+        ]
+
+    def __reduce__(self):
+        # The compiled functions don't pickle, so process pools get the schema and compile it again
+        return DatabaseCodec, (self.properties, self.allow_new_options)
+
+    def encode(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Encodes plain property values to the payloads for creating or updating pages.
+
+        Args:
+            values (Dict[str, Any]): The values by property name.
+
+        Returns:
+            Dict[str, Any]: The property payloads by property name.
+
+        Raises:
+            PropertyValueError: If any property is unknown, read-only or gets a value that doesn't fit, listing all of them.
+        """
+        encoded = {}
+        errors = {}
+        for name, value in values.items():
+            encoder = self._encoders.get(name)
+            if encoder is None:
+                errors[name] = "no such property"
+                continue
+            try:
+                encoded[name] = encoder(value)
+            except ValueError as e:
+                errors[name] = str(e)
+        if errors:
+            raise PropertyValueError(errors)
+        return encoded
+
+    def names(self, properties: Iterable[str]) -> List[str]:
+        """
+        Returns the names of properties given by name or ID, leaving out those not in the schema.
+        """
+        return [name if name in self.types else self._names_by_id[name] for name in properties
+                if name in self.types or name in self._names_by_id]
+
+    def decode(self, page: Dict[str, Any], properties: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Decodes the properties of a page payload to plain values.
+
+        Args:
+            page (Dict[str, Any]): The page as returned by the API.
+            properties (Optional[Iterable[str]], optional): The names of the only properties to decode. Defaults to None, all of them.
+
+        Returns:
+            Dict[str, Any]: The values by property name; properties missing from the page are None.
+        """
+        return _decode(page, self._decoders if properties is None else self._projected(properties))
+
+    def decode_rows(self, pages: Iterable[Dict[str, Any]], properties: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Decodes page payloads to plain values, yielding each page's ID with its row. The ID is kept
+        apart from the row, which may well have a property named "id".
+        """
+        decoders = self._decoders if properties is None else self._projected(properties)
+        for page in pages:
+            yield page["id"], _decode(page, decoders)
+
+    def _projected(self, properties: Iterable[str]) -> List[Tuple[str, Callable[[Dict[str, Any]], Any]]]:
+        wanted = set(properties)
+        return [(name, decoder) for name, decoder in self._decoders if name in wanted]
+
+
+def _decode(page: Dict[str, Any], decoders: List[Tuple[str, Callable[[Dict[str, Any]], Any]]]) -> Dict[str, Any]:
+    properties = page.get("properties", {})
+    row = {}
+    for name, decoder in decoders:
+        value = properties.get(name)
+        row[name] = decoder(value) if value is not None else None
+    return row
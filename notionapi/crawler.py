@@ -0,0 +1,213 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .deadlines import DeadlineExceeded, propagate, remaining
+from .notionapi import NotionAPI
+from .ratelimit import RateLimiter
+
+
+class CrawlItem(BaseModel):
+    """
+    A page, database or block found by the WorkspaceCrawler.
+
+    Attributes:
+        kind (str): "page", "database" or "block".
+        id (str): The ID of the object.
+        depth (int): The number of page or database levels below the nearest root.
+        parent_id (Optional[str]): The ID of the page, database or block it was found in, if any.
+        data (Dict[str, Any]): The object as returned by the API. Pages and databases found as
+            child_page or child_database blocks are represented by that block.
+    """
+    kind: str
+    id: str
+    depth: int
+    parent_id: Optional[str] = None
+    data: Dict[str, Any]
+
+
+# A unit of crawl work, each costing one request: (kind, object ID, cursor, depth)
+Task = Tuple[str, Optional[str], Optional[str], int]
+
+
+class WorkspaceCrawler:
+    """
+    Walks everything an integration can see: pages, their child pages and child databases,
+    and database rows, at any nesting depth.
+
+    The crawl is breadth-first over a frontier of single-request tasks (a page of search
+    results, block children or database rows), of which up to `max_workers` run
+    concurrently. Objects are deduplicated by ID. With a `checkpoint_path`, the seen IDs
+    and the frontier, cursors included, are saved regularly, and a new crawler with the
+    same path resumes where the previous one stopped.
+
+    Args:
+        api (NotionAPI): The client to crawl with.
+        max_workers (int, optional): How many requests to run concurrently. Defaults to 4.
+        max_depth (Optional[int], optional): How many page or database levels to descend below the roots. Defaults to None, no limit.
+        include_blocks (bool, optional): Whether to report content blocks too, not only pages and databases. Defaults to False.
+        limiter (Optional[RateLimiter], optional): A rate budget every request waits for. Defaults to None.
+        checkpoint_path (Optional[str], optional): A JSON file to save progress to and resume from. Defaults to None.
+        checkpoint_every (int, optional): Save a checkpoint after this many completed tasks. Defaults to 100.
+        max_retries (int, optional): How often a failed task is retried before it is recorded in `failures`. Defaults to 2.
+    """
+
+    def __init__(self, api: NotionAPI, max_workers: int = 4, max_depth: Optional[int] = None, include_blocks: bool = False,
+                 limiter: Optional[RateLimiter] = None, checkpoint_path: Optional[str] = None, checkpoint_every: int = 100,
+                 max_retries: int = 2):
+        self.api = api
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.include_blocks = include_blocks
+        self.limiter = limiter
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.max_retries = max_retries
+
+        self.seen: set = set()
+        self.frontier: deque = deque()
+        self.failures: List[Tuple[Task, Exception]] = []
+        self._attempts: Dict[Task, int] = {}
+
+    def crawl(self, roots: Optional[List[Tuple[str, str]]] = None) -> Iterator[CrawlItem]:
+        """
+        Crawls the workspace, or the trees below the given roots, yielding objects as they are found.
+
+        If the checkpoint file exists, the crawl resumes from it and `roots` is ignored; the file
+        is deleted when the crawl completes. Under a deadline, the crawl stops with
+        DeadlineExceeded when it passes; requests not yet sent are cancelled, and with a
+        checkpoint file the crawl can be resumed later.
+
+        Args:
+            roots (Optional[List[Tuple[str, str]]], optional): ("page", id) or ("database", id) pairs to start from.
+                Defaults to None, starting from everything the search endpoint returns.
+
+        Yields:
+            CrawlItem: The pages and databases (and blocks, with include_blocks) found, each once.
+        """
+        if not self._load_checkpoint():
+            if roots is None:
+                self.frontier.append(("search", None, None, 0))
+            else:
+                for kind, object_id in roots:
+                    self.seen.add(object_id)
+                    if self._expands(kind, 0):
+                        self.frontier.append(self._expand_task(kind, object_id, 0))
+
+        in_flight: Dict[Any, Task] = {}
+        completed = 0
+        fetch = propagate(self._fetch)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while self.frontier or in_flight:
+                while self.frontier and len(in_flight) < self.max_workers:
+                    task = self.frontier.popleft()
+                    in_flight[executor.submit(fetch, task)] = task
+
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = in_flight.pop(future)
+                    try:
+                        data = future.result()
+                    except DeadlineExceeded:
+                        self.frontier.appendleft(task)
+                        for pending in in_flight:
+                            pending.cancel()
+                        if self.checkpoint_path:
+                            self._save_checkpoint(list(in_flight.values()))
+                        raise
+                    except Exception as e:
+                        self._retry(task, e)
+                        continue
+                    yield from self._process(task, data)
+
+                    completed += 1
+                    if self.checkpoint_path and completed % self.checkpoint_every == 0:
+                        self._save_checkpoint(list(in_flight.values()))
+
+        # A finished crawl leaves no checkpoint, so the next one with the same path starts over
+        if self.checkpoint_path:
+            try:
+                os.remove(self.checkpoint_path)
+            except FileNotFoundError:
+                pass
+
+    def _expands(self, kind: str, depth: int) -> bool:
+        # At max_depth every child is too deep, except the blocks of a page when they are wanted
+        return self.max_depth is None or depth < self.max_depth or (kind == "page" and self.include_blocks)
+
+    def _expand_task(self, kind: str, object_id: str, depth: int) -> Task:
+        return ("rows" if kind == "database" else "children", object_id, None, depth)
+
+    def _fetch(self, task: Task) -> Dict[str, Any]:
+        kind, object_id, cursor, _ = task
+        if self.limiter and not self.limiter.acquire(timeout=remaining()):
+            raise DeadlineExceeded("Deadline exceeded waiting for the rate limit")
+        if kind == "search":
+            body: Dict[str, Any] = {"page_size": 100}
+            if cursor:
+                body["start_cursor"] = cursor
+            return self.api._search(body)
+        if kind == "rows":
+            query: Dict[str, Any] = {"page_size": 100}
+            if cursor:
+                query["start_cursor"] = cursor
+            return self.api.database._query(object_id, query)
+        return self.api.page.block._get(object_id, page_size=100, start_cursor=cursor)
+
+    def _retry(self, task: Task, error: Exception) -> None:
+        attempts = self._attempts.get(task, 0) + 1
+        self._attempts[task] = attempts
+        if attempts <= self.max_retries:
+            self.frontier.append(task)
+        else:
+            self.failures.append((task, error))
+
+    def _process(self, task: Task, data: Dict[str, Any]) -> Iterator[CrawlItem]:
+        kind, object_id, _, depth = task
+        if data.get("has_more"):
+            self.frontier.append((kind, object_id, data.get("next_cursor"), depth))
+
+        for result in data.get("results", []):
+            if kind == "search":
+                yield from self._discover(result["object"], result["id"], 0, None, result)
+            elif kind == "rows":
+                yield from self._discover("page", result["id"], depth + 1, object_id, result)
+            elif result.get("type") == "child_page":
+                yield from self._discover("page", result["id"], depth + 1, object_id, result)
+            elif result.get("type") == "child_database":
+                yield from self._discover("database", result["id"], depth + 1, object_id, result)
+            else:
+                if self.include_blocks:
+                    yield CrawlItem(kind="block", id=result["id"], depth=depth, parent_id=object_id, data=result)
+                # Blocks nested in toggles, columns and the like belong to the same page
+                if result.get("has_children"):
+                    self.frontier.append(("children", result["id"], None, depth))
+
+    def _discover(self, kind: str, object_id: str, depth: int, parent_id: Optional[str], data: Dict[str, Any]) -> Iterator[CrawlItem]:
+        if object_id in self.seen or (self.max_depth is not None and depth > self.max_depth):
+            return
+        self.seen.add(object_id)
+        yield CrawlItem(kind=kind, id=object_id, depth=depth, parent_id=parent_id, data=data)
+        if self._expands(kind, depth):
+            self.frontier.append(self._expand_task(kind, object_id, depth))
+
+    def _save_checkpoint(self, in_flight: List[Task]) -> None:
+        # Unfinished tasks are saved as pending, so resuming may repeat them but never skips them
+        state = {"seen": sorted(self.seen), "frontier": [list(task) for task in in_flight + list(self.frontier)]}
+        temporary = f"{self.checkpoint_path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(state, f)
+        os.replace(temporary, self.checkpoint_path)
+
+    def _load_checkpoint(self) -> bool:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return False
+        with open(self.checkpoint_path) as f:
+            state = json.load(f)
+        self.seen = set(state["seen"])
+        self.frontier = deque(tuple(task) for task in state["frontier"])
+        return True
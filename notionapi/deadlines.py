@@ -0,0 +1,81 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+import requests
+
+
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("notionapi_deadline", default=None)
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """
+    Raised instead of sending a request, or waiting for a rate limit slot, once the current deadline has passed.
+    """
+
+
+@contextmanager
+def deadline(seconds: float):
+    """
+    Limits the total time of everything in the with block: every request, every page of
+    paginated methods, every wait for a rate limit and the work the library hands to
+    its own thread pools. Requests get the remaining time as their timeout, and once it
+    is used up, the next request raises DeadlineExceeded instead of being sent.
+
+    Nested deadlines never extend an outer one.
+
+    Args:
+        seconds (float): The time allowed, from now.
+    """
+    expires = time.monotonic() + seconds
+    current = _DEADLINE.get()
+    if current is not None:
+        expires = min(expires, current)
+    token = _DEADLINE.set(expires)
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """
+    Returns the seconds left until the current deadline, or None without a deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline has passed.
+    """
+    expires = _DEADLINE.get()
+    if expires is None:
+        return None
+    left = expires - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("Deadline exceeded")
+    return left
+
+
+def effective_timeout(timeout: Optional[float]) -> Optional[float]:
+    """
+    Returns the timeout for a request: the given timeout, shortened to the time left until the current deadline.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
+
+
+def propagate(function: Callable) -> Callable:
+    """
+    Wraps a function to run under the caller's current deadline, for handing work to threads.
+    """
+    expires = _DEADLINE.get()
+
+    def run(*args, **kwargs):
+        token = _DEADLINE.set(expires)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _DEADLINE.reset(token)
+
+    return run
@@ -0,0 +1,114 @@
+import hashlib
+import json
+from difflib import SequenceMatcher
+from typing import List, Optional, Dict, Any, Tuple
+from .types import AnnotationsType
+from .serialization import get_block_type
+
+
+RICH_TEXT_KEYS = ("rich_text", "caption")
+DEFAULT_ANNOTATIONS = AnnotationsType().dict()
+
+# Content keys that are not compared: children are diffed separately, and the API adds a redundant type on read
+IGNORED_CONTENT_KEYS = ("children", "type")
+
+
+def _canonical_rich_text(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    canonical = []
+    for item in items:
+        item_type = item.get("type", "text")
+        value = dict(item.get(item_type) or {})
+        if item_type == "text":
+            value = {"content": value.get("content", ""), "link": value.get("link") or None}
+        canonical.append({
+            "type": item_type,
+            item_type: value,
+            "annotations": {**DEFAULT_ANNOTATIONS, **(item.get("annotations") or {})},
+        })
+    return canonical
+
+
+def canonical_content(block: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the writable content of a serialized block in a form that compares equal for equal blocks.
+
+    Blocks read from the API and blocks built locally differ in read-only keys, defaulted
+    annotations and empty values; none of those count as a difference. Children are excluded.
+
+    Args:
+        block (Dict[str, Any]): A serialized block, read from the API or built locally.
+
+    Returns:
+        Dict[str, Any]: The block type and its normalized content.
+    """
+    block_type = get_block_type(block)
+    content = block.get(block_type)
+    if not isinstance(content, dict):
+        return {"type": block_type, "content": content}
+
+    canonical = {}
+    for key, value in content.items():
+        if key in IGNORED_CONTENT_KEYS or value is None or value == []:
+            continue
+        if key in RICH_TEXT_KEYS:
+            value = _canonical_rich_text(value)
+        elif key == "cells":
+            value = [_canonical_rich_text(cell) for cell in value]
+        canonical[key] = value
+    return {"type": block_type, "content": canonical}
+
+
+def block_hash(block: Dict[str, Any]) -> str:
+    """
+    Hashes the canonical content of a serialized block, ignoring its children.
+
+    Args:
+        block (Dict[str, Any]): A serialized block.
+
+    Returns:
+        str: A hex digest that is equal for blocks with equal content.
+    """
+    encoded = json.dumps(canonical_content(block), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def plan_block_diff(current: List[Dict[str, Any]], desired: List[Dict[str, Any]]) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """
+    Computes the operations that turn one list of sibling blocks into another.
+
+    Blocks are matched with a sequence diff over their content hashes. In replaced
+    ranges, current and desired blocks of the same type are paired into updates, the
+    rest become deletes and inserts.
+
+    Args:
+        current (List[Dict[str, Any]]): The blocks as read from the API, in order.
+        desired (List[Dict[str, Any]]): The serialized blocks that should be there, in order.
+
+    Returns:
+        List[Tuple[str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]: `(operation, current, desired)`
+        tuples in final block order, where operation is "keep", "update", "insert" or "delete".
+    """
+    matcher = SequenceMatcher(
+        a=[block_hash(block) for block in current],
+        b=[block_hash(block) for block in desired],
+        autojunk=False
+    )
+
+    operations = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            operations.extend(("keep", current[i], desired[j]) for i, j in zip(range(i1, i2), range(j1, j2)))
+            continue
+
+        old, new = current[i1:i2], desired[j1:j2]
+        for index in range(max(len(old), len(new))):
+            old_block = old[index] if index < len(old) else None
+            new_block = new[index] if index < len(new) else None
+            if old_block and new_block and get_block_type(old_block) == get_block_type(new_block):
+                operations.append(("update", old_block, new_block))
+                continue
+            if old_block:
+                operations.append(("delete", old_block, None))
+            if new_block:
+                operations.append(("insert", None, new_block))
+    return operations
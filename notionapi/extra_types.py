@@ -0,0 +1,134 @@
+#
+# Property models that page parsing doesn't use. They live outside types.py so that
+# importing the package doesn't build them; notionapi.types loads them on first access.
+#
+
+from typing import List, Optional
+from pydantic import BaseModel
+from .types import BaseObject, CreatedByType, DateType
+
+
+#
+# Created
+#
+
+class CreatedByObject(BaseObject):
+    id: str
+    type: str
+    created_by: CreatedByType
+    updatable: bool = False
+
+
+#
+# Email
+#
+
+class EmailType(BaseModel):
+    email: Optional[str] = None
+
+class EmailObject(BaseObject):
+    type: str = "email"
+    email: EmailType
+    updatable: bool = True
+
+
+#
+# File
+#
+
+class FileObject(BaseModel):
+    name: Optional[str] = None
+    type: Optional[str] = None
+    external: Optional[dict] = None
+
+class FilesType(BaseModel):
+    files: Optional[List[FileObject]] = None
+
+class FilesObject(BaseObject):
+    type: str
+    files: FilesType
+    updatable: bool = True
+
+
+#
+# Last Edited
+#
+
+class LastEditedByType(BaseModel):
+    object: Optional[str] = None
+    id: Optional[str] = None
+
+class LastEditedByObject(BaseObject):
+    type: str
+    last_edited_by: LastEditedByType
+    updatable: bool = False
+
+
+#
+# Number
+#
+
+class NumberType(BaseModel):
+    number: Optional[float] = None
+
+class NumberObject(BaseObject):
+    type: str
+    number: NumberType
+    updatable: bool = True
+
+
+#
+# Phone Number
+#
+
+class PhoneNumberType(BaseModel):
+    phone_number: Optional[str] = None
+
+class PhoneNumberObject(BaseObject):
+    type: str
+    phone_number: PhoneNumberType
+    updatable: bool = True
+
+
+#
+# Status
+#
+
+class StatusType(BaseModel):
+    id: Optional[str] = None
+    name: Optional[str] = None
+    color: Optional[str] = None
+
+class StatusObject(BaseObject):
+    type: str
+    status: StatusType
+    updatable: bool = True
+
+
+#
+# Unique ID
+#
+
+class UniqueIDType(BaseModel):
+    number: Optional[int] = None
+    prefix: Optional[str] = None
+
+class UniqueIDObject(BaseObject):
+    type: str
+    unique_id: UniqueIDType
+    updatable: bool = False
+
+
+#
+# Verification
+#
+
+class VerificationType(BaseModel):
+    state: Optional[str] = None
+    verified_by: Optional[CreatedByType] = None
+    date: Optional[DateType] = None
+
+class VerificationObject(BaseObject):
+    type: str
+    verification: VerificationType
+    updatable: bool = False
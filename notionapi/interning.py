@@ -0,0 +1,107 @@
+from typing import Any, Callable, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+from .types import BaseObject, MultiSelectObject, PeopleObject, RelationObject, SelectObject
+
+
+def _freeze(value: Any) -> Any:
+    # Key order is kept as is: the API and the models order keys consistently
+    if isinstance(value, BaseModel):
+        return (type(value), _freeze(value.__dict__))
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item) if isinstance(item, (dict, list, BaseModel)) else item) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class InternPool:
+    """
+    Shares equal sub-objects and strings between parsed pages.
+
+    A large database repeats the same few users, parents and select options in every
+    row. Parsed with a pool, pages reference one instance of each instead of a copy
+    per page, and repeated strings like property names and IDs are stored once.
+
+    Only sub-objects the library never modifies are shared: users, parents and select
+    and multi-select options. Treat them as read-only; changing one changes it in every
+    page that shares it.
+
+    A pool keeps everything it has seen alive, so use one per client for a bounded
+    workspace, or one per query iteration for large one-off scans.
+    """
+
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+        self._models: Dict[Any, BaseModel] = {}
+        # IDs of the pooled models, which stay alive as long as the pool
+        self._pooled: set = set()
+
+    def __len__(self) -> int:
+        return len(self._strings) + len(self._models)
+
+    def string(self, value: Optional[str]) -> Optional[str]:
+        """
+        Returns the pooled copy of a string.
+        """
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def model(self, cls: Type[BaseModel], data: Dict[str, Any], factory: Optional[Callable[[Dict[str, Any]], BaseModel]] = None) -> BaseModel:
+        """
+        Returns the pooled model built from `data`, building it only the first time such data is seen.
+
+        Args:
+            cls (Type[BaseModel]): The model class.
+            data (Dict[str, Any]): The raw object.
+            factory (Optional[Callable[[Dict[str, Any]], BaseModel]], optional): Builds the model from the data. Defaults to cls(**data).
+        """
+        key = (cls, _freeze(data))
+        found = self._models.get(key)
+        if found is None:
+            found = self._models.setdefault(key, factory(data) if factory else cls(**data))
+            self._pooled.add(id(found))
+        return found
+
+    def share(self, value: BaseModel) -> BaseModel:
+        """
+        Returns the pooled model equal to `value`, adding `value` if there is none.
+        """
+        if id(value) in self._pooled:
+            return value
+        found = self._models.setdefault(_freeze(value), value)
+        self._pooled.add(id(found))
+        return found
+
+    def page(self, page: Any) -> Any:
+        """
+        Replaces the shareable sub-objects and strings of a parsed PageObject with pooled ones.
+
+        Returns:
+            PageObject: The same page.
+        """
+        page.created_by = self.share(page.created_by)
+        page.last_edited_by = self.share(page.last_edited_by)
+        page.parent = self.share(page.parent)
+        page.properties = {self.string(name): self._property(value) for name, value in page.properties.items()}
+        return page
+
+    def _property(self, value: Any) -> Any:
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, BaseObject):
+                item.id = self.string(item.id)
+                if isinstance(getattr(item, "type", None), str):
+                    item.type = self.string(item.type)
+
+        if isinstance(value, SelectObject) and value.select.select is not None:
+            value.select.select = self.share(value.select.select)
+        elif isinstance(value, MultiSelectObject) and value.multi_select:
+            value.multi_select = [self.share(option) for option in value.multi_select]
+        elif isinstance(value, PeopleObject) and value.people.people:
+            value.people.people = [self.share(user) for user in value.people.people]
+        elif isinstance(value, RelationObject) and value.relation.relation:
+            for item in value.relation.relation:
+                item["id"] = self.string(item.get("id"))
+        return value
@@ -0,0 +1,493 @@
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from pydantic import BaseModel
+from .types import *
+from .blocks import *
+
+
+# Notion rejects rich text arrays longer than this, so longer text is spread over several blocks
+RICH_TEXT_ITEMS_LIMIT = 100
+
+CODE_LANGUAGES = {
+    "abap", "arduino", "bash", "basic", "c", "clojure", "coffeescript", "c++", "c#", "css", "dart",
+    "diff", "docker", "elixir", "elm", "erlang", "flow", "fortran", "f#", "gherkin", "glsl", "go",
+    "graphql", "groovy", "haskell", "html", "java", "javascript", "json", "julia", "kotlin", "latex",
+    "less", "lisp", "livescript", "lua", "makefile", "markdown", "markup", "matlab", "mermaid", "nix",
+    "objective-c", "ocaml", "pascal", "perl", "php", "plain text", "powershell", "prolog", "protobuf",
+    "python", "r", "reason", "ruby", "rust", "sass", "scala", "scheme", "scss", "shell", "sql", "swift",
+    "typescript", "vb.net", "verilog", "vhdl", "visual basic", "webassembly", "xml", "yaml",
+    "java/c/c++/c#"
+}
+
+CODE_LANGUAGE_ALIASES = {
+    "": "plain text",
+    "text": "plain text",
+    "txt": "plain text",
+    "plaintext": "plain text",
+    "py": "python",
+    "python3": "python",
+    "js": "javascript",
+    "jsx": "javascript",
+    "ts": "typescript",
+    "tsx": "typescript",
+    "sh": "shell",
+    "zsh": "shell",
+    "console": "shell",
+    "yml": "yaml",
+    "cpp": "c++",
+    "cc": "c++",
+    "cs": "c#",
+    "csharp": "c#",
+    "fsharp": "f#",
+    "rb": "ruby",
+    "rs": "rust",
+    "golang": "go",
+    "kt": "kotlin",
+    "dockerfile": "docker",
+    "md": "markdown",
+    "tex": "latex",
+    "ps1": "powershell",
+    "objc": "objective-c",
+    "proto": "protobuf",
+    "make": "makefile",
+    "htm": "html",
+}
+
+_HEADING = re.compile(r"^ {0,3}(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+_DIVIDER = re.compile(r"^ {0,3}([-*_])(?:\s*\1){2,}\s*$")
+_SETEXT = re.compile(r"^ {0,3}(=+|-+)\s*$")
+_FENCE = re.compile(r"^(\s*)(`{3,}|~{3,})\s*([^`\s]*)")
+_LIST_ITEM = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+_TASK = re.compile(r"^\[([ xX])\]\s+(.*)$")
+_QUOTE = re.compile(r"^ {0,3}>\s?(.*)$")
+_IMAGE = re.compile(r"^\s*!\[([^\]]*)\]\(\s*(\S+?)(?:\s+\"[^\"]*\")?\s*\)\s*$")
+_TABLE_SEPARATOR = re.compile(r"^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$")
+_URL = re.compile(r"^(https?://|mailto:)", re.IGNORECASE)
+
+_INLINE = re.compile(
+    r"\\(?P<escaped>[\\`*_{}\[\]()#+\-.!~|>])"
+    r"|`(?P<code>[^`]+)`"
+    r"|\[(?P<link_text>[^\]]+)\]\(\s*(?P<link_url>[^)\s]+)(?:\s+\"[^\"]*\")?\s*\)"
+    r"|\*\*(?P<bold>.+?)\*\*"
+    r"|__(?P<bold_alt>.+?)__"
+    r"|~~(?P<strikethrough>.+?)~~"
+    r"|\*(?P<italic>[^\s*](?:.*?[^\s*])?)\*"
+    r"|(?<!\w)_(?P<italic_alt>[^\s_](?:.*?[^\s_])?)_(?!\w)"
+)
+
+
+def parse_inline(text: str, annotations: Optional[Dict[str, Any]] = None, link: Optional[str] = None) -> List[TextType]:
+    """
+    Converts inline Markdown (bold, italic, strikethrough, code and links) to rich text items.
+
+    Args:
+        text (str): The inline Markdown text.
+        annotations (Optional[Dict[str, Any]], optional): Annotations inherited from the enclosing markup. Defaults to None.
+        link (Optional[str], optional): The link inherited from the enclosing markup. Defaults to None.
+
+    Returns:
+        List[TextType]: Rich text items, each within the rich text content limit.
+    """
+    rich_text = []
+    for content, style, url in _merge_spans(_inline_spans(text, annotations or {}, link)):
+        rich_text.extend(text_to_rich_text(content, annotations=style, link=url))
+    return rich_text
+
+
+def _inline_spans(text: str, annotations: Dict[str, Any], link: Optional[str]) -> List[Tuple[str, Dict[str, Any], Optional[str]]]:
+    spans = []
+    position = 0
+    for match in _INLINE.finditer(text):
+        if match.start() > position:
+            spans.append((text[position:match.start()], annotations, link))
+        position = match.end()
+
+        groups = match.groupdict()
+        if groups["escaped"] is not None:
+            spans.append((groups["escaped"], annotations, link))
+        elif groups["code"] is not None:
+            spans.append((groups["code"], {**annotations, "code": True}, link))
+        elif groups["link_text"] is not None:
+            url = groups["link_url"] if _URL.match(groups["link_url"]) else link
+            spans.extend(_inline_spans(groups["link_text"], annotations, url))
+        elif groups["bold"] is not None or groups["bold_alt"] is not None:
+            inner = groups["bold"] if groups["bold"] is not None else groups["bold_alt"]
+            spans.extend(_inline_spans(inner, {**annotations, "bold": True}, link))
+        elif groups["strikethrough"] is not None:
+            spans.extend(_inline_spans(groups["strikethrough"], {**annotations, "strikethrough": True}, link))
+        else:
+            inner = groups["italic"] if groups["italic"] is not None else groups["italic_alt"]
+            spans.extend(_inline_spans(inner, {**annotations, "italic": True}, link))
+
+    if position < len(text):
+        spans.append((text[position:], annotations, link))
+    return spans
+
+
+def _merge_spans(spans: List[Tuple[str, Dict[str, Any], Optional[str]]]) -> List[Tuple[str, Dict[str, Any], Optional[str]]]:
+    merged = []
+    for content, style, url in spans:
+        if merged and merged[-1][1] == style and merged[-1][2] == url:
+            merged[-1] = (merged[-1][0] + content, style, url)
+        elif content:
+            merged.append((content, style, url))
+    return merged or [("", {}, None)]
+
+
+def _chunk_rich_text(rich_text: List[TextType]) -> List[List[TextType]]:
+    return [
+        rich_text[start:start + RICH_TEXT_ITEMS_LIMIT]
+        for start in range(0, len(rich_text), RICH_TEXT_ITEMS_LIMIT)
+    ] or [[]]
+
+
+def _code_language(info: str) -> str:
+    language = info.strip().lower()
+    language = CODE_LANGUAGE_ALIASES.get(language, language)
+    return language if language in CODE_LANGUAGES else "plain text"
+
+
+def _split_table_row(line: str) -> List[str]:
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [cell.strip().replace("\\|", "|") for cell in re.split(r"(?<!\\)\|", line)]
+
+
+class _ListItem:
+    def __init__(self, indent: int, marker: str, text: str):
+        self.indent = indent
+        self.numbered = marker[0].isdigit()
+        self.checked = None
+        task = _TASK.match(text)
+        if task:
+            self.checked = task.group(1) != " "
+            text = task.group(2)
+        self.lines = [text]
+        self.children: List['_ListItem'] = []
+
+    def to_blocks(self) -> List[BaseModel]:
+        children = [block_to_dict(block) for child in self.children for block in child.to_blocks()]
+        chunks = _chunk_rich_text(parse_inline(" ".join(self.lines)))
+
+        blocks = []
+        for index, rich_text in enumerate(chunks):
+            nested = (children or None) if index == len(chunks) - 1 else None
+            if self.checked is not None:
+                blocks.append(ToDoBlock(to_do=ToDoContent(rich_text=rich_text, checked=self.checked, color="default", children=nested)))
+            elif self.numbered:
+                blocks.append(NumberedListItemBlock(numbered_list_item=NumberedListItemContent(rich_text=rich_text, color="default", children=nested)))
+            else:
+                blocks.append(BulletedListItemBlock(bulleted_list_item=BulletedListItemContent(rich_text=rich_text, color="default", children=nested)))
+        return blocks
+
+
+def markdown_to_blocks(text: str) -> List[BaseModel]:
+    """
+    Converts a Markdown document to Notion block models.
+
+    Supports headings, paragraphs, nested bulleted, numbered and to-do lists, quotes,
+    fenced code, dividers, pipe tables and standalone images, with inline bold, italic,
+    strikethrough, code and links. Rich text is split at Notion's 2000-character limit,
+    and text longer than one block can hold continues in a block of the same type.
+
+    Args:
+        text (str): The Markdown document.
+
+    Returns:
+        List[BaseModel]: The top-level block models, with nested list items and table rows in their `children`.
+    """
+    blocks: List[BaseModel] = []
+    paragraph: List[str] = []
+    list_stack: List[_ListItem] = []
+
+    def flush_paragraph() -> None:
+        if paragraph:
+            content = ""
+            for line in paragraph:
+                if content and not content.endswith("\n"):
+                    content += " "
+                if line.endswith("  ") or line.endswith("\\"):
+                    content += line.rstrip(" \\") + "\n"
+                else:
+                    content += line.strip()
+            for rich_text in _chunk_rich_text(parse_inline(content.rstrip("\n"))):
+                blocks.append(ParagraphBlock(paragraph=ParagraphContent(rich_text=rich_text, color="default")))
+            paragraph.clear()
+
+    def flush_list() -> None:
+        if list_stack:
+            blocks.extend(list_stack[0].to_blocks())
+            list_stack.clear()
+
+    def add_list_item(item: _ListItem) -> None:
+        while list_stack and list_stack[-1].indent >= item.indent:
+            finished = list_stack.pop()
+            if not list_stack:
+                blocks.extend(finished.to_blocks())
+        if list_stack:
+            list_stack[-1].children.append(item)
+        list_stack.append(item)
+
+    lines = text.replace("\r\n", "\n").replace("\t", "    ").split("\n")
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        index += 1
+
+        if not line.strip():
+            flush_paragraph()
+            continue
+
+        list_item = _LIST_ITEM.match(line)
+        if list_stack and not list_item and not _FENCE.match(line):
+            indent = len(line) - len(line.lstrip())
+            if indent > list_stack[0].indent:
+                list_stack[-1].lines.append(line.strip())
+                continue
+            flush_list()
+
+        fence = _FENCE.match(line)
+        if fence:
+            flush_paragraph()
+            flush_list()
+            marker = fence.group(2)
+            code_lines = []
+            while index < len(lines) and not lines[index].strip().startswith(marker):
+                code_lines.append(lines[index])
+                index += 1
+            index += 1
+            language = _code_language(fence.group(3))
+            for rich_text in _chunk_rich_text(text_to_rich_text("\n".join(code_lines))):
+                blocks.append(CodeBlock(code=CodeContent(caption=[], rich_text=rich_text, language=language)))
+            continue
+
+        heading = _HEADING.match(line)
+        if heading:
+            flush_paragraph()
+            level = min(len(heading.group(1)), 3)
+            for rich_text in _chunk_rich_text(parse_inline(heading.group(2))):
+                if level == 1:
+                    blocks.append(Heading1Block(heading_1=Heading1Content(rich_text=rich_text, color="default", is_toggleable=False)))
+                elif level == 2:
+                    blocks.append(Heading2Block(heading_2=Heading2Content(rich_text=rich_text, color="default", is_toggleable=False)))
+                else:
+                    blocks.append(Heading3Block(heading_3=Heading3Content(rich_text=rich_text, color="default", is_toggleable=False)))
+            continue
+
+        setext = _SETEXT.match(line)
+        if setext and paragraph and not list_stack:
+            content = " ".join(part.strip() for part in paragraph)
+            paragraph.clear()
+            for rich_text in _chunk_rich_text(parse_inline(content)):
+                if setext.group(1)[0] == "=":
+                    blocks.append(Heading1Block(heading_1=Heading1Content(rich_text=rich_text, color="default", is_toggleable=False)))
+                else:
+                    blocks.append(Heading2Block(heading_2=Heading2Content(rich_text=rich_text, color="default", is_toggleable=False)))
+            continue
+
+        if _DIVIDER.match(line) and not paragraph:
+            flush_list()
+            blocks.append(DividerBlock())
+            continue
+
+        if list_item:
+            flush_paragraph()
+            add_list_item(_ListItem(len(list_item.group(1)), list_item.group(2), list_item.group(3)))
+            continue
+
+        quote = _QUOTE.match(line)
+        if quote:
+            flush_paragraph()
+            quote_lines = [quote.group(1)]
+            while index < len(lines) and _QUOTE.match(lines[index]):
+                quote_lines.append(_QUOTE.match(lines[index]).group(1))
+                index += 1
+            for rich_text in _chunk_rich_text(parse_inline("\n".join(quote_lines))):
+                blocks.append(QuoteBlock(quote=QuoteContent(rich_text=rich_text, color="default")))
+            continue
+
+        if "|" in line and index < len(lines) and _TABLE_SEPARATOR.match(lines[index]) and "-" in lines[index]:
+            flush_paragraph()
+            rows = [_split_table_row(line)]
+            index += 1
+            while index < len(lines) and lines[index].strip() and "|" in lines[index]:
+                rows.append(_split_table_row(lines[index]))
+                index += 1
+            width = max(len(row) for row in rows)
+            table_rows = [
+                block_to_dict(TableRowBlock(table_row=TableRowContent(
+                    cells=[parse_inline(cell) for cell in row + [""] * (width - len(row))]
+                )))
+                for row in rows
+            ]
+            blocks.append(TableBlock(table=TableContent(
+                table_width=width, has_column_header=True, has_row_header=False, children=table_rows
+            )))
+            continue
+
+        image = _IMAGE.match(line)
+        if image and _URL.match(image.group(2)):
+            flush_paragraph()
+            blocks.append(ImageBlock(image_url=image.group(2)))
+            continue
+
+        paragraph.append(line)
+
+    flush_paragraph()
+    flush_list()
+    return blocks
+
+
+# Blocks rendered as consecutive lines, without a blank line between them
+_COMPACT_BLOCKS = ("bulleted_list_item", "numbered_list_item", "to_do", "toggle", "table_row")
+
+# Blocks that only group their children, which are rendered in their place
+_CONTAINER_BLOCKS = ("column_list", "column", "synced_block", "table")
+
+_ESCAPED = re.compile(r"([\\`*_\[\]~])")
+
+
+def rich_text_to_markdown(rich_text: List[Dict[str, Any]]) -> str:
+    """
+    Converts rich text items, as returned by the API, to inline Markdown, the inverse of parse_inline.
+    """
+    parts = []
+    for item in rich_text:
+        text = item.get("plain_text")
+        if text is None:
+            text = (item.get("text") or {}).get("content", "")
+        if not text:
+            continue
+        annotations = item.get("annotations") or {}
+        href = item.get("href") or ((item.get("text") or {}).get("link") or {}).get("url")
+
+        # Markers must touch the text they enclose, so surrounding whitespace stays outside
+        inner = text.strip()
+        if not inner:
+            parts.append(text)
+            continue
+        leading, trailing = text[:len(text) - len(text.lstrip())], text[len(text.rstrip()):]
+        if annotations.get("code"):
+            inner = f"`{inner}`"
+        else:
+            inner = _ESCAPED.sub(r"\\\1", inner)
+            if annotations.get("bold"):
+                inner = f"**{inner}**"
+            if annotations.get("italic"):
+                inner = f"*{inner}*"
+            if annotations.get("strikethrough"):
+                inner = f"~~{inner}~~"
+        if href:
+            inner = f"[{inner}]({href})"
+        parts.append(leading + inner + trailing)
+    return "".join(parts)
+
+
+def _file_url(content: Dict[str, Any]) -> str:
+    source = content.get(content.get("type")) or content.get("external") or content.get("file") or {}
+    return source.get("url", "")
+
+
+def _block_markdown(block: Dict[str, Any], number: int) -> Tuple[Optional[str], int]:
+    # Returns the Markdown of a block without its children, and the width its children are indented by
+    block_type = block["type"]
+    content = block.get(block_type) or {}
+    text = rich_text_to_markdown(content.get("rich_text") or [])
+
+    if block_type == "paragraph":
+        return text, 2
+    if block_type in ("heading_1", "heading_2", "heading_3"):
+        return "#" * int(block_type[-1]) + " " + text, 2
+    if block_type in ("bulleted_list_item", "toggle"):
+        return "- " + text, 2
+    if block_type == "numbered_list_item":
+        marker = f"{number}. "
+        return marker + text, len(marker)
+    if block_type == "to_do":
+        return ("- [x] " if content.get("checked") else "- [ ] ") + text, 2
+    if block_type == "quote":
+        return "> " + text.replace("\n", "\n> "), 2
+    if block_type == "callout":
+        icon = (content.get("icon") or {}).get("emoji")
+        return "> " + (f"{icon} " if icon else "") + text.replace("\n", "\n> "), 2
+    if block_type == "code":
+        code = "".join(item.get("plain_text") or (item.get("text") or {}).get("content", "") for item in content.get("rich_text") or [])
+        language = content.get("language", "")
+        return f"```{'' if language == 'plain text' else language}\n{code}\n```", 2
+    if block_type == "divider":
+        return "---", 2
+    if block_type == "equation":
+        return f"$$ {content.get('expression', '')} $$", 2
+    if block_type == "image":
+        return f"![{rich_text_to_markdown(content.get('caption') or [])}]({_file_url(content)})", 2
+    if block_type in ("video", "audio", "file", "pdf"):
+        url = _file_url(content)
+        caption = rich_text_to_markdown(content.get("caption") or []) or content.get("name") or url
+        return f"[{caption}]({url})", 2
+    if block_type in ("bookmark", "embed", "link_preview"):
+        url = content.get("url", "")
+        return f"[{rich_text_to_markdown(content.get('caption') or []) or url}]({url})", 2
+    if block_type in ("child_page", "child_database"):
+        return f"[{content.get('title', '')}](https://www.notion.so/{block['id'].replace('-', '')})", 2
+    if block_type == "table_row":
+        cells = [rich_text_to_markdown(cell).replace("|", "\\|").replace("\n", " ") for cell in content.get("cells", [])]
+        return "| " + " | ".join(cells) + " |", 2
+    return None, 2
+
+
+def blocks_to_markdown(blocks: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Converts blocks to Markdown as they arrive, one chunk per block, so that a page of any size can be
+    exported without holding it in memory.
+
+    Takes the blocks of one page depth first in document order, each followed by its
+    children, as `BlockAPI.walk` yields them. Nesting is taken from the parent of each
+    block. Headings, paragraphs, lists, to-dos, quotes, code, dividers, tables and
+    images come out as markdown_to_blocks reads them; toggles become list items,
+    callouts quotes, and files, bookmarks and child pages links. Columns are
+    flattened, and blocks Markdown can't show are left out.
+
+    Args:
+        blocks (Iterable[Dict[str, Any]]): The blocks as returned by the API.
+
+    Yields:
+        str: The Markdown of each block, ending in a newline and preceded by a blank line where needed.
+    """
+    indents: Dict[str, str] = {}
+    numbers: Dict[str, int] = {}
+    rows: Dict[str, int] = {}
+    previous = None
+    for block in blocks:
+        parent = block.get("parent") or {}
+        parent_id = parent.get("block_id") or parent.get("page_id")
+        indent = indents.get(parent_id, "")
+        block_type = block["type"]
+
+        # Numbered items count on while they follow each other under the same parent
+        number = numbers.get(parent_id, 0) + 1 if block_type == "numbered_list_item" else 0
+        numbers[parent_id] = number
+
+        if block_type in _CONTAINER_BLOCKS:
+            indents[block["id"]] = indent
+            continue
+        markdown, width = _block_markdown(block, number)
+        if block.get("has_children"):
+            indents[block["id"]] = indent + " " * width
+        if markdown is None:
+            continue
+
+        if block_type == "table_row":
+            # Markdown tables need a separator after their first row
+            rows[parent_id] = rows.get(parent_id, 0) + 1
+            if rows[parent_id] == 1:
+                width = len(block["table_row"].get("cells", []))
+                markdown += "\n|" + " --- |" * width
+        lines = "\n".join(indent + line if line else line for line in markdown.split("\n")) + "\n"
+        # The rows of one table, and list items, follow each other without blank lines
+        group = f"table {parent_id}" if block_type == "table_row" else "list" if block_type in _COMPACT_BLOCKS else None
+        separate = previous is not None and (group is None or group != previous)
+        previous = group or block_type
+        yield ("\n" if separate else "") + lines
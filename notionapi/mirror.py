@@ -0,0 +1,144 @@
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from .bulk import matching_page_ids
+
+
+class MirrorResult(BaseModel):
+    """
+    The outcome of a mirror sync.
+
+    Attributes:
+        fetched (int): How many pages were retrieved.
+        changed (int): How many rows were added or changed in the mirror.
+        removed (int): How many rows were removed because their pages were archived or deleted.
+        rows (int): How many rows the mirror has after the sync.
+        watermark (Optional[str]): The latest last edited time in the mirror, where the next sync starts.
+    """
+    fetched: int = 0
+    changed: int = 0
+    removed: int = 0
+    rows: int = 0
+    watermark: Optional[str] = None
+
+
+class DatabaseMirror:
+    """
+    Keeps a local copy of the rows of a database in an NDJSON file, fetching only the
+    pages edited since the last sync. Each line holds a page's "id", "last_edited_time"
+    and "properties", its plain property values by name.
+
+    Each sync queries the pages edited on or after the watermark, the latest last
+    edited time seen, which is kept next to the mirror in a `.state` file. Notion
+    reports edit times to the minute, so the pages of the watermark minute are fetched
+    again; applying them twice is harmless. Archived pages drop out of queries, so they
+    are only noticed by a reconciling sync, which lists the IDs of all pages.
+
+    Both files are replaced atomically, so a sync that fails leaves the previous
+    mirror, and the next sync starts from its watermark.
+
+    Args:
+        api (NotionAPI): The client to sync with.
+        database_id (str): The ID of the database.
+        path (str): The NDJSON file of the mirror.
+        properties (Optional[List[str]], optional): The names or IDs of the only properties to mirror. Defaults to None, all of them.
+    """
+
+    def __init__(self, api: Any, database_id: str, path: str, properties: Optional[List[str]] = None):
+        self.api = api
+        self.database_id = database_id
+        self.path = path
+        self.state_path = f"{path}.state"
+        self.properties = properties
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the mirrored rows, the plain property values by name, by page ID.
+        """
+        return {page_id: record["properties"] for page_id, record in self._load_records().items()}
+
+    def _load_records(self) -> Dict[str, Dict[str, Any]]:
+        records = {}
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        records[record["id"]] = record
+        except FileNotFoundError:
+            pass
+        return records
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def sync(self, reconcile: bool = False, progress: Optional[Callable[[MirrorResult], None]] = None) -> MirrorResult:
+        """
+        Brings the mirror up to date.
+
+        Args:
+            reconcile (bool, optional): Whether to also remove the rows of pages that were archived or deleted,
+                at the cost of listing every page. Defaults to False.
+            progress (Optional[Callable[[MirrorResult], None]], optional): Called with the counts so far after each result page. Defaults to None.
+
+        Returns:
+            MirrorResult: What was fetched and changed.
+        """
+        database = self.api.database
+        codec = database.codec(self.database_id)
+        filter_properties = database._projection(self.database_id, self.properties)
+        names = codec.names(filter_properties) if filter_properties is not None else None
+
+        state = self._load_state()
+        # A mirror of other properties can't be updated incrementally
+        incremental = state.get("properties") == self.properties and os.path.exists(self.path)
+        watermark = state.get("watermark") if incremental else None
+        records = self._load_records() if watermark else {}
+        result = MirrorResult(watermark=watermark)
+
+        query: Dict[str, Any] = {"sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}], "page_size": 100}
+        if watermark:
+            query["filter"] = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": watermark}}
+        while True:
+            data = database._query(self.database_id, query, filter_properties=filter_properties)
+            for page in data.get("results", []):
+                record = {"id": page["id"], "last_edited_time": page["last_edited_time"], "properties": codec.decode(page, names)}
+                # As it reads back from the file, with date ranges as lists
+                record = json.loads(json.dumps(record, default=str))
+                result.fetched += 1
+                if records.get(page["id"]) != record:
+                    records[page["id"]] = record
+                    result.changed += 1
+                if result.watermark is None or page["last_edited_time"] > result.watermark:
+                    result.watermark = page["last_edited_time"]
+            if progress:
+                progress(result)
+            if not data.get("has_more"):
+                break
+            query["start_cursor"] = data.get("next_cursor")
+
+        if reconcile:
+            present = set(matching_page_ids(database, self.database_id, None, repeat=False))
+            for page_id in [page_id for page_id in records if page_id not in present]:
+                del records[page_id]
+                result.removed += 1
+
+        result.rows = len(records)
+        if result.changed or result.removed or not os.path.exists(self.path):
+            _replace(self.path, "".join(json.dumps(record, default=str) + "\n" for record in records.values()))
+        _replace(self.state_path, json.dumps({"database_id": self.database_id, "watermark": result.watermark, "properties": self.properties}))
+        return result
+
+
+def _replace(path: str, content: str) -> None:
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        f.write(content)
+    os.replace(temporary, path)
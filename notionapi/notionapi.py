@@ -1,11 +1,22 @@
 import requests
 import json
+import re
+from collections import deque
+from urllib.parse import unquote
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional, Union, get_origin, get_args
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple, Union, get_origin, get_args
 from .types import *
-from .blocks import *
+from .serialization import serialize, encode_json, block_to_dict, get_block_type, get_block_children
+from .diff import block_hash, plan_block_diff
+from .transport import Transport, TransportResponse, RequestsTransport
+from .deadlines import deadline, effective_timeout, propagate
+from .interning import InternPool
 
 
+# Seconds a request may wait for the connection or for data before failing, unless the client or call says otherwise
+DEFAULT_TIMEOUT = 60.0
+
 
 class NotionAPI:
     """
@@ -14,23 +25,136 @@ class NotionAPI:
     Attributes:
         token (str): The API token for authentication.
         base_url (str): The base URL for the Notion API.
+        transport (Transport): The transport all requests are sent through.
+        timeout (Optional[float]): The default timeout of each request in seconds.
+        intern_pool (Optional[InternPool]): The pool that pages parsed by this client share sub-objects through, if any.
         database (DatabaseObject): An instance to interact with Notion databases.
         page (PageAPI): An instance to interact with Notion pages.
     """
     
-    def __init__(self, token: str):
+    def __init__(self, token: str, transport: Optional[Transport] = None, timeout: Optional[float] = DEFAULT_TIMEOUT,
+                 intern_pool: Optional[InternPool] = None):
         """
         Initializes the NotionAPI with the provided token.
 
         Args:
             token (str): The API token for authentication.
+            transport (Optional[Transport], optional): The transport to send requests through. Defaults to a pooled HTTP/1.1 RequestsTransport.
+            timeout (Optional[float], optional): The default timeout of each request in seconds; None waits forever. Defaults to DEFAULT_TIMEOUT.
+            intern_pool (Optional[InternPool], optional): A pool for all pages parsed by this client to share users, parents,
+                options and strings through. Defaults to None.
         """
         self.token = token
         self.base_url = "https://api.notion.com/v1"
+        self.transport = transport or RequestsTransport()
+        self.timeout = timeout
+        self.intern_pool = intern_pool
 
         self.database = DatabaseObject(self)
         self.page = PageAPI(self)
 
+    def request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None, body: Any = None,
+                timeout: Optional[float] = None) -> TransportResponse:
+        """
+        Sends an authenticated request through the transport.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The absolute URL.
+            params (Optional[Dict[str, Any]], optional): The query string parameters. Defaults to None.
+            body (Any, optional): The request body, which may contain models; encoded with encode_json. Defaults to None.
+            timeout (Optional[float], optional): The timeout of this request in seconds. Defaults to the client's timeout.
+
+        Returns:
+            TransportResponse: The response, whatever its status code.
+
+        Raises:
+            DeadlineExceeded: If the current deadline has passed; the request is not sent.
+        """
+        data = encode_json(body) if body is not None else None
+        return self.transport.send(method, url, headers=self._get_headers(), params=params, body=data,
+                                   timeout=self._request_timeout(timeout))
+
+    def stream(self, method: str, url: str, params: Optional[Dict[str, Any]] = None, body: Any = None, chunk_size: int = 65536,
+               timeout: Optional[float] = None):
+        """
+        Sends an authenticated request through the transport and yields the response body in chunks.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The absolute URL.
+            params (Optional[Dict[str, Any]], optional): The query string parameters. Defaults to None.
+            body (Any, optional): The request body, which may contain models. Defaults to None.
+            chunk_size (int, optional): The preferred chunk size in bytes. Defaults to 65536.
+            timeout (Optional[float], optional): The timeout of this request in seconds. Defaults to the client's timeout.
+
+        Yields:
+            bytes: The response body chunks.
+        """
+        data = encode_json(body) if body is not None else None
+        yield from self.transport.stream(method, url, headers=self._get_headers(), params=params, body=data, chunk_size=chunk_size,
+                                         timeout=self._request_timeout(timeout))
+
+    def deadline(self, seconds: float):
+        """
+        Returns a context manager limiting the total time of all calls in its with block, across
+        pagination, rate limit waits and the library's worker threads. See `notionapi.deadlines.deadline`.
+
+        Example:
+            with notion_api.deadline(5):
+                children = notion_api.page.block.get(page_id)
+        """
+        return deadline(seconds)
+
+    def _request_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        return effective_timeout(timeout if timeout is not None else self.timeout)
+
+    def search(self, query: Optional[str] = None, filter: Optional[Dict[str, Any]] = None, sort: Optional[Dict[str, Any]] = None,
+               page_size: int = 100):
+        """
+        Iterates over the pages and databases shared with the integration, fetching further result pages as needed.
+
+        Args:
+            query (Optional[str], optional): Text to match against titles. Defaults to None, matching everything.
+            filter (Optional[Dict[str, Any]], optional): Limits the results to pages or databases, e.g. {"property": "object", "value": "page"}. Defaults to None.
+            sort (Optional[Dict[str, Any]], optional): The sort order, e.g. {"timestamp": "last_edited_time", "direction": "descending"}. Defaults to None.
+            page_size (int, optional): The number of results per request. Defaults to 100.
+
+        Yields:
+            Dict[str, Any]: The page and database objects as returned by the API.
+        """
+        body: Dict[str, Any] = {"page_size": page_size}
+        if query:
+            body["query"] = query
+        if filter:
+            body["filter"] = filter
+        if sort:
+            body["sort"] = sort
+
+        while True:
+            data = self._search(body)
+            yield from data.get("results", [])
+            if not data.get("has_more"):
+                break
+            body["start_cursor"] = data.get("next_cursor")
+
+    def _search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.request("POST", f"{self.base_url}/search", body=body)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self) -> None:
+        """
+        Closes the transport and its connections.
+        """
+        self.transport.close()
+
+    def __enter__(self) -> 'NotionAPI':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def _get_headers(self) -> Dict[str, str]:
         """
         Returns the headers required for API requests.
@@ -81,12 +205,13 @@ class PageObject(BaseModel):
     url: str
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'PageObject':
+    def from_dict(cls, data: Dict[str, Any], pool: Optional[InternPool] = None) -> 'PageObject':
         """
         Initializes a PageObject from a dictionary.
 
         Args:
             data (Dict[str, Any]): A dictionary containing the page data.
+            pool (Optional[InternPool], optional): A pool to share users, parents, options and strings through. Defaults to None.
 
         Returns:
             PageObject: A new instance of PageObject.
@@ -101,20 +226,64 @@ class PageObject(BaseModel):
                 print("___ does this ever happen?")
                 properties[key] = value
 
-        return cls(
+        if pool is not None:
+            # Repeated users and parents are only built once
+            created_by = pool.model(UserObject, data['created_by'])
+            last_edited_by = pool.model(UserObject, data['last_edited_by'])
+            parent = pool.model(ParentObject, data['parent'], ParentObject.from_dict)
+        else:
+            created_by = UserObject(**data['created_by'])
+            last_edited_by = UserObject(**data['last_edited_by'])
+            parent = ParentObject.from_dict(data['parent'])
+
+        page = cls(
             object=data['object'],
             id=data['id'],
             created_time=CreatedTimeObject(created_time=data['created_time']),
             last_edited_time=LastEditedTimeObject(last_edited_time=data['last_edited_time']),
-            created_by=UserObject(**data['created_by']),
-            last_edited_by=UserObject(**data['last_edited_by']),
+            created_by=created_by,
+            last_edited_by=last_edited_by,
             # cover=Cover(**data['cover']) if data.get('cover') else None,
             # icon=Emoji(**data.get('icon')) if data.get('icon') else None,
-            parent=ParentObject.from_dict(data['parent']),
+            parent=parent,
             archived=data['archived'],
             properties=properties,
             url=data['url']
         )
+        return pool.page(page) if pool is not None else page
+
+
+# Page objects include at most this many items of list-valued properties
+PROPERTY_ITEM_LIMIT = 25
+
+
+def _is_truncated_property(value: Dict[str, Any]) -> bool:
+    """
+    Tells whether an inline property value may have been cut off at the property item limit.
+
+    Relations say so explicitly. Title, rich text and people values can only be
+    recognised by reaching the limit, and array rollups are computed from the same
+    truncated items.
+    """
+    type_name = value.get("type")
+    if type_name == "relation":
+        return bool(value.get("has_more"))
+    if type_name in ("title", "rich_text", "people"):
+        return len(value.get(type_name) or []) >= PROPERTY_ITEM_LIMIT
+    if type_name == "rollup":
+        rollup = value.get("rollup") or {}
+        return rollup.get("type") == "array" and len(rollup.get("array") or []) >= PROPERTY_ITEM_LIMIT
+    return False
+
+
+def _filter_properties_params(properties: Optional[List[str]]) -> Optional[Dict[str, Any]]:
+    """
+    Returns the query string selecting the given properties, or None for all of them.
+    """
+    if not properties:
+        return None
+    # Property IDs come URL-encoded, such as "%3AsT", and would otherwise be encoded twice
+    return {"filter_properties": [unquote(property_id) for property_id in properties]}
 
 
 class PageAPI:
@@ -123,18 +292,211 @@ class PageAPI:
         self.page_id = page_id
         self.block = BlockAPI(api=api, parent_id=page_id)
 
-    def get(self, page_id) -> 'PageObject':
+    def get(self, page_id, complete_properties: bool = False, max_workers: int = 4, properties: Optional[List[str]] = None) -> 'PageObject':
+        """
+        Retrieves a page.
+
+        Args:
+            page_id (str): The ID of the page.
+            complete_properties (bool, optional): Whether to fetch the full value of properties the API truncated. Defaults to False.
+            max_workers (int, optional): How many truncated properties to fetch concurrently. Defaults to 4.
+            properties (Optional[List[str]], optional): The IDs of the only properties to retrieve and parse, sent as
+                filter_properties. Defaults to None, all properties.
+
+        Returns:
+            PageObject: The page.
+        """
         endpoint_url = f"{self.api.base_url}/pages/{page_id}"
-        headers = self.api._get_headers()
-        response = requests.get(endpoint_url, headers=headers)
+        response = self.api.request("GET", endpoint_url, params=_filter_properties_params(properties))
         response.raise_for_status()
 
-        page = PageObject.from_dict(response.json())
+        data = response.json()
+        if complete_properties:
+            self._complete_properties([data], max_workers=max_workers)
+
+        page = PageObject.from_dict(data, pool=self.api.intern_pool)
 
         return page
 
+    def create(self, parent: Union[str, Dict[str, Any]], properties: Dict[str, Any], icon: Optional[Dict[str, Any]] = None,
+               cover: Optional[Dict[str, Any]] = None) -> 'PageObject':
+        """
+        Creates a page.
+
+        Args:
+            parent (Union[str, Dict[str, Any]]): The ID of the parent page, or a parent payload such as {"database_id": ...}.
+            properties (Dict[str, Any]): The property payloads by property name. Outside of a database only the title.
+            icon (Optional[Dict[str, Any]], optional): The icon payload. Defaults to None.
+            cover (Optional[Dict[str, Any]], optional): The cover payload. Defaults to None.
+
+        Returns:
+            PageObject: The new page.
+        """
+        from .clone import parent_payload
+        body = {"parent": parent_payload(parent), "properties": properties}
+        if icon:
+            body["icon"] = icon
+        if cover:
+            body["cover"] = cover
+
+        return PageObject.from_dict(self._create(body), pool=self.api.intern_pool)
+
+    def _create(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.api.request("POST", f"{self.api.base_url}/pages", body=body)
+        response.raise_for_status()
+        return response.json()
+
+    def clone(self, page_id: str, new_parent: Union[str, Dict[str, Any]], properties_override: Optional[Dict[str, Any]] = None,
+              max_workers: int = 4) -> 'PageObject':
+        """
+        Copies a page with its properties, icon, cover and content to a new parent.
+
+        The block tree is fetched level by level, with the children of each level's
+        blocks fetched concurrently, and converted into blocks that can be written. The
+        copy is then created with `append_all`: 100 blocks per request, nested children in
+        one wave per level, the parents of a wave filled concurrently.
+
+        Some things can't be copied through the API and are left out: read-only
+        properties (formulas, rollups, unique IDs and the like), files and images uploaded
+        to Notion, child pages and databases, and link previews. Copies of synced blocks
+        keep referencing their original.
+
+        Args:
+            page_id (str): The ID of the page to copy.
+            new_parent (Union[str, Dict[str, Any]]): The ID of the parent page, or a parent payload such as {"database_id": ...}.
+            properties_override (Optional[Dict[str, Any]], optional): Property payloads to use instead of the copied ones. Defaults to None.
+            max_workers (int, optional): How many requests to run concurrently. Defaults to 4.
+
+        Returns:
+            PageObject: The new page.
+
+        Raises:
+            requests.exceptions.HTTPError: If a request fails. A partially filled copy is not removed.
+        """
+        from .clone import parent_payload, writable_block, writable_properties
+
+        response = self.api.request("GET", f"{self.api.base_url}/pages/{page_id}")
+        response.raise_for_status()
+        page = response.json()
+        self._complete_properties([page], max_workers=max_workers)
+        tree = self.block._fetch_tree(page_id, max_workers=max_workers)
+
+        def copy(block: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            children = [child for child in (copy(child) for child in tree.get(block["id"], [])) if child]
+            return writable_block(block, children)
+
+        children = [block for block in (copy(block) for block in tree[page_id]) if block]
+
+        parent = parent_payload(new_parent)
+        properties = writable_properties(page.get("properties", {}), in_database="database_id" in parent)
+        properties.update(properties_override or {})
+        # Icons and covers uploaded to Notion can't be written back
+        icon, cover = ((page.get(key) if (page.get(key) or {}).get("type") != "file" else None) for key in ("icon", "cover"))
+
+        new_page = self.create(parent, properties, icon=icon, cover=cover)
+        self.block.append_all(new_page.id, children, max_workers=max_workers)
+        return new_page
+
+    def get_property(self, page_id: str, property_id: str, page_size: int = 100) -> Dict[str, Any]:
+        """
+        Retrieves the complete value of a page property, paging through the property item endpoint.
+
+        Page objects carry at most 25 items of title, rich text, relation and people
+        properties, and rollups computed over them. This returns the full value.
+
+        Args:
+            page_id (str): The ID of the page.
+            property_id (str): The ID of the property, as found in the page properties.
+            page_size (int, optional): The number of property items per request. Defaults to 100.
+
+        Returns:
+            Dict[str, Any]: The property value in the same shape as in a page object's properties.
+        """
+        url = f"{self.api.base_url}/pages/{page_id}/properties/{property_id}"
+        params = {
+            "page_size": page_size
+        }
+
+        items = []
+        while True:
+            response = self.api.request("GET", url, params=params)
+            response.raise_for_status()
+            data = response.json()
+
+            # Properties that are not paginated come back as a single property item
+            if data.get("object") == "property_item":
+                return {key: value for key, value in data.items() if key != "object"}
+
+            items.extend(data.get("results", []))
+            if not data.get("has_more"):
+                break
+            params["start_cursor"] = data.get("next_cursor")
+
+        property_item = data.get("property_item", {})
+        type_name = property_item.get("type")
+        value = {"id": property_item.get("id", property_id), "type": type_name}
+        if type_name == "rollup":
+            rollup = dict(property_item.get("rollup") or {})
+            if rollup.get("type") == "array" or items:
+                rollup["type"] = "array"
+                rollup["array"] = [{key: item[key] for key in ("type", item.get("type")) if key in item} for item in items]
+            value["rollup"] = rollup
+        else:
+            value[type_name] = [item[type_name] for item in items]
+            if type_name == "relation":
+                value["has_more"] = False
+        return value
+
+    def _complete_properties(self, pages: List[Dict[str, Any]], max_workers: int = 4) -> None:
+        """
+        Replaces truncated properties in raw page payloads with their complete values, fetching them concurrently.
+        """
+        jobs = [
+            (page, name, value)
+            for page in pages
+            for name, value in page.get("properties", {}).items()
+            if _is_truncated_property(value)
+        ]
+        if not jobs:
+            return
+
+        fetch = propagate(lambda job: self.get_property(job[0]["id"], job[2]["id"]))
+        if max_workers > 1 and len(jobs) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                values = list(executor.map(fetch, jobs))
+        else:
+            values = [fetch(job) for job in jobs]
+
+        for (page, name, _), value in zip(jobs, values):
+            page["properties"][name] = value
+
     def update(self, page_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        properties = self._prepare_properties(page_id, properties)
+        if properties is None:
+            return None
+
+        # Update page properties through Notion API
+        print(f"trying to update page {page_id} with properties {properties}")
+        try:
+            data = self._patch_properties(page_id, properties)
+            print(f"updated page {page_id} with properties {properties}\n\n")
+            return data
+        except requests.exceptions.Timeout:
+            raise
+        except Exception as e:
+            response = getattr(e, "response", None)
+            print(f"...Error updating page properties: {e}, {vars(response) if response is not None else ''}")
+            return None
+
+    def _prepare_properties(self, page_id: str, properties: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Turns string shorthand values into property payloads, retrieving the page only if there are any.
+        Returns None if a value can't be applied. The given dict is left as it is.
+        """
+        if not any(isinstance(v, str) for v in properties.values()):
+            return properties
         page = self.get(page_id=page_id)
+        prepared = dict(properties)
 
         # Normalize properties to be passed to Notion API
         for k, v in properties.items():
@@ -158,27 +520,17 @@ class PageAPI:
                         return None
 
                     print(f"...page.properties[{k}] (type {type(page.properties[k])}: {page.properties[k]}")
-                    properties[k] = page.properties[k].dict()
-            # if the property is passed as a properly structured dict
-            elif isinstance(v, dict):
-                properties[k] = v
-
+                    prepared[k] = serialize(page.properties[k])
+        return prepared
 
-        # Update page properties through Notion API
-        print(f"trying to update page {page_id} with properties {properties}")
+    def _patch_properties(self, page_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
         url = f"{self.api.base_url}/pages/{page_id}"
-        headers = self.api._get_headers()
         data = {
             "properties": properties
         }
-        try:
-            response = requests.patch(url, headers=headers, json=data)
-            response.raise_for_status()
-            print(f"updated page {page_id} with properties {properties}\n\n")
-            return response.json()
-        except Exception as e:
-            print(f"...Error updating page properties: {e}, {vars(response)}")
-            return None
+        response = self.api.request("PATCH", url, body=data)
+        response.raise_for_status()
+        return response.json()
 
 
 """
@@ -216,6 +568,95 @@ class BlockObject(BaseModel):
         )
 
 
+# Notion accepts at most 100 children per array and 1000 blocks per append request
+MAX_BLOCKS_PER_APPEND = 100
+MAX_BLOCKS_PER_REQUEST = 1000
+
+
+def _split_nested_children(block: Dict[str, Any]):
+    """
+    Separates the children that can be sent with a block from those that have to wait for a follow-up wave.
+    """
+    block_type = get_block_type(block)
+    children = get_block_children(block)
+    if not children:
+        return block, []
+
+    if block_type == "column_list":
+        return _split_column_list(block, children)
+
+    # Tables must be created with their rows, so the first batch of rows stays inline
+    inline = children[:MAX_BLOCKS_PER_APPEND] if block_type == "table" else []
+    content = {key: value for key, value in block[block_type].items() if key != "children"}
+    if inline:
+        content["children"] = inline
+    return {**block, block_type: content}, children[len(inline):]
+
+
+def _split_column_list(block: Dict[str, Any], columns: List[Dict[str, Any]]):
+    """
+    Keeps the columns of a column list and their blocks inline, because Notion requires it.
+
+    The children of the blocks inside the columns are returned per column and block,
+    to be appended once the IDs of the new blocks are known.
+    """
+    inline_columns, deferred = [], []
+    for column in columns:
+        inline, column_deferred = [], []
+        for child in get_block_children(column):
+            payload, nested = _split_nested_children(child)
+            inline.append(payload)
+            column_deferred.append(nested)
+        content = {key: value for key, value in column.get("column", {}).items() if key != "children"}
+        inline_columns.append({**column, "column": {**content, "children": inline}})
+        deferred.append(column_deferred)
+
+    content = {key: value for key, value in block["column_list"].items() if key != "children"}
+    nested = deferred if any(any(column) for column in deferred) else []
+    return {**block, "column_list": {**content, "children": inline_columns}}, nested
+
+
+def _count_blocks(block: Dict[str, Any]) -> int:
+    return 1 + sum(_count_blocks(child) for child in get_block_children(block))
+
+
+# Blocks that can't be recreated through the blocks endpoints, so sync leaves them alone
+UNSYNCED_BLOCK_TYPES = ("child_page", "child_database")
+
+
+def _anchor_head_inserts(operations: List[tuple], current: List[Dict[str, Any]], desired: List[Dict[str, Any]]) -> List[tuple]:
+    """
+    Rewrites a diff that inserts in front of every surviving block, which the API can't do.
+
+    If the first survivor has the same type as the first new block, the survivor is
+    updated to become that block and its own content is inserted after it. Otherwise
+    the whole level is deleted and re-appended.
+    """
+    survivor = next((index for index, (operation, _, _) in enumerate(operations) if operation in ("keep", "update")), None)
+    if survivor is None:
+        return operations
+    head = [index for index, (operation, _, _) in enumerate(operations[:survivor]) if operation == "insert"]
+    if not head:
+        return operations
+
+    _, survivor_current, survivor_desired = operations[survivor]
+    first_insert = operations[head[0]][2]
+    if get_block_type(first_insert) != get_block_type(survivor_current):
+        return [("delete", block, None) for block in current] + [("insert", None, block) for block in desired]
+
+    rewritten = [("update", survivor_current, first_insert)]
+    rewritten.extend(operation for index, operation in enumerate(operations[:survivor]) if index != head[0])
+    rewritten.append(("insert", None, survivor_desired))
+    rewritten.extend(operations[survivor + 1:])
+    return rewritten
+
+
+class BlockSyncResult(BaseModel):
+    updated: List[str] = []
+    inserted: List[str] = []
+    deleted: List[str] = []
+
+
 class BlockAPI:
     def __init__(self, api: NotionAPI, parent_id: str = None):
 
@@ -235,28 +676,15 @@ class BlockAPI:
         Returns:
             List[BlockObject]: A list of appended Block objects.
         """
-        url = f"{self.api.base_url}/blocks/{block_id}/children"
-        headers = self.api._get_headers()
-
         # Ensure all children are dictionaries
-        serialized_children = []
-        for child in children:
-            if isinstance(child, BaseModel):
-                serialized_children.append(child.dict())
-            else:
-                serialized_children.append(child)
-
-        payload = {
-            "children": serialized_children
-        }
-        if after:
-            payload["after"] = after
+        serialized_children = [block_to_dict(child) for child in children]
 
         try:
-            response = requests.patch(url, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
+            data = self._append(block_id, serialized_children, after=after)
             return [BlockObject.from_dict(block) for block in data.get("results", [])]
+        except requests.exceptions.Timeout:
+            # Timeouts and passed deadlines must reach the caller, not turn into an empty result
+            raise
         except requests.exceptions.RequestException as e:
             print(f"Error appending children to block {block_id}: {e}")
             if e.response is not None:
@@ -264,22 +692,449 @@ class BlockAPI:
             return []
 
 
-    def get(self, block_id: str = None, page_size: int = 100, start_cursor: Optional[str] = None) -> Dict[str, Any]:
+    def append_all(self, block_id: str, children: List[Union[Dict[str, Any], BaseModel]], max_workers: int = 1) -> List[BlockObject]:
+        """
+        Appends a block tree of any size and depth, using as few requests as possible.
+
+        Top-level blocks are sent in batches of up to 100, in order. Nested children are
+        appended in follow-up waves once their parents exist, one wave per nesting level;
+        the parents of a wave can be filled concurrently. Table rows are sent with their
+        table because Notion requires it.
+
+        Args:
+            block_id (str): The ID of the parent block or page.
+            children (List[Union[Dict[str, Any], BaseModel]]): The blocks to append, with nested blocks in their `children`.
+            max_workers (int, optional): How many parents of a wave to fill concurrently. Defaults to 1.
+
+        Returns:
+            List[BlockObject]: The appended top-level blocks.
+
+        Raises:
+            requests.exceptions.HTTPError: If any append request fails. Blocks appended by earlier requests are kept.
+        """
+        appended, follow_up = self._append_level(block_id, [block_to_dict(child) for child in children])
+        self._append_waves(follow_up, max_workers=max_workers)
+        return appended
+
+    def append_markdown(self, block_id: str, markdown: str, max_workers: int = 1) -> List[BlockObject]:
+        """
+        Converts a Markdown document to blocks and appends them with `append_all`.
+
+        Args:
+            block_id (str): The ID of the parent block or page.
+            markdown (str): The Markdown document.
+            max_workers (int, optional): How many parents of a wave to fill concurrently. Defaults to 1.
+
+        Returns:
+            List[BlockObject]: The appended top-level blocks.
+        """
+        # Imported here so that the block models are only built when they are needed
+        from .markdown import markdown_to_blocks
+        return self.append_all(block_id, markdown_to_blocks(markdown), max_workers=max_workers)
+
+    def read_table(self, block_id: str, rich_text: bool = False, as_dataframe: bool = False) -> Any:
+        """
+        Reads all rows of a table block.
+
+        Args:
+            block_id (str): The ID of the table block.
+            rich_text (bool, optional): Whether to return the cells as lists of rich text items instead of plain text. Defaults to False.
+            as_dataframe (bool, optional): Whether to return a pandas DataFrame, with the header row, if the table has one,
+                as column names. Requires pandas. Defaults to False.
+
+        Returns:
+            List[List[Any]] or pandas.DataFrame: The cells, row by row, including any header row.
+        """
+        # Imported here so that the table helpers are only loaded when they are needed
+        from .tables import cell_text, to_dataframe
+        rows = [
+            block["table_row"]["cells"] if rich_text else [cell_text(cell) for cell in block["table_row"]["cells"]]
+            for block in self.iter_children(block_id) if block["type"] == "table_row"
+        ]
+        if not as_dataframe:
+            return rows
+        table = self._retrieve(block_id)
+        return to_dataframe(rows, table.get("table", {}).get("has_column_header", False))
+
+    def write_table(self, parent_id: str, rows: Any, has_column_header: bool = False, has_row_header: bool = False) -> BlockObject:
+        """
+        Creates a table block from a 2D array and appends it to a parent.
+
+        The table is created with its first 100 rows, and the rest are appended in batches
+        of 100, the most a request can take. Cells can be strings or other values, which
+        are converted with str, None for an empty cell, or lists of rich text items. Short
+        rows are padded with empty cells.
+
+        Args:
+            parent_id (str): The ID of the parent block or page.
+            rows (Any): The rows, as a sequence of sequences, or a pandas DataFrame whose column names become the first row.
+            has_column_header (bool, optional): Whether the first row is a header. Defaults to False, or True for a DataFrame.
+            has_row_header (bool, optional): Whether the first column is a header. Defaults to False.
+
+        Returns:
+            BlockObject: The table block.
+
+        Raises:
+            requests.exceptions.HTTPError: If any append request fails. Rows appended by earlier requests are kept.
+        """
+        from .tables import table_block, table_values
+        has_column_header = has_column_header or hasattr(rows, "columns")
+        table = table_block(table_values(rows), has_column_header=has_column_header, has_row_header=has_row_header)
+        return self.append_all(parent_id, [table])[0]
+
+    def update_table(self, block_id: str, rows: Any, max_workers: int = 4) -> 'BlockSyncResult':
+        """
+        Makes a table hold the given rows, rewriting only the rows that changed.
+
+        Rows are compared by position. Changed rows are updated in place, concurrently,
+        missing rows are appended in batches of 100, and surplus rows are deleted. The
+        width of a table can't be changed.
+
+        Args:
+            block_id (str): The ID of the table block.
+            rows (Any): The rows, as for `write_table`, including any header row.
+            max_workers (int, optional): How many rows to update or delete concurrently. Defaults to 4.
+
+        Returns:
+            BlockSyncResult: The IDs of the updated, inserted and deleted rows.
+
+        Raises:
+            ValueError: If a row is wider than the table, before anything is changed.
+        """
+        from .tables import table_row_block, table_values
+        current = [block for block in self.iter_children(block_id) if block["type"] == "table_row"]
+        width = len(current[0]["table_row"]["cells"]) if current else self._retrieve(block_id)["table"]["table_width"]
+        desired = [table_row_block(row, width) for row in table_values(rows)]
+
+        result = BlockSyncResult()
+        changed = [(block["id"], row) for block, row in zip(current, desired) if block_hash(block) != block_hash(row)]
+        surplus = [block["id"] for block in current[len(desired):]]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(propagate(lambda job: self.update(*job)), changed))
+            list(executor.map(propagate(self.delete), surplus))
+        result.updated.extend(row_id for row_id, _ in changed)
+        result.deleted.extend(surplus)
+
+        if len(desired) > len(current):
+            after = current[-1]["id"] if current else None
+            appended, _ = self._append_level(block_id, desired[len(current):], after=after)
+            result.inserted.extend(block.id for block in appended)
+        return result
+
+    def _retrieve(self, block_id: str) -> Dict[str, Any]:
+        url = f"{self.api.base_url}/blocks/{block_id}"
+        response = self.api.request("GET", url)
+        response.raise_for_status()
+        return response.json()
+
+    def _append(self, block_id: str, children: List[Dict[str, Any]], after: Optional[str] = None) -> Dict[str, Any]:
+        url = f"{self.api.base_url}/blocks/{block_id}/children"
+
+        payload = {
+            "children": children
+        }
+        if after:
+            payload["after"] = after
+
+        response = self.api.request("PATCH", url, body=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def _append_waves(self, wave: List[tuple], max_workers: int = 1) -> List[BlockObject]:
+        """
+        Appends `(parent_id, children)` jobs level by level until no nested children are left,
+        returning the blocks appended by every wave.
+        """
+        appended = []
+        while wave:
+            if max_workers > 1 and len(wave) > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    results = list(executor.map(propagate(lambda job: self._append_level(*job)), wave))
+            else:
+                results = [self._append_level(parent_id, blocks) for parent_id, blocks in wave]
+            appended.extend(block for blocks, _ in results for block in blocks)
+            wave = [job for _, jobs in results for job in jobs]
+        return appended
+
+    def _append_level(self, parent_id: str, blocks: List[Dict[str, Any]], after: Optional[str] = None):
+        """
+        Appends one parent's children in ordered batches and collects their own children for the next wave.
+        """
+        appended = []
+        follow_up = []
+
+        batch, deferred, batch_size = [], [], 0
+        batches = []
+        for block in blocks:
+            payload, nested = _split_nested_children(block)
+            size = _count_blocks(payload)
+            if batch and (len(batch) == MAX_BLOCKS_PER_APPEND or batch_size + size > MAX_BLOCKS_PER_REQUEST):
+                batches.append((batch, deferred))
+                batch, deferred, batch_size = [], [], 0
+            batch.append(payload)
+            deferred.append(nested)
+            batch_size += size
+        if batch:
+            batches.append((batch, deferred))
+
+        for batch, deferred in batches:
+            data = self._append(parent_id, batch, after=after)
+            results = [BlockObject.from_dict(block) for block in data.get("results", [])][-len(batch):]
+            for block, nested in zip(results, deferred):
+                if nested and block.type == "column_list":
+                    follow_up.extend(self._column_follow_up(block.id, nested))
+                elif nested:
+                    follow_up.append((block.id, nested))
+            appended.extend(results)
+            # Later batches go after this one, not at the end of the parent
+            if after and results:
+                after = results[-1].id
+
+        return appended, follow_up
+
+    def _column_follow_up(self, column_list_id: str, deferred: List[List[List[Dict[str, Any]]]]) -> List[tuple]:
+        """
+        Looks up the blocks created inside the columns of a column list, pairing them with their deferred children.
+        """
+        jobs = []
+        for column, column_deferred in zip(self.iter_children(column_list_id), deferred):
+            if not any(column_deferred):
+                continue
+            for child, nested in zip(self.iter_children(column["id"]), column_deferred):
+                if nested:
+                    jobs.append((child["id"], nested))
+        return jobs
+
+    def update(self, block_id: str, block: Union[Dict[str, Any], BaseModel]) -> BlockObject:
+        """
+        Updates the content of a block. The block type can't be changed, and children are left as they are.
+
+        Args:
+            block_id (str): The ID of the block to update.
+            block (Union[Dict[str, Any], BaseModel]): The new block content, as a block model or dictionary.
+
+        Returns:
+            BlockObject: The updated block.
+        """
+        block = block_to_dict(block)
+        block_type = get_block_type(block)
+        content = {key: value for key, value in block[block_type].items() if key != "children"}
+
+        url = f"{self.api.base_url}/blocks/{block_id}"
+        response = self.api.request("PATCH", url, body={block_type: content})
+        response.raise_for_status()
+        return BlockObject.from_dict(response.json())
+
+    def delete(self, block_id: str) -> BlockObject:
+        """
+        Deletes (archives) a block together with its children.
+
+        Args:
+            block_id (str): The ID of the block to delete.
+
+        Returns:
+            BlockObject: The archived block.
+        """
+        url = f"{self.api.base_url}/blocks/{block_id}"
+        response = self.api.request("DELETE", url)
+        response.raise_for_status()
+        return BlockObject.from_dict(response.json())
+
+    def sync(self, block_id: str, desired_children: List[Union[Dict[str, Any], BaseModel]], max_workers: int = 1) -> 'BlockSyncResult':
+        """
+        Makes the children of a block match the desired tree with as few requests as possible.
+
+        The current tree is fetched and compared level by level with a sequence diff over
+        block content hashes. Unchanged blocks are kept, changed blocks of the same type
+        are updated in place, and only the rest is inserted or deleted. Child pages and
+        child databases are never touched.
+
+        Notion can't insert before the first block, so when new blocks have to go in front
+        of every kept block, that level is deleted and re-appended as a whole.
+
+        Args:
+            block_id (str): The ID of the parent block or page.
+            desired_children (List[Union[Dict[str, Any], BaseModel]]): The blocks that should be there, with nested blocks in their `children`.
+            max_workers (int, optional): How many parents of a wave to fill concurrently when inserting nested blocks. Defaults to 1.
+
+        Returns:
+            BlockSyncResult: The IDs of the updated, inserted and deleted blocks, with the nested blocks appended below inserted ones.
+        """
+        result = BlockSyncResult()
+        self._sync_level(block_id, [block_to_dict(child) for child in desired_children], result, max_workers)
+        return result
+
+    def iter_children(self, block_id: str = None, page_size: int = 100):
+        """
+        Iterates over all children of a block, fetching further pages as needed.
+
+        Args:
+            block_id (str, optional): The ID of the block. Defaults to the parent_id of this BlockAPI.
+            page_size (int, optional): The number of blocks per request. Defaults to 100.
+
+        Yields:
+            Dict[str, Any]: The child blocks as returned by the API.
+        """
         if not block_id:
             block_id = self.parent_id
-        
+
+        start_cursor = None
+        while True:
+            data = self._get(block_id, page_size=page_size, start_cursor=start_cursor)
+            yield from data.get("results", [])
+            if not data.get("has_more"):
+                break
+            start_cursor = data.get("next_cursor")
+
+    def walk(self, block_id: str = None, max_depth: Optional[int] = None, page_size: int = 100,
+             checkpoint: Optional['CheckpointStore'] = None, checkpoint_every: int = 100):
+        """
+        Iterates over all blocks below a block, depth first in document order: each block is
+        followed by its children. Child pages and databases are reported but not entered.
+
+        With a `checkpoint` store, the position of the walk (the path of blocks being
+        walked, with the cursor and offset in each) is saved every `checkpoint_every`
+        blocks. Walking the same block again resumes from the last checkpoint, repeating at
+        most the blocks since. The checkpoint is deleted when the walk completes.
+
+        Args:
+            block_id (str, optional): The ID of the block or page. Defaults to the parent_id of this BlockAPI.
+            max_depth (Optional[int], optional): How many levels below the block to descend; 0 only lists its children. Defaults to None, no limit.
+            page_size (int, optional): The number of blocks per request. Defaults to 100.
+            checkpoint (Optional[CheckpointStore], optional): A store to save progress to and resume from. Defaults to None.
+            checkpoint_every (int, optional): Save a checkpoint after this many blocks. Defaults to 100.
+
+        Yields:
+            Dict[str, Any]: The blocks as returned by the API.
+        """
+        if not block_id:
+            block_id = self.parent_id
+
+        # Each frame is a block whose children are being walked: [block ID, cursor of the current page, offset in it, depth]
+        stack = [[block_id, None, 0, 0]]
+        blocks_processed = 0
+        if checkpoint is not None:
+            from .checkpoint import walk_checkpoint_key
+            key = walk_checkpoint_key(block_id, max_depth)
+            state = checkpoint.load(key)
+            if state is not None:
+                stack = state["stack"]
+                blocks_processed = state["blocks_processed"]
+
+        results: Dict[int, Dict[str, Any]] = {}
+        unsaved = 0
+        while stack:
+            level = len(stack) - 1
+            frame = stack[level]
+            if level not in results:
+                results[level] = self._get(frame[0], page_size=page_size, start_cursor=frame[1])
+            data = results[level]
+
+            children = data.get("results", [])
+            if frame[2] >= len(children):
+                del results[level]
+                if data.get("has_more"):
+                    frame[1], frame[2] = data.get("next_cursor"), 0
+                else:
+                    stack.pop()
+                continue
+
+            block = children[frame[2]]
+            frame[2] += 1
+            blocks_processed += 1
+            yield block
+
+            if block.get("has_children") and block.get("type") not in UNSYNCED_BLOCK_TYPES and (max_depth is None or frame[3] < max_depth):
+                stack.append([block["id"], None, 0, frame[3] + 1])
+            unsaved += 1
+            if checkpoint is not None and unsaved >= checkpoint_every:
+                checkpoint.save(key, {"kind": "walk", "block_id": block_id, "stack": stack, "blocks_processed": blocks_processed})
+                unsaved = 0
+
+        if checkpoint is not None:
+            checkpoint.delete(key)
+
+    def _fetch_tree(self, block_id: str, max_workers: int = 4) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieves all blocks below a block, level by level, fetching the children of a level's blocks concurrently.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: The children of each block with children, by block ID.
+        """
+        tree = {}
+        level = [block_id]
+        fetch = propagate(lambda parent_id: list(self.iter_children(parent_id)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while level:
+                for parent_id, children in zip(level, executor.map(fetch, level)):
+                    tree[parent_id] = children
+                # Child pages are separate pages, and copies of synced blocks show the original's children
+                level = [
+                    child["id"] for parent_id in level for child in tree[parent_id]
+                    if child.get("has_children") and child["type"] not in UNSYNCED_BLOCK_TYPES
+                    and not (child["type"] == "synced_block" and (child.get("synced_block") or {}).get("synced_from"))
+                ]
+        return tree
+
+    def _sync_level(self, parent_id: str, desired: List[Dict[str, Any]], result: 'BlockSyncResult', max_workers: int) -> None:
+        current = [block for block in self.iter_children(parent_id) if block["type"] not in UNSYNCED_BLOCK_TYPES]
+        operations = plan_block_diff(current, desired)
+
+        operations = _anchor_head_inserts(operations, current, desired)
+
+        anchor = None
+        inserts = []
+        for operation, current_block, desired_block in operations + [("flush", None, None)]:
+            if operation == "insert":
+                inserts.append(desired_block)
+                continue
+
+            if inserts:
+                appended, follow_up = self._append_level(parent_id, inserts, after=anchor)
+                nested = self._append_waves(follow_up, max_workers=max_workers)
+                result.inserted.extend(block.id for block in appended + nested)
+                if appended:
+                    anchor = appended[-1].id
+                inserts = []
+
+            if operation == "delete":
+                self.delete(current_block["id"])
+                result.deleted.append(current_block["id"])
+            elif operation in ("keep", "update"):
+                if operation == "update":
+                    self.update(current_block["id"], desired_block)
+                    result.updated.append(current_block["id"])
+                anchor = current_block["id"]
+
+                desired_grandchildren = get_block_children(desired_block)
+                if current_block.get("has_children"):
+                    self._sync_level(current_block["id"], desired_grandchildren, result, max_workers)
+                elif desired_grandchildren:
+                    appended, follow_up = self._append_level(current_block["id"], desired_grandchildren)
+                    nested = self._append_waves(follow_up, max_workers=max_workers)
+                    result.inserted.extend(block.id for block in appended + nested)
+
+    def _get(self, block_id: str, page_size: int = 100, start_cursor: Optional[str] = None) -> Dict[str, Any]:
         url = f"{self.api.base_url}/blocks/{block_id}/children"
-        headers = self.api._get_headers()
         params = {
             "page_size": page_size
         }
         if start_cursor:
             params["start_cursor"] = start_cursor
 
+        response = self.api.request("GET", url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def get(self, block_id: str = None, page_size: int = 100, start_cursor: Optional[str] = None) -> Dict[str, Any]:
+        if not block_id:
+            block_id = self.parent_id
+
         try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json()
+            return self._get(block_id, page_size=page_size, start_cursor=start_cursor)
+        except requests.exceptions.Timeout:
+            # Timeouts and passed deadlines must reach the caller, not turn into an empty result
+            raise
         except requests.exceptions.RequestException as e:
             print(f"Error retrieving children for block {block_id}: {e}")
             if e.response is not None:
@@ -327,21 +1182,403 @@ class ParentObject(BaseModel):
             raise ValueError(f"Unsupported parent type: {parent_type}")
 
 
+_NEXT_CURSOR = re.compile(rb'"next_cursor"\s*:\s*(?:"([^"]*)"|null)')
+
+
+def _next_cursor(content: bytes) -> Optional[str]:
+    """
+    Reads the cursor of the next result page from a raw query response without decoding all of it.
+
+    `next_cursor` only occurs as a top-level key (a string containing it would be escaped),
+    and the API sets it exactly when `has_more` is true.
+    """
+    match = _NEXT_CURSOR.search(content)
+    if match is None:
+        data = json.loads(content)
+        return data.get("next_cursor") if data.get("has_more") else None
+    return match.group(1).decode("utf-8") if match.group(1) is not None else None
+
+
+def decode_query_rows(codec: 'DatabaseCodec', payload: Union[bytes, str], properties: Optional[List[str]] = None) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Decodes the pages of a raw query response to rows of plain values. Module-level so that process pools can run it.
+
+    Args:
+        codec (DatabaseCodec): The codec of the database.
+        payload (Union[bytes, str]): The response body.
+        properties (Optional[List[str]], optional): The names of the only properties to decode. Defaults to None, all of them.
+
+    Returns:
+        List[Tuple[str, Dict[str, Any]]]: The page IDs and rows, as from `DatabaseCodec.decode_rows`.
+    """
+    return list(codec.decode_rows(json.loads(payload).get("results", []), properties=properties))
+
+
 class DatabaseObject:
     def __init__(self, api: NotionAPI):
         self.api = api
+        self._codecs = {}
 
-    def query(self, database_id: str, query: Optional[Dict[str, Any]] = None) -> 'DatabaseQuery':
-        url = f"{self.api.base_url}/databases/{database_id}/query"
-        headers = self.api._get_headers()
+    def retrieve(self, database_id: str) -> Dict[str, Any]:
+        """
+        Retrieves a database object, including its property schema.
+
+        Args:
+            database_id (str): The ID of the database.
 
-        response = requests.post(url, headers=headers, json=query or {})
+        Returns:
+            Dict[str, Any]: The database as returned by the API.
+        """
+        url = f"{self.api.base_url}/databases/{database_id}"
+        response = self.api.request("GET", url)
         response.raise_for_status()
+        return response.json()
 
-        dbq = DatabaseQuery.from_dict(response.json())
+    def codec(self, database_id: str, allow_new_options: bool = False, refresh: bool = False) -> 'DatabaseCodec':
+        """
+        Returns the codec for a database's properties, retrieving and compiling its schema on first use.
+
+        Args:
+            database_id (str): The ID of the database.
+            allow_new_options (bool, optional): Whether select values may name options not in the schema. Defaults to False.
+            refresh (bool, optional): Whether to retrieve the schema again, after it was changed. Defaults to False.
+
+        Returns:
+            DatabaseCodec: The codec, to encode values with before `PageAPI.update` and to decode rows with.
+        """
+        # Imported here so that the codec is only built when it is needed
+        from .codec import DatabaseCodec
+        key = (database_id, allow_new_options)
+        if refresh or key not in self._codecs:
+            self._codecs[key] = DatabaseCodec(self.retrieve(database_id)["properties"], allow_new_options=allow_new_options)
+        return self._codecs[key]
+
+    def iter_rows(self, database_id: str, query: Optional[Dict[str, Any]] = None, properties: Optional[List[str]] = None,
+                  executor: Optional[Executor] = None, prefetch: int = 4):
+        """
+        Iterates over the pages matching a query as dicts of plain property values, decoded by the database's codec
+        without building models.
+
+        Decoding is CPU-bound. Pass a `ProcessPoolExecutor` as `executor` to decode result
+        pages on other cores: the raw response bodies are sent to the workers, which return
+        the rows, while the next result pages are fetched. Rows are plain values, which are
+        far cheaper to send back than to decode, so exports scale with the workers.
+
+        Args:
+            database_id (str): The ID of the database.
+            query (Optional[Dict[str, Any]], optional): The filter, sorts and page_size. Defaults to None.
+            properties (Optional[List[str]], optional): The names or IDs of the only properties to retrieve and decode. Defaults to None, all properties.
+            executor (Optional[Executor], optional): An executor to decode result pages in. Defaults to None, decoding in this thread.
+            prefetch (int, optional): How many result pages may be fetched ahead of the consumer when an executor is used. Defaults to 4.
+
+        Yields:
+            Tuple[str, Dict[str, Any]]: The ID of each page and its property values by name.
+        """
+        codec = self.codec(database_id)
+        filter_properties = self._projection(database_id, properties)
+        names = codec.names(filter_properties) if filter_properties is not None else None
+        query = dict(query or {})
+        if executor is not None:
+            for rows in self._iter_rows_decoded_in(executor, codec, database_id, query, prefetch, filter_properties, names):
+                yield from rows
+            return
+        while True:
+            data = self._query(database_id, query, filter_properties=filter_properties)
+            yield from codec.decode_rows(data.get("results", []), properties=names)
+            if not data.get("has_more"):
+                break
+            query["start_cursor"] = data.get("next_cursor")
+
+    def query(self, database_id: str, query: Optional[Dict[str, Any]] = None, complete_properties: bool = False, max_workers: int = 4,
+              pool: Optional[InternPool] = None, properties: Optional[List[str]] = None) -> 'DatabaseQuery':
+        """
+        Queries a database and returns one page of results.
+
+        Args:
+            database_id (str): The ID of the database.
+            query (Optional[Dict[str, Any]], optional): The filter, sorts, start_cursor and page_size. Defaults to None.
+            complete_properties (bool, optional): Whether to fetch the full value of properties the API truncated. Defaults to False.
+            max_workers (int, optional): How many truncated properties to fetch concurrently. Defaults to 4.
+            pool (Optional[InternPool], optional): A pool for the pages to share sub-objects through. Defaults to the client's intern_pool.
+            properties (Optional[List[str]], optional): The names or IDs of the only properties to retrieve and parse, sent as
+                filter_properties. Names are looked up in the database schema, which is retrieved once. Defaults to None, all properties.
+
+        Returns:
+            DatabaseQuery: The results page.
+        """
+        data = self._query(database_id, query or {}, filter_properties=self._projection(database_id, properties))
+        if complete_properties:
+            self.api.page._complete_properties(data.get("results", []), max_workers=max_workers)
+
+        dbq = DatabaseQuery.from_dict(data, pool=pool if pool is not None else self.api.intern_pool)
 
         return dbq
 
+    def iter_query(self, database_id: str, query: Optional[Dict[str, Any]] = None, complete_properties: bool = False, max_workers: int = 4,
+                   pool: Optional[InternPool] = None, checkpoint: Optional['CheckpointStore'] = None, checkpoint_every: int = 1,
+                   properties: Optional[List[str]] = None):
+        """
+        Iterates over all pages matching a query, fetching further result pages as needed.
+
+        Parsing pages into models is CPU-bound, and models cost as much to send between
+        processes as to parse, so for exports on several cores use `iter_rows` with an
+        executor instead.
+
+        With a `checkpoint` store, the cursor of the next result page and the number of
+        rows processed are saved whenever the consumer has taken every row of a result
+        page. Iterating over the same query and properties again resumes from the last
+        checkpoint, so after a failure at most one result page is delivered twice. The
+        checkpoint is deleted when the iteration completes.
+
+        Args:
+            database_id (str): The ID of the database.
+            query (Optional[Dict[str, Any]], optional): The filter, sorts and page_size. Defaults to None.
+            complete_properties (bool, optional): Whether to fetch the full value of properties the API truncated,
+                concurrently across the pages of each result page. Defaults to False.
+            max_workers (int, optional): How many truncated properties to fetch concurrently. Defaults to 4.
+            pool (Optional[InternPool], optional): A pool for the pages to share sub-objects through, e.g. a new InternPool()
+                for this iteration. Defaults to the client's intern_pool.
+            checkpoint (Optional[CheckpointStore], optional): A store to save progress to and resume from. Defaults to None.
+            checkpoint_every (int, optional): Save a checkpoint after this many result pages. Defaults to 1.
+            properties (Optional[List[str]], optional): The names or IDs of the only properties to retrieve and parse,
+                as for `query`. Defaults to None, all properties.
+
+        Yields:
+            PageObject: The matching pages, in query order.
+        """
+        query = dict(query or {})
+        if pool is None:
+            pool = self.api.intern_pool
+        filter_properties = self._projection(database_id, properties)
+
+        rows_processed = 0
+        if checkpoint is not None:
+            from .checkpoint import query_checkpoint, query_checkpoint_key
+            key = query_checkpoint_key(database_id, query, filter_properties)
+            state = checkpoint.load(key)
+            if state is not None:
+                query["start_cursor"] = state["next_cursor"]
+                rows_processed = state["rows_processed"]
+
+        unsaved = 0
+        for pages, next_cursor in self._iter_query_pages(database_id, query, complete_properties, max_workers, pool, filter_properties):
+            yield from pages
+
+            rows_processed += len(pages)
+            unsaved += 1
+            if checkpoint is not None:
+                if next_cursor is None:
+                    checkpoint.delete(key)
+                elif unsaved >= checkpoint_every:
+                    checkpoint.save(key, query_checkpoint(database_id, query, next_cursor, rows_processed, filter_properties))
+                    unsaved = 0
+
+    def scan(self, database_id: str, query: Optional[Dict[str, Any]] = None, partition_by: str = "created_time", max_workers: int = 4,
+             partitions: Optional[int] = None, ordered: bool = False, target_rows: int = 1000, pool: Optional[InternPool] = None,
+             properties: Optional[List[str]] = None):
+        """
+        Iterates over all pages matching a query, fetching disjoint ranges of the database concurrently.
+
+        Cursor pagination fetches one result page after another. A scan first finds the
+        smallest and largest created time (or unique ID) and splits that range into
+        `partitions` parts, which are paginated concurrently. When a part turns out to be
+        dense, judged by how much of its range the first result page covered, the rest of
+        it is split again, into parts of about `target_rows` rows.
+
+        Throughput is bounded by the rate limit of the client, so this pays off with a
+        PooledNotionAPI or a raised limit.
+
+        Args:
+            database_id (str): The ID of the database.
+            query (Optional[Dict[str, Any]], optional): The filter. Sorts are not supported. Defaults to None.
+            partition_by (str, optional): "created_time", or the name of a unique ID property. Defaults to "created_time".
+            max_workers (int, optional): How many requests to run concurrently. Defaults to 4.
+            partitions (Optional[int], optional): The number of initial parts. Defaults to twice max_workers.
+            ordered (bool, optional): Whether to yield the pages in ascending partition value order, holding back
+                pages of later parts until earlier ones are complete. Defaults to False, yielding pages as they arrive.
+            target_rows (int, optional): The size of the parts dense ranges are split into. Defaults to 1000.
+            pool (Optional[InternPool], optional): A pool for the pages to share sub-objects through. Defaults to the client's intern_pool.
+            properties (Optional[List[str]], optional): The names or IDs of the only properties to retrieve and parse,
+                as for `query`; a unique ID property partitioned by is always retrieved. Defaults to None, all properties.
+
+        Yields:
+            PageObject: The matching pages, each once.
+        """
+        # Imported here so that the partitioning code is only loaded when it is needed
+        from .partition import partitioned_scan
+        if properties is not None and partition_by != "created_time" and partition_by not in properties:
+            # The partition value is read from every page
+            properties = list(properties) + [partition_by]
+        return partitioned_scan(self, database_id, query, partition_by=partition_by, max_workers=max_workers, partitions=partitions,
+                                ordered=ordered, target_rows=target_rows, pool=pool,
+                                filter_properties=self._projection(database_id, properties))
+
+    def archive_where(self, database_id: str, filter: Optional[Dict[str, Any]] = None, concurrency: int = 4, dry_run: bool = False,
+                      limiter: Optional['RateLimiter'] = None, max_retries: int = 2, progress: Optional[Callable[['BulkResult'], None]] = None,
+                      checkpoint: Optional['CheckpointStore'] = None, checkpoint_every: int = 100) -> 'BulkResult':
+        """
+        Archives all pages of a database matching a filter.
+
+        Matching page IDs are streamed from the query into a pool of `concurrency`
+        workers, so archiving starts with the first result page. Because archiving rows
+        while paginating can make Notion skip others, the query is repeated until it
+        finds nothing new. Rate-limited, conflicting and failing requests are retried.
+
+        With a checkpoint store the run can be resumed after a crash or deadline, and its
+        result then covers the earlier runs too, so `succeeded` can always be passed to
+        `restore`.
+
+        Args:
+            database_id (str): The ID of the database.
+            filter (Optional[Dict[str, Any]], optional): The query filter. Defaults to None, every page.
+            concurrency (int, optional): How many pages to archive concurrently. Defaults to 4.
+            dry_run (bool, optional): Only find the matching pages, without archiving them. Defaults to False.
+            limiter (Optional[RateLimiter], optional): A rate budget every archive request waits for. Defaults to None;
+                a 429 then holds back all requests for its Retry-After time.
+            max_retries (int, optional): How often to retry a page. Defaults to 2.
+            progress (Optional[Callable[[BulkResult], None]], optional): Called with the result so far after each page. Defaults to None.
+            checkpoint (Optional[CheckpointStore], optional): A store to save progress to and resume from. Defaults to None.
+            checkpoint_every (int, optional): Save a checkpoint after this many pages. Defaults to 100.
+
+        Returns:
+            BulkResult: How many pages matched, the IDs of those archived (or that would be) and the failures.
+        """
+        from .bulk import BulkResult, bulk_checkpoint_key, matching_page_ids, run_bulk
+        if dry_run:
+            page_ids = list(matching_page_ids(self, database_id, filter, repeat=False))
+            return BulkResult(matched=len(page_ids), succeeded=page_ids)
+        return run_bulk(matching_page_ids(self, database_id, filter, repeat=True), lambda page_id: self._set_archived(page_id, True),
+                        concurrency=concurrency, limiter=limiter, max_retries=max_retries, progress=progress, checkpoint=checkpoint,
+                        key=bulk_checkpoint_key("archive", database_id, filter), checkpoint_every=checkpoint_every)
+
+    def restore(self, page_ids: List[str], concurrency: int = 4, limiter: Optional['RateLimiter'] = None, max_retries: int = 2,
+                progress: Optional[Callable[['BulkResult'], None]] = None, checkpoint: Optional['CheckpointStore'] = None,
+                checkpoint_every: int = 100) -> 'BulkResult':
+        """
+        Restores archived pages, such as the `succeeded` pages of `archive_where`.
+
+        Archived pages don't show up in queries, so they are restored by ID. The arguments
+        work as for `archive_where`.
+
+        Returns:
+            BulkResult: The IDs of the restored pages and the failures.
+        """
+        from .bulk import bulk_checkpoint_key, run_bulk
+        return run_bulk(page_ids, lambda page_id: self._set_archived(page_id, False), concurrency=concurrency, limiter=limiter,
+                        max_retries=max_retries, progress=progress, checkpoint=checkpoint,
+                        key=bulk_checkpoint_key("restore", "pages", sorted(page_ids)), checkpoint_every=checkpoint_every)
+
+    def key_index(self, database_id: str, key_property: str, query: Optional[Dict[str, Any]] = None) -> 'KeyIndex':
+        """
+        Scans a database once and indexes its pages by the value of a key property, such as the title or an external ID.
+
+        Args:
+            database_id (str): The ID of the database.
+            key_property (str): The name of the key property.
+            query (Optional[Dict[str, Any]], optional): A filter limiting the indexed pages. Defaults to None.
+
+        Returns:
+            KeyIndex: The page ID and decoded property values for each key.
+        """
+        from .bulk import KeyIndex
+        index = KeyIndex(key_property)
+        for page_id, row in self.iter_rows(database_id, query):
+            index.add(page_id, row)
+        return index
+
+    def upsert_many(self, database_id: str, key_property: str, rows: Iterable[Dict[str, Any]], index: Optional['KeyIndex'] = None,
+                    concurrency: int = 4, allow_new_options: bool = False, limiter: Optional['RateLimiter'] = None, max_retries: int = 2,
+                    progress: Optional[Callable[['BulkResult'], None]] = None) -> 'UpsertResult':
+        """
+        Creates or updates one page per row, matching rows to pages by a key property.
+
+        Instead of a query per row, the database is scanned once into a KeyIndex (or the
+        given index is used). Rows are plain values as taken by the database's codec, and
+        are all validated before anything is written. Rows whose key isn't in the index
+        become new pages. For the others only the properties whose value differs are
+        sent, and rows that match their page cost no request. The writes run
+        concurrently, and the index is updated with them, so it can be passed to the
+        next upsert.
+
+        Args:
+            database_id (str): The ID of the database.
+            key_property (str): The name of the key property, such as the title or an external ID text property.
+            rows (Iterable[Dict[str, Any]]): The rows, as plain values by property name, each with the key property.
+                Later rows with the same key are merged into earlier ones.
+            index (Optional[KeyIndex], optional): An index from `key_index` or an earlier upsert. Defaults to None, scanning the database.
+            concurrency (int, optional): How many pages to write concurrently. Defaults to 4.
+            allow_new_options (bool, optional): Whether select values may name new options. Defaults to False.
+            limiter (Optional[RateLimiter], optional): A rate budget every write waits for. Defaults to None;
+                a 429 then holds back all writes for its Retry-After time.
+            max_retries (int, optional): How often to retry a write. Updates are retried after lost connections, conflicts,
+                rate limiting and server errors, but creates only when rate limited, since after other errors the page may
+                exist already; those creates are reported as failed. Defaults to 2.
+            progress (Optional[Callable[[BulkResult], None]], optional): Called after each write. Defaults to None.
+
+        Returns:
+            UpsertResult: The created pages by key, the updated pages, the number of unchanged rows and the failures by key.
+        """
+        from .bulk import upsert_rows
+        return upsert_rows(self, database_id, key_property, rows, index=index, concurrency=concurrency, allow_new_options=allow_new_options,
+                           limiter=limiter, max_retries=max_retries, progress=progress)
+
+    def _set_archived(self, page_id: str, archived: bool) -> Dict[str, Any]:
+        response = self.api.request("PATCH", f"{self.api.base_url}/pages/{page_id}", body={"archived": archived})
+        response.raise_for_status()
+        return response.json()
+
+    def _iter_query_pages(self, database_id: str, query: Dict[str, Any], complete_properties: bool, max_workers: int,
+                          pool: Optional[InternPool], filter_properties: Optional[List[str]] = None):
+        """
+        Yields the parsed pages of each result page with the cursor of the next one, None after the last.
+        """
+        while True:
+            data = self._query(database_id, query, filter_properties=filter_properties)
+            if complete_properties:
+                self.api.page._complete_properties(data.get("results", []), max_workers=max_workers)
+            dbq = DatabaseQuery.from_dict(data, pool=pool)
+            next_cursor = dbq.next_cursor if dbq.has_more else None
+            yield dbq.results, next_cursor
+            if next_cursor is None:
+                break
+            query["start_cursor"] = next_cursor
+
+    def _iter_rows_decoded_in(self, executor: Executor, codec: 'DatabaseCodec', database_id: str, query: Dict[str, Any], prefetch: int,
+                              filter_properties: Optional[List[str]] = None, names: Optional[List[str]] = None):
+        """
+        Yields the rows of each result page, decoded in the executor while later result pages are fetched.
+        """
+        pending = deque()
+        while True:
+            content = self._post_query(database_id, query, filter_properties=filter_properties).content
+            next_cursor = _next_cursor(content)
+            pending.append(executor.submit(decode_query_rows, codec, content, names))
+            while pending and (len(pending) >= max(prefetch, 1) or next_cursor is None):
+                yield pending.popleft().result()
+
+            if next_cursor is None:
+                break
+            query["start_cursor"] = next_cursor
+
+    def _projection(self, database_id: str, properties: Optional[List[str]]) -> Optional[List[str]]:
+        """
+        Returns the IDs of the projected properties, given by name or ID, looking names up in the schema.
+        """
+        if properties is None:
+            return None
+        schema = self.codec(database_id).properties
+        return [schema[name]["id"] if name in schema else name for name in properties]
+
+    def _query(self, database_id: str, query: Dict[str, Any], filter_properties: Optional[List[str]] = None) -> Dict[str, Any]:
+        return self._post_query(database_id, query, filter_properties=filter_properties).json()
+
+    def _post_query(self, database_id: str, query: Dict[str, Any], filter_properties: Optional[List[str]] = None) -> TransportResponse:
+        url = f"{self.api.base_url}/databases/{database_id}/query"
+
+        response = self.api.request("POST", url, params=_filter_properties_params(filter_properties), body=query)
+        response.raise_for_status()
+        return response
+
 
 class DatabaseQuery(BaseModel):
     object: str
@@ -352,9 +1589,9 @@ class DatabaseQuery(BaseModel):
     page_or_database: Dict[str, Any]
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'DatabaseQuery':
+    def from_dict(cls, data: Dict[str, Any], pool: Optional[InternPool] = None) -> 'DatabaseQuery':
 
-        results = [PageObject.from_dict(page_data) for page_data in data.get('results', [])]
+        results = [PageObject.from_dict(page_data, pool=pool) for page_data in data.get('results', [])]
 
         return cls(
             object=data['object'],
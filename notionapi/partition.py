@@ -0,0 +1,184 @@
+import math
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from .deadlines import propagate
+from .interning import InternPool
+
+
+class _Axis:
+    """
+    The value a database is partitioned on: the created time, in milliseconds, or the number of a unique ID property.
+    """
+
+    def __init__(self, partition_by: str):
+        self.name = partition_by
+        self.is_time = partition_by == "created_time"
+        # Created times have minute precision, so narrower ranges are not worth splitting
+        self.precision = 60_000 if self.is_time else 1
+
+    def value(self, page: Dict[str, Any]) -> float:
+        if self.is_time:
+            return datetime.fromisoformat(page["created_time"].replace("Z", "+00:00")).timestamp() * 1000
+        return page["properties"][self.name]["unique_id"]["number"]
+
+    def _format(self, value: float) -> Any:
+        if self.is_time:
+            moment = datetime.fromtimestamp(value / 1000, timezone.utc)
+            return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        return int(value)
+
+    def condition(self, low: float, high: float) -> List[Dict[str, Any]]:
+        if self.is_time:
+            return [
+                {"timestamp": "created_time", "created_time": {"on_or_after": self._format(low)}},
+                {"timestamp": "created_time", "created_time": {"before": self._format(high)}},
+            ]
+        return [{"property": self.name, "unique_id": {"greater_than_or_equal_to": self._format(low), "less_than": self._format(high)}}]
+
+    def sort(self, direction: str = "ascending") -> Dict[str, Any]:
+        if self.is_time:
+            return {"timestamp": "created_time", "direction": direction}
+        return {"property": self.name, "direction": direction}
+
+    def split(self, low: float, high: float, pieces: int) -> List[float]:
+        edges = [low]
+        for index in range(1, pieces):
+            edge = low + (high - low) * index / pieces
+            edge = math.floor(edge) if not self.is_time else edge
+            if edge > edges[-1]:
+                edges.append(edge)
+        edges.append(high)
+        return edges
+
+
+class _Partition:
+    def __init__(self):
+        # Result pages and sub-partitions, in axis order
+        self.chunks: List[Any] = []
+        self.done = False
+
+
+def _drain(stack: List[list]) -> Iterator[Any]:
+    """
+    Yields the pages of a partition tree in order, as far as they have arrived.
+    """
+    while stack:
+        partition, index = stack[-1]
+        if index < len(partition.chunks):
+            chunk = partition.chunks[index]
+            partition.chunks[index] = None
+            stack[-1][1] += 1
+            if isinstance(chunk, _Partition):
+                stack.append([chunk, 0])
+            else:
+                yield from chunk
+        elif partition.done:
+            stack.pop()
+        else:
+            return
+
+
+def partitioned_scan(database: Any, database_id: str, query: Optional[Dict[str, Any]] = None, partition_by: str = "created_time",
+                     max_workers: int = 4, partitions: Optional[int] = None, ordered: bool = False, target_rows: int = 1000,
+                     pool: Optional[InternPool] = None, filter_properties: Optional[List[str]] = None) -> Iterator[Any]:
+    """
+    Implements DatabaseObject.scan; see there.
+    """
+    from .notionapi import PageObject
+
+    query = dict(query or {})
+    if "sorts" in query or "start_cursor" in query:
+        raise ValueError("A partitioned scan orders by the partition value and can't take sorts or a start_cursor")
+    base_filter = query.pop("filter", None)
+    if pool is None:
+        pool = database.api.intern_pool
+    axis = _Axis(partition_by)
+
+    def build(low: float, high: float, cursor: Optional[str]) -> Dict[str, Any]:
+        conditions = axis.condition(low, high)
+        body = dict(query, filter={"and": ([base_filter] if base_filter else []) + conditions}, sorts=[axis.sort()], page_size=100)
+        if cursor:
+            body["start_cursor"] = cursor
+        return body
+
+    def bound(direction: str) -> Optional[float]:
+        body = dict(query, sorts=[axis.sort(direction)], page_size=1)
+        if base_filter:
+            body["filter"] = base_filter
+        results = database._query(database_id, body, filter_properties=filter_properties).get("results", [])
+        return axis.value(results[0]) if results else None
+
+    def fetch(task: tuple) -> tuple:
+        _, low, high, cursor, skip = task
+        data = database._query(database_id, build(low, high, cursor), filter_properties=filter_properties)
+        rows = [row for row in data.get("results", []) if row["id"] not in skip]
+        values = [axis.value(row) for row in data.get("results", [])]
+        pages = [PageObject.from_dict(row, pool=pool) for row in rows]
+        return data.get("results", []), values, pages, data.get("has_more", False), data.get("next_cursor")
+
+    low = bound("ascending")
+    if low is None:
+        return
+    high = bound("descending") + axis.precision
+
+    root = _Partition()
+    root.done = True
+    tasks: deque = deque()
+    edges = axis.split(low, high, partitions or max_workers * 2)
+    for start, end in zip(edges, edges[1:]):
+        child = _Partition()
+        root.chunks.append(child)
+        tasks.append((child, start, end, None, frozenset()))
+
+    order_stack = [[root, 0]]
+    in_flight: Dict[Any, tuple] = {}
+    fetch = propagate(fetch)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            while tasks or in_flight:
+                while tasks and len(in_flight) < max_workers:
+                    task = tasks.popleft()
+                    in_flight[executor.submit(fetch, task)] = task
+
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    partition, start, end, _, skip = in_flight.pop(future)
+                    raw, values, pages, has_more, next_cursor = future.result()
+                    # Only an ordered scan holds pages back until the partitions before them are done
+                    if ordered:
+                        partition.chunks.append(pages)
+                    else:
+                        yield from pages
+
+                    if not has_more:
+                        partition.done = True
+                        continue
+
+                    # Split what is left of a dense partition, estimating its size from the rows seen so far
+                    last = values[-1]
+                    span, remaining = last - start, end - last
+                    pieces = 0
+                    if span > 0 and remaining > axis.precision:
+                        estimate = len(values) / span * remaining
+                        pieces = min(max_workers * 2, int(estimate // target_rows), int(remaining // axis.precision))
+                    if pieces >= 2:
+                        at_last = frozenset(row["id"] for row, value in zip(raw, values) if value == last)
+                        # Rows with the last value can continue in the first sub-partition; skip those already seen
+                        first_skip = at_last | skip if last == start else at_last
+                        sub_edges = axis.split(last, end, pieces)
+                        for sub_start, sub_end in zip(sub_edges, sub_edges[1:]):
+                            child = _Partition()
+                            partition.chunks.append(child)
+                            tasks.append((child, sub_start, sub_end, None, first_skip if sub_start == last else frozenset()))
+                        partition.done = True
+                    else:
+                        tasks.append((partition, start, end, next_cursor, skip))
+
+                if ordered:
+                    yield from _drain(order_stack)
+        finally:
+            for future in in_flight:
+                future.cancel()
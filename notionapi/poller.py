@@ -0,0 +1,307 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+from .notionapi import NotionAPI, PageObject
+from .ratelimit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeEvent(BaseModel):
+    """
+    A change detected by the ChangePoller.
+
+    Attributes:
+        type (str): "created", "updated" or "archived".
+        source_id (str): The ID of the watched database or page the change was found through.
+        page_id (str): The ID of the changed page.
+        last_edited_time (str): The last edited time of the page when the change was seen.
+        page (Optional[PageObject]): The page, if it could still be retrieved.
+    """
+    type: str
+    source_id: str
+    page_id: str
+    last_edited_time: str
+    page: Optional[PageObject] = None
+
+
+def _timestamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class _Source:
+    def __init__(self, kind: str, source_id: str, interval: float, watermark: str, filter: Optional[Dict[str, Any]] = None):
+        self.kind = kind
+        self.id = source_id
+        self.interval = interval
+        self.watermark = watermark
+        self.window_start = watermark
+        self.filter = filter
+        # Page ID -> last edited time for pages already reported in the watermark minute
+        self.seen: Dict[str, str] = {}
+        # Page ID -> created time for pages reported as created, so later edits are reported as updates
+        self.created: Dict[str, str] = {}
+        self.known_ids: set = set()
+        self.polls = 0
+        self.last_edited_time: Optional[str] = None
+        self.archived = False
+
+
+class ChangePoller:
+    """
+    Watches databases and pages for changes and reports them as events.
+
+    Databases are polled with queries sorted by `last_edited_time` and filtered on a
+    watermark, so each poll only returns what changed since the previous one. Pages are
+    polled by retrieving them. Each source has its own interval, which shrinks while
+    changes are found and grows while nothing happens, and all sources share one rate
+    budget.
+
+    Notion reports `last_edited_time` with minute precision, so pages edited in the
+    watermark minute are remembered to avoid reporting the same edit twice.
+
+    Pages archived in a watched database drop out of its query results. They can only
+    be noticed by a reconciliation scan of the whole database, enabled with
+    `reconcile_every`.
+
+    Args:
+        api (NotionAPI): The client to poll with.
+        min_interval (float, optional): The shortest time between polls of one source in seconds. Defaults to 5.
+        max_interval (float, optional): The longest time between polls of one source in seconds. Defaults to 300.
+        initial_interval (Optional[float], optional): The interval new sources start with. Defaults to min_interval.
+        limiter (Optional[RateLimiter], optional): The rate budget shared by all sources. Defaults to one request per second.
+        reconcile_every (Optional[int], optional): Scan whole databases every this many polls to detect archived rows. Defaults to None.
+        clock (Callable[[], float], optional): The monotonic clock used for scheduling, replaceable in tests. Defaults to time.monotonic.
+    """
+
+    def __init__(self, api: NotionAPI, min_interval: float = 5.0, max_interval: float = 300.0, initial_interval: Optional[float] = None,
+                 limiter: Optional[RateLimiter] = None, reconcile_every: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.api = api
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval or min_interval
+        self.limiter = limiter or RateLimiter(rate=1.0)
+        self.reconcile_every = reconcile_every
+
+        self._clock = clock
+        self._sources: Dict[str, _Source] = {}
+        self._due: List[tuple] = []
+        self._order = itertools.count()
+        self._callbacks: List[Callable[[ChangeEvent], None]] = []
+        self._error_callbacks: List[Callable[[str, Exception], None]] = []
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    def watch_database(self, database_id: str, filter: Optional[Dict[str, Any]] = None, since: Optional[datetime] = None) -> None:
+        """
+        Starts watching a database for created and updated rows.
+
+        Args:
+            database_id (str): The ID of the database.
+            filter (Optional[Dict[str, Any]], optional): A query filter limiting which rows are watched. Defaults to None.
+            since (Optional[datetime], optional): Report changes made after this time. Defaults to now.
+        """
+        self._add(_Source("database", database_id, self.initial_interval, _timestamp(since or datetime.now(timezone.utc)), filter))
+
+    def watch_page(self, page_id: str) -> None:
+        """
+        Starts watching a page for updates and archiving.
+
+        Args:
+            page_id (str): The ID of the page.
+        """
+        self._add(_Source("page", page_id, self.initial_interval, ""))
+
+    def unwatch(self, source_id: str) -> None:
+        """
+        Stops watching a database or page.
+        """
+        with self._lock:
+            self._sources.pop(source_id, None)
+
+    def on_event(self, callback: Callable[[ChangeEvent], None]) -> None:
+        """
+        Registers a function to be called with every event found by `run` or `poll_once`.
+        """
+        self._callbacks.append(callback)
+
+    def on_error(self, callback: Callable[[str, Exception], None]) -> None:
+        """
+        Registers a function to be called with the source ID and the exception when polling a source fails.
+        Without error callbacks, failures are logged to the `notionapi.poller` logger; either way the source is polled again later.
+        """
+        self._error_callbacks.append(callback)
+
+    def _add(self, source: _Source) -> None:
+        with self._lock:
+            self._sources[source.id] = source
+            heapq.heappush(self._due, (self._clock(), next(self._order), source.id))
+
+    def poll_once(self) -> List[ChangeEvent]:
+        """
+        Polls every source that is due and returns the events found.
+
+        Returns:
+            List[ChangeEvent]: The events, also passed to the registered callbacks.
+        """
+        events = []
+        now = self._clock()
+        while True:
+            with self._lock:
+                if not self._due or self._due[0][0] > now:
+                    break
+                _, _, source_id = heapq.heappop(self._due)
+                source = self._sources.get(source_id)
+            if source is None:
+                continue
+            events.extend(self._poll_source(source))
+        return events
+
+    def run(self) -> None:
+        """
+        Polls until `stop` is called, passing events to the registered callbacks.
+        """
+        self._stopped.clear()
+        while not self._stopped.is_set():
+            self.poll_once()
+            self._stopped.wait(self._time_to_next_poll())
+
+    def events(self) -> Iterator[ChangeEvent]:
+        """
+        Polls until `stop` is called, yielding events as they are found.
+
+        Yields:
+            ChangeEvent: The events, in the order they were found.
+        """
+        self._stopped.clear()
+        while not self._stopped.is_set():
+            yield from self.poll_once()
+            self._stopped.wait(self._time_to_next_poll())
+
+    def stop(self) -> None:
+        """
+        Makes `run` and `events` return after the current poll.
+        """
+        self._stopped.set()
+
+    def _time_to_next_poll(self) -> float:
+        with self._lock:
+            if not self._due:
+                return self.min_interval
+            return max(0.0, self._due[0][0] - self._clock())
+
+    def _poll_source(self, source: _Source) -> List[ChangeEvent]:
+        try:
+            if source.kind == "database":
+                events = self._poll_database(source)
+            else:
+                events = self._poll_page(source)
+        except Exception as e:
+            events = []
+            if self._error_callbacks:
+                for callback in self._error_callbacks:
+                    callback(source.id, e)
+            else:
+                logger.error("Error polling %s %s: %s", source.kind, source.id, e)
+
+        # Poll busy sources more often and quiet ones less often
+        if events:
+            source.interval = max(self.min_interval, source.interval / 2)
+        else:
+            source.interval = min(self.max_interval, source.interval * 1.5)
+
+        with self._lock:
+            if source.id in self._sources:
+                heapq.heappush(self._due, (self._clock() + source.interval, next(self._order), source.id))
+
+        for event in events:
+            for callback in self._callbacks:
+                callback(event)
+        return events
+
+    def _poll_database(self, source: _Source) -> List[ChangeEvent]:
+        source.polls += 1
+        condition = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": source.watermark}}
+        query: Dict[str, Any] = {
+            "filter": {"and": [condition, source.filter]} if source.filter else condition,
+            "sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}],
+            "page_size": 100,
+        }
+
+        events = []
+        watermark = source.watermark
+        while True:
+            self.limiter.acquire()
+            dbq = self.api.database.query(source.id, query)
+            for page in dbq.results:
+                edited = page.last_edited_time.last_edited_time
+                if source.seen.get(page.id) == edited:
+                    continue
+                source.seen[page.id] = edited
+                source.known_ids.add(page.id)
+                watermark = max(watermark, edited)
+
+                created = page.created_time.created_time
+                if created >= source.window_start and page.id not in source.created:
+                    source.created[page.id] = created
+                    kind = "created"
+                else:
+                    kind = "updated"
+                events.append(ChangeEvent(type="archived" if page.archived else kind, source_id=source.id, page_id=page.id,
+                                          last_edited_time=edited, page=page))
+            if not dbq.has_more:
+                break
+            query["start_cursor"] = dbq.next_cursor
+
+        # Only edits in the new watermark minute can come back from the next query
+        source.watermark = watermark
+        source.window_start = watermark
+        source.seen = {page_id: edited for page_id, edited in source.seen.items() if edited >= watermark}
+        source.created = {page_id: created for page_id, created in source.created.items() if created >= watermark}
+
+        if self.reconcile_every and source.polls % self.reconcile_every == 0:
+            events.extend(self._reconcile(source))
+        return events
+
+    def _reconcile(self, source: _Source) -> List[ChangeEvent]:
+        present = set()
+        query: Dict[str, Any] = {"page_size": 100}
+        if source.filter:
+            query["filter"] = source.filter
+        while True:
+            self.limiter.acquire()
+            dbq = self.api.database.query(source.id, query)
+            present.update(page.id for page in dbq.results)
+            if not dbq.has_more:
+                break
+            query["start_cursor"] = dbq.next_cursor
+
+        gone = source.known_ids - present
+        source.known_ids = present
+        return [
+            ChangeEvent(type="archived", source_id=source.id, page_id=page_id, last_edited_time=source.watermark)
+            for page_id in sorted(gone)
+        ]
+
+    def _poll_page(self, source: _Source) -> List[ChangeEvent]:
+        self.limiter.acquire()
+        page = self.api.page.get(source.id)
+        edited = page.last_edited_time.last_edited_time
+        first_poll = source.last_edited_time is None
+        changed = edited != source.last_edited_time
+        newly_archived = page.archived and not source.archived
+        source.last_edited_time = edited
+        source.archived = page.archived
+
+        if first_poll or not (changed or newly_archived):
+            return []
+        kind = "archived" if newly_archived else "updated"
+        return [ChangeEvent(type=kind, source_id=source.id, page_id=page.id, last_edited_time=edited, page=page)]
@@ -0,0 +1,205 @@
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .deadlines import DeadlineExceeded, remaining
+from .notionapi import NotionAPI
+from .ratelimit import DEFAULT_RATE, RateLimiter
+from .serialization import encode_json
+from .transport import Transport, TransportResponse
+
+
+_RESOURCE_ID = re.compile(r"/(?:pages|blocks|databases)/([0-9a-fA-F-]{32,36})")
+
+# Responses meaning the integration behind the token cannot see the resource
+_UNREACHABLE = (403, 404)
+
+
+def _normalize_id(resource_id: str) -> str:
+    return resource_id.replace("-", "").lower()
+
+
+def _resource_id(url: str, body: Any = None) -> Optional[str]:
+    """
+    Returns the ID of the page, block or database a request is about, or None for requests like search.
+
+    For page creation, the resource is the parent page or database.
+    """
+    match = _RESOURCE_ID.search(url)
+    if match:
+        return _normalize_id(match.group(1))
+    if isinstance(body, dict) and isinstance(body.get("parent"), dict):
+        parent = body["parent"]
+        parent_id = parent.get("database_id") or parent.get("page_id")
+        if parent_id:
+            return _normalize_id(parent_id)
+    return None
+
+
+class _Member:
+    def __init__(self, token: str, limiter: RateLimiter, access: Optional[List[str]]):
+        self.token = token
+        self.limiter = limiter
+        self.access = {_normalize_id(i) for i in access} if access is not None else None
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.latency: Optional[float] = None
+
+
+class PooledNotionAPI(NotionAPI):
+    """
+    A client spreading its requests over several integration tokens, so its throughput is
+    their combined rate limit.
+
+    Each request is sent with a token whose integration can reach the resource. Tokens
+    whose `access` lists the resource are tried first. A 404 or 403 response moves the
+    request on to the next token, and the token that succeeded is remembered for the
+    resource. Among the tokens that can serve a request,
+    the one with the shortest expected wait is picked, from its rate budget, the requests
+    it has in flight and its observed latency. A 429 response pauses that token's budget
+    for its Retry-After time and retries the request with another token.
+
+    Requests not about one resource, like search, go to the least loaded token, so they
+    only see what that integration can see.
+
+    Args:
+        tokens (Union[List[str], Dict[str, Optional[List[str]]]]): The integration tokens, or a mapping of tokens to the IDs of
+            the resources they can reach (None for unknown).
+        transport (Optional[Transport], optional): The transport shared by all tokens. Defaults to a pooled HTTP/1.1 RequestsTransport.
+        rate (float, optional): The rate limit of each token in requests per second. Defaults to DEFAULT_RATE.
+        max_attempts (int, optional): How many tokens a throttled request is tried with. Defaults to the number of tokens.
+        clock (Callable[[], float], optional): The monotonic clock used to measure latency. Defaults to time.monotonic.
+        **kwargs: Further NotionAPI arguments, like timeout.
+    """
+
+    def __init__(self, tokens: Union[List[str], Dict[str, Optional[List[str]]]], transport: Optional[Transport] = None,
+                 rate: float = DEFAULT_RATE, max_attempts: Optional[int] = None, clock: Callable[[], float] = time.monotonic,
+                 **kwargs):
+        if not tokens:
+            raise ValueError("At least one token is required")
+        access = tokens if isinstance(tokens, dict) else {token: None for token in tokens}
+        super().__init__(next(iter(access)), transport=transport, **kwargs)
+
+        self.members = [_Member(token, RateLimiter(rate=rate), resources) for token, resources in access.items()]
+        self.max_attempts = max_attempts or len(self.members)
+        self._clock = clock
+        # Resource ID -> the member that last reached it, and the members that could not
+        self._routes: Dict[str, _Member] = {}
+        self._unreachable: Dict[str, set] = {}
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None, body: Any = None,
+                timeout: Optional[float] = None) -> TransportResponse:
+        data = encode_json(body) if body is not None else None
+        resource = _resource_id(url, body)
+        tried: set = set()
+        response = None
+
+        while True:
+            member = self._choose(resource, tried)
+            if member is None:
+                return response
+            tried.add(member.token)
+            response = self._send(member, method, url, params, data, timeout)
+
+            if response.status_code == 429:
+                if len(tried) >= self.max_attempts:
+                    return response
+                continue
+            if response.status_code in _UNREACHABLE and resource is not None:
+                with self._lock:
+                    self._unreachable.setdefault(resource, set()).add(member.token)
+                    if self._routes.get(resource) is member:
+                        del self._routes[resource]
+                continue
+            if resource is not None and response.ok:
+                with self._lock:
+                    self._routes[resource] = member
+            return response
+
+    def stream(self, method: str, url: str, params: Optional[Dict[str, Any]] = None, body: Any = None, chunk_size: int = 65536,
+               timeout: Optional[float] = None):
+        data = encode_json(body) if body is not None else None
+        member = self._choose(_resource_id(url, body), set())
+        self._wait_for(member)
+        yield from self.transport.stream(method, url, headers=self._headers_for(member), params=params, body=data, chunk_size=chunk_size,
+                                         timeout=self._request_timeout(timeout))
+
+    def _headers_for(self, member: _Member) -> Dict[str, str]:
+        headers = self._get_headers()
+        headers["Authorization"] = f"Bearer {member.token}"
+        return headers
+
+    def _choose(self, resource: Optional[str], tried: set) -> Optional[_Member]:
+        with self._lock:
+            if resource is not None:
+                routed = self._routes.get(resource)
+                if routed is not None and routed.token not in tried:
+                    return routed
+                unreachable = self._unreachable.get(resource, set())
+            else:
+                unreachable = set()
+
+            candidates = [member for member in self.members if member.token not in tried and member.token not in unreachable]
+            if not candidates and not tried:
+                # Every token failed this resource before; access may have changed since
+                candidates = list(self.members)
+            listed = [member for member in candidates if member.access is not None and resource in member.access]
+            if listed:
+                candidates = listed
+            if not candidates:
+                return None
+            return min(candidates, key=self._expected_wait)
+
+    def _expected_wait(self, member: _Member) -> float:
+        latency = member.latency if member.latency is not None else 0.0
+        return member.limiter.delay() + latency * member.in_flight
+
+    def _wait_for(self, member: _Member) -> None:
+        if not member.limiter.acquire(timeout=remaining()):
+            raise DeadlineExceeded("Deadline exceeded waiting for the rate limit")
+
+    def _send(self, member: _Member, method: str, url: str, params: Optional[Dict[str, Any]], data: Optional[bytes],
+              timeout: Optional[float]) -> TransportResponse:
+        self._wait_for(member)
+        with self._lock:
+            member.in_flight += 1
+            member.requests += 1
+        started = self._clock()
+        try:
+            response = self.transport.send(method, url, headers=self._headers_for(member), params=params, body=data,
+                                           timeout=self._request_timeout(timeout))
+        finally:
+            elapsed = self._clock() - started
+            with self._lock:
+                member.in_flight -= 1
+                member.latency = elapsed if member.latency is None else 0.8 * member.latency + 0.2 * elapsed
+
+        if response.status_code == 429:
+            try:
+                retry_after = float(response.headers.get("Retry-After", 1))
+            except ValueError:
+                retry_after = 1.0
+            member.limiter.pause(retry_after)
+            with self._lock:
+                member.throttled += 1
+        return response
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Returns per-token counters: requests sent, 429 responses, requests in flight and the average latency in seconds.
+        Tokens are shown by their last four characters only.
+        """
+        with self._lock:
+            return [
+                {
+                    "token": f"...{member.token[-4:]}",
+                    "requests": member.requests,
+                    "throttled": member.throttled,
+                    "in_flight": member.in_flight,
+                    "latency": member.latency,
+                }
+                for member in self.members
+            ]
@@ -0,0 +1,102 @@
+import threading
+import time
+from typing import Callable, Optional
+
+
+# Notion allows an average of three requests per second per integration
+DEFAULT_RATE = 3.0
+
+
+class RateLimiter:
+    """
+    A thread-safe token bucket for sharing one request budget between several workloads.
+
+    Attributes:
+        rate (float): The sustained number of requests per second.
+        burst (float): The number of requests that may be sent at once after an idle period.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        Initializes the RateLimiter with a full bucket.
+
+        Args:
+            rate (float, optional): The sustained number of requests per second. Defaults to DEFAULT_RATE.
+            burst (Optional[float], optional): The bucket size. Defaults to the rate, i.e. one second's worth of requests.
+            clock (Callable[[], float], optional): The monotonic clock, replaceable in tests. Defaults to time.monotonic.
+            sleep (Callable[[float], None], optional): The sleep function, replaceable in tests. Defaults to time.sleep.
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive: {rate}")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def delay(self, tokens: float = 1.0) -> float:
+        """
+        Returns how long an acquire of `tokens` would currently have to wait, without taking anything.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            return max(wait, self._paused_until - now)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Takes `tokens` from the bucket if they are available right now.
+
+        Returns:
+            bool: Whether the tokens were taken.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if now < self._paused_until or self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until `tokens` are available and takes them.
+
+        Args:
+            tokens (float, optional): The cost of the request. Defaults to 1.0.
+            timeout (Optional[float], optional): The longest time to wait in seconds. Defaults to None, waiting as long as needed.
+
+        Returns:
+            bool: Whether the tokens were taken; False only if the timeout expired first.
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            if self.try_acquire(tokens):
+                return True
+            wait = self.delay(tokens)
+            if deadline is not None:
+                remaining = deadline - self._clock()
+                if remaining <= 0 or wait > remaining:
+                    return False
+            self._sleep(max(wait, 0.001))
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stops handing out tokens for a while, for example after a 429 response with a Retry-After header.
+
+        Args:
+            seconds (float): How long to pause.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+            self._tokens = min(self._tokens, 0.0)
@@ -0,0 +1,226 @@
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .deadlines import DeadlineExceeded, remaining
+from .ratelimit import RateLimiter
+from .transport import Transport, TransportResponse
+
+
+class PriorityClass:
+    """
+    A class of requests with its own share of the rate budget.
+
+    Attributes:
+        name (str): The name requests refer to the class by.
+        priority (int): Classes with a higher priority are always served first; waiting requests of lower ones only get what is left.
+        weight (float): The share of the budget relative to other classes of the same priority.
+        concurrency (Optional[int]): The most requests of the class in flight at once. None means no limit.
+    """
+
+    def __init__(self, name: str, priority: int = 0, weight: float = 1.0, concurrency: Optional[int] = None):
+        if weight <= 0:
+            raise ValueError(f"Weight must be positive: {weight}")
+        self.name = name
+        self.priority = priority
+        self.weight = weight
+        self.concurrency = concurrency
+
+        self.waiting: deque = deque()
+        self.running = 0
+        self.last_finish = 0.0
+        self.dispatched = 0
+        self.wait_time = 0.0
+
+
+class _Ticket:
+    def __init__(self, order: int, finish: float, cost: float):
+        self.order = order
+        self.finish = finish
+        self.cost = cost
+
+
+DEFAULT_CLASSES = (
+    PriorityClass("interactive", priority=1, concurrency=4),
+    PriorityClass("background", priority=0, concurrency=2),
+)
+
+
+class RequestScheduler:
+    """
+    Shares one rate budget between classes of requests.
+
+    Every request waits for a slot. A slot is granted when the rate limiter has a token
+    and the request's class is below its concurrency limit. Among the classes that could
+    go, the one with the highest priority wins, so an interactive request waits at most
+    for the next free slot, however many background requests are queued. Classes of equal
+    priority are served by weighted fair queuing: each request is tagged with a virtual
+    finish time of its class's previous tag plus cost/weight, and the smallest tag goes first.
+
+    Args:
+        limiter (Optional[RateLimiter], optional): The shared rate budget. Defaults to a RateLimiter with the default rate.
+        classes (Optional[List[PriorityClass]], optional): The request classes. Defaults to "interactive" (priority 1, 4 concurrent)
+            and "background" (priority 0, 2 concurrent).
+        clock (Callable[[], float], optional): The monotonic clock used for wait statistics. Defaults to time.monotonic.
+    """
+
+    def __init__(self, limiter: Optional[RateLimiter] = None, classes: Optional[List[PriorityClass]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.limiter = limiter or RateLimiter()
+        if classes is None:
+            classes = [PriorityClass(c.name, c.priority, c.weight, c.concurrency) for c in DEFAULT_CLASSES]
+        self.classes: Dict[str, PriorityClass] = {c.name: c for c in classes}
+        self._clock = clock
+        self._order = itertools.count()
+        self._virtual_time = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, name: str, cost: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for a slot for a request of the given class. Every successful acquire must be followed by a `release`.
+
+        Args:
+            name (str): The name of the request class.
+            cost (float, optional): The number of rate tokens the request takes. Defaults to 1.0.
+            timeout (Optional[float], optional): The longest time to wait in seconds. Defaults to None, waiting as long as needed.
+
+        Returns:
+            bool: Whether the slot was granted; False only if the timeout expired first.
+        """
+        request_class = self.classes[name]
+        started = self._clock()
+        deadline = None if timeout is None else started + timeout
+        with self._condition:
+            start = max(self._virtual_time, request_class.last_finish)
+            ticket = _Ticket(next(self._order), start + cost / request_class.weight, cost)
+            request_class.last_finish = ticket.finish
+            request_class.waiting.append(ticket)
+            try:
+                while True:
+                    wait = None
+                    if self._next() is ticket:
+                        if self.limiter.try_acquire(cost):
+                            request_class.waiting.popleft()
+                            request_class.running += 1
+                            request_class.dispatched += 1
+                            request_class.wait_time += self._clock() - started
+                            self._virtual_time = max(self._virtual_time, ticket.finish - cost / request_class.weight)
+                            self._condition.notify_all()
+                            return True
+                        wait = max(self.limiter.delay(cost), 0.001)
+                    if deadline is not None:
+                        left = deadline - self._clock()
+                        if left <= 0:
+                            request_class.waiting.remove(ticket)
+                            self._condition.notify_all()
+                            return False
+                        wait = left if wait is None else min(wait, left)
+                    self._condition.wait(wait)
+            except BaseException:
+                if ticket in request_class.waiting:
+                    request_class.waiting.remove(ticket)
+                    self._condition.notify_all()
+                raise
+
+    def release(self, name: str) -> None:
+        """
+        Gives back the slot of a finished request of the given class.
+        """
+        with self._condition:
+            self.classes[name].running -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, name: str, cost: float = 1.0):
+        """
+        Holds a slot of the given class for the duration of the with block, waiting at most until the current deadline.
+
+        Raises:
+            DeadlineExceeded: If the deadline passes before a slot is granted.
+        """
+        if not self.acquire(name, cost, timeout=remaining()):
+            raise DeadlineExceeded(f"Deadline exceeded waiting for a {name} slot")
+        try:
+            yield
+        finally:
+            self.release(name)
+
+    def _next(self) -> Optional[_Ticket]:
+        best = None
+        best_key = None
+        for request_class in self.classes.values():
+            if not request_class.waiting:
+                continue
+            if request_class.concurrency is not None and request_class.running >= request_class.concurrency:
+                continue
+            head = request_class.waiting[0]
+            key = (-request_class.priority, head.finish, head.order)
+            if best_key is None or key < best_key:
+                best, best_key = head, key
+        return best
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns per-class counters: requests waiting, running and dispatched, and the average wait in seconds.
+        """
+        with self._condition:
+            return {
+                name: {
+                    "waiting": len(c.waiting),
+                    "running": c.running,
+                    "dispatched": c.dispatched,
+                    "average_wait": c.wait_time / c.dispatched if c.dispatched else 0.0,
+                }
+                for name, c in self.classes.items()
+            }
+
+
+class ScheduledTransport(Transport):
+    """
+    Transport that sends every request through a RequestScheduler slot of one class.
+
+    Give each workload its own NotionAPI with its own ScheduledTransport, all wrapping the
+    same underlying transport and scheduler, so they share connections and the rate budget.
+    A 429 response pauses the shared rate limiter for its Retry-After time. Closing the
+    ScheduledTransport leaves the underlying transport open for the others; close it
+    yourself once every client is done, or pass `close_transport` if this one owns it.
+
+    Args:
+        transport (Transport): The transport to send the requests through.
+        scheduler (RequestScheduler): The scheduler granting the slots.
+        priority (str): The name of the request class.
+        close_transport (bool): Whether closing this transport closes the underlying one. Defaults to False.
+    """
+
+    def __init__(self, transport: Transport, scheduler: RequestScheduler, priority: str, close_transport: bool = False):
+        if priority not in scheduler.classes:
+            raise ValueError(f"Unknown request class: {priority}")
+        self.transport = transport
+        self.scheduler = scheduler
+        self.priority = priority
+        self.close_transport = close_transport
+
+    def _check_rate_limit(self, response: TransportResponse) -> None:
+        if response.status_code == 429:
+            try:
+                retry_after = float(response.headers.get("Retry-After", 1))
+            except ValueError:
+                retry_after = 1.0
+            self.scheduler.limiter.pause(retry_after)
+
+    def send(self, method, url, headers=None, params=None, body=None, timeout=None) -> TransportResponse:
+        with self.scheduler.slot(self.priority):
+            response = self.transport.send(method, url, headers=headers, params=params, body=body, timeout=timeout)
+        self._check_rate_limit(response)
+        return response
+
+    def stream(self, method, url, headers=None, params=None, body=None, chunk_size=65536, timeout=None) -> Iterator[bytes]:
+        with self.scheduler.slot(self.priority):
+            yield from self.transport.stream(method, url, headers=headers, params=params, body=body, chunk_size=chunk_size, timeout=timeout)
+
+    def close(self) -> None:
+        if self.close_transport:
+            self.transport.close()
@@ -0,0 +1,133 @@
+import json
+from typing import List, Dict, Any, Union, Tuple
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Per model class: (field name, default value) for every serialized field
+_FIELD_PLANS: Dict[type, Tuple[Tuple[str, Any], ...]] = {}
+
+_MISSING = object()
+
+
+def _field_plan(cls: type) -> Tuple[Tuple[str, Any], ...]:
+    plan = _FIELD_PLANS.get(cls)
+    if plan is None:
+        fields = cls.model_fields if hasattr(cls, "model_fields") else cls.__fields__
+        excluded = set(getattr(cls, "serialize_exclude", ()))
+        plan = []
+        for name, field in fields.items():
+            if name in excluded:
+                continue
+            if field.default_factory is not None:
+                default = field.default_factory()
+            elif field.is_required() if hasattr(field, "is_required") else field.required:
+                default = _MISSING
+            else:
+                default = field.default
+            plan.append((name, default))
+        plan = _FIELD_PLANS[cls] = tuple(plan)
+    return plan
+
+
+def serialize(value: Any) -> Any:
+    """
+    Converts models (also nested in lists and dictionaries) to plain data for a request body.
+
+    Only fields that were set or differ from their default are emitted, and None values
+    only if they were set explicitly. A model's content field, the one named by its `type`, is always kept.
+    Fields listed in a model's `serialize_exclude` are never emitted. Field plans are
+    computed once per model class.
+
+    Args:
+        value (Any): A model, a list or dictionary that may contain models, or a plain value.
+
+    Returns:
+        Any: The plain data, ready to be encoded as JSON.
+    """
+    if isinstance(value, BaseModel):
+        fields_set = value.model_fields_set if hasattr(value, "model_fields_set") else value.__fields_set__
+        values = value.__dict__
+        # The content of an object lives in the field named after its type, which is sent even if empty
+        content_field = values.get("type")
+        data = {}
+        for name, default in _field_plan(type(value)):
+            field_value = values[name]
+            if field_value is None:
+                # An explicit None clears a value, such as a select or a date; an unset one is left out
+                if name in fields_set:
+                    data[name] = None
+                continue
+            if name == content_field or name in fields_set or field_value != default:
+                data[name] = serialize(field_value)
+        return data
+    if isinstance(value, dict):
+        return {key: serialize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [serialize(item) for item in value]
+    return value
+
+
+def encode_json(value: Any) -> bytes:
+    """
+    Serializes a request body and encodes it to JSON bytes, with orjson when it is installed.
+
+    Args:
+        value (Any): The request body, which may contain models.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON.
+    """
+    data = serialize(value)
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def block_to_dict(block: Union[Dict[str, Any], BaseModel]) -> Dict[str, Any]:
+    """
+    Converts a block model to the dictionary expected by the Notion API, leaving dictionaries untouched.
+
+    Args:
+        block (Union[Dict[str, Any], BaseModel]): A block model or an already serialized block.
+
+    Returns:
+        Dict[str, Any]: The serialized block without unset optional fields.
+    """
+    if isinstance(block, BaseModel):
+        return serialize(block)
+    return block
+
+
+def get_block_type(block: Dict[str, Any]) -> str:
+    """
+    Returns the type of a serialized block, also for blocks serialized without a `type` key (such as images).
+
+    Args:
+        block (Dict[str, Any]): The serialized block.
+
+    Returns:
+        str: The block type.
+    """
+    return block.get("type") or next(key for key in block if key != "object")
+
+
+def get_block_children(block: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Returns the nested children of a serialized block.
+
+    Args:
+        block (Dict[str, Any]): The serialized block.
+
+    Returns:
+        List[Dict[str, Any]]: The children in the block content, or an empty list.
+    """
+    content = block.get(get_block_type(block))
+    if isinstance(content, dict):
+        return content.get("children") or []
+    return []
+
@@ -0,0 +1,80 @@
+from typing import Any, Dict, List, Sequence
+
+from .serialization import serialize
+from .types import text_to_rich_text
+
+
+def cell_to_rich_text(value: Any) -> List[Dict[str, Any]]:
+    """
+    Converts a cell value to rich text: None and "" to an empty cell, a list of rich text
+    items (models or dicts) as is, and anything else to its string.
+    """
+    if value is None or value == "":
+        return []
+    if isinstance(value, list):
+        return [serialize(item) for item in value]
+    return [serialize(item) for item in text_to_rich_text(str(value))]
+
+
+def cell_text(cell: List[Dict[str, Any]]) -> str:
+    """
+    Returns the plain text of a cell read from the API.
+    """
+    return "".join(item.get("plain_text") or (item.get("text") or {}).get("content", "") for item in cell)
+
+
+def table_values(rows: Any) -> List[List[Any]]:
+    """
+    Returns the rows of a 2D sequence as lists, or those of a pandas DataFrame with its column names as the first row.
+    """
+    if hasattr(rows, "columns") and hasattr(rows, "itertuples"):
+        return [list(rows.columns)] + [list(row) for row in rows.itertuples(index=False, name=None)]
+    return [list(row) for row in rows]
+
+
+def table_row_block(values: Sequence[Any], width: int) -> Dict[str, Any]:
+    """
+    Builds a table_row block, padding it with empty cells to the table width.
+
+    Raises:
+        ValueError: If the row has more cells than the table is wide.
+    """
+    if len(values) > width:
+        raise ValueError(f"A row has {len(values)} cells, but the table is {width} wide")
+    cells = [cell_to_rich_text(value) for value in values]
+    cells.extend([] for _ in range(width - len(cells)))
+    return {"type": "table_row", "table_row": {"cells": cells}}
+
+
+def table_block(rows: List[List[Any]], has_column_header: bool = False, has_row_header: bool = False) -> Dict[str, Any]:
+    """
+    Builds a table block with its rows as children, as wide as the widest row.
+
+    Raises:
+        ValueError: If there are no rows.
+    """
+    width = max((len(row) for row in rows), default=0)
+    if not width:
+        raise ValueError("A table needs at least one row with a cell")
+    return {
+        "type": "table",
+        "table": {
+            "table_width": width,
+            "has_column_header": has_column_header,
+            "has_row_header": has_row_header,
+            "children": [table_row_block(row, width) for row in rows],
+        },
+    }
+
+
+def to_dataframe(rows: List[List[Any]], has_column_header: bool) -> Any:
+    """
+    Builds a pandas DataFrame from table rows, taking column names from the first row if it is a header.
+    """
+    try:
+        import pandas
+    except ImportError as e:
+        raise ImportError("Reading tables as DataFrames requires pandas: pip install pandas") from e
+    if has_column_header and rows:
+        return pandas.DataFrame(rows[1:], columns=rows[0])
+    return pandas.DataFrame(rows)
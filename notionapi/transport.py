@@ -0,0 +1,445 @@
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .deadlines import DeadlineExceeded, propagate, remaining
+from .ratelimit import RateLimiter
+
+__all__ = ["TransportResponse", "Transport", "RequestsTransport", "HTTPXTransport", "Handler", "InMemoryTransport", "HedgedTransport",
+           "MeteredTransport"]
+
+
+class TransportResponse:
+    """
+    A response as returned by every transport.
+
+    Errors are reported with the `requests` exception types whatever the transport,
+    so calling code handles them the same way.
+
+    Attributes:
+        status_code (int): The HTTP status code.
+        headers (Dict[str, str]): The response headers.
+        content (bytes): The raw response body.
+        url (str): The requested URL.
+    """
+
+    def __init__(self, status_code: int, content: bytes = b"", headers: Optional[Dict[str, str]] = None, url: str = ""):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.url = url
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        """
+        Raises `requests.exceptions.HTTPError` for 4xx and 5xx responses, with this response attached.
+        """
+        if not self.ok:
+            kind = "Client" if self.status_code < 500 else "Server"
+            raise requests.exceptions.HTTPError(f"{self.status_code} {kind} Error for url: {self.url}", response=self)
+
+
+class Transport:
+    """
+    The interface NotionAPI uses for all network I/O.
+
+    Implementations take fully built requests (absolute URL, headers, encoded body)
+    and must be safe to use from several threads at once.
+    """
+
+    def send(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None,
+             body: Optional[bytes] = None, timeout: Optional[float] = None) -> TransportResponse:
+        """
+        Sends a request and reads the whole response.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The absolute URL.
+            headers (Optional[Dict[str, str]], optional): The request headers. Defaults to None.
+            params (Optional[Dict[str, Any]], optional): The query string parameters. Defaults to None.
+            body (Optional[bytes], optional): The encoded request body. Defaults to None.
+            timeout (Optional[float], optional): The longest time to wait for the connection or for data, in seconds. Defaults to None, waiting forever.
+
+        Returns:
+            TransportResponse: The response, whatever its status code.
+
+        Raises:
+            requests.exceptions.ConnectionError: If the request could not be sent or the response not received.
+            requests.exceptions.Timeout: If the transport timed out.
+        """
+        raise NotImplementedError
+
+    def stream(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None,
+               body: Optional[bytes] = None, chunk_size: int = 65536, timeout: Optional[float] = None) -> Iterator[bytes]:
+        """
+        Sends a request and yields the response body in chunks as it arrives.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The absolute URL.
+            headers (Optional[Dict[str, str]], optional): The request headers. Defaults to None.
+            params (Optional[Dict[str, Any]], optional): The query string parameters. Defaults to None.
+            body (Optional[bytes], optional): The encoded request body. Defaults to None.
+            chunk_size (int, optional): The preferred chunk size in bytes. Defaults to 65536.
+            timeout (Optional[float], optional): The longest time to wait for the connection or for data, in seconds. Defaults to None, waiting forever.
+
+        Yields:
+            bytes: The response body chunks.
+
+        Raises:
+            requests.exceptions.HTTPError: Before the first chunk, if the response status is 4xx or 5xx.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Releases connections and other resources held by the transport.
+        """
+
+    def __enter__(self) -> 'Transport':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class RequestsTransport(Transport):
+    """
+    HTTP/1.1 transport on a pooled `requests.Session`.
+
+    Args:
+        pool_connections (int, optional): The number of hosts to keep pools for. Defaults to 4.
+        pool_maxsize (int, optional): The number of connections kept alive per host; size it to the request concurrency. Defaults to 16.
+        session (Optional[requests.Session], optional): A session to use instead of a new one. Defaults to None.
+    """
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 16, session: Optional[requests.Session] = None):
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def send(self, method, url, headers=None, params=None, body=None, timeout=None) -> TransportResponse:
+        response = self.session.request(method, url, headers=headers, params=params, data=body, timeout=timeout)
+        return TransportResponse(response.status_code, response.content, dict(response.headers), response.url)
+
+    def stream(self, method, url, headers=None, params=None, body=None, chunk_size=65536, timeout=None) -> Iterator[bytes]:
+        with self.session.request(method, url, headers=headers, params=params, data=body, stream=True, timeout=timeout) as response:
+            if response.status_code >= 400:
+                TransportResponse(response.status_code, response.content, dict(response.headers), response.url).raise_for_status()
+            yield from response.iter_content(chunk_size=chunk_size)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class HTTPXTransport(Transport):
+    """
+    Transport on an `httpx.Client`, by default speaking HTTP/2 so that concurrent
+    requests from many threads are multiplexed over a single connection.
+
+    Requires `httpx` with HTTP/2 support (`pip install httpx[http2]`, or the `http2` extra of this package).
+
+    Args:
+        http2 (bool, optional): Whether to negotiate HTTP/2. Defaults to True.
+        max_connections (int, optional): The maximum number of open connections. Defaults to 4.
+        client (optional): An `httpx.Client` to use instead of a new one. Defaults to None.
+    """
+
+    def __init__(self, http2: bool = True, max_connections: int = 4, client: Any = None):
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError("HTTPXTransport requires httpx: pip install 'httpx[http2]'") from e
+        self._httpx = httpx
+        if client is None:
+            client = httpx.Client(http2=http2, limits=httpx.Limits(max_connections=max_connections), timeout=None)
+        self.client = client
+
+    def _translate(self, error: Exception) -> Exception:
+        if isinstance(error, self._httpx.TimeoutException):
+            return requests.exceptions.Timeout(str(error))
+        return requests.exceptions.ConnectionError(str(error))
+
+    def send(self, method, url, headers=None, params=None, body=None, timeout=None) -> TransportResponse:
+        try:
+            response = self.client.request(method, url, headers=headers, params=params, content=body, timeout=timeout)
+        except self._httpx.TransportError as e:
+            raise self._translate(e) from e
+        return TransportResponse(response.status_code, response.content, dict(response.headers), str(response.url))
+
+    def stream(self, method, url, headers=None, params=None, body=None, chunk_size=65536, timeout=None) -> Iterator[bytes]:
+        try:
+            with self.client.stream(method, url, headers=headers, params=params, content=body, timeout=timeout) as response:
+                if response.status_code >= 400:
+                    TransportResponse(response.status_code, response.read(), dict(response.headers), str(response.url)).raise_for_status()
+                yield from response.iter_bytes(chunk_size=chunk_size)
+        except self._httpx.TransportError as e:
+            raise self._translate(e) from e
+
+    def close(self) -> None:
+        self.client.close()
+
+
+Handler = Callable[[str, str, Dict[str, str], Dict[str, Any], Any], Union[TransportResponse, Tuple[int, Any], Dict[str, Any], List[Any]]]
+
+
+class InMemoryTransport(Transport):
+    """
+    Transport that answers requests with a Python function instead of the network,
+    for tests and for benchmarking the client without network time.
+
+    The handler is called as `handler(method, url, headers, params, body)`, where body
+    is the decoded JSON request body (or None); timeouts are not applied. It returns a `TransportResponse`, a
+    `(status_code, data)` tuple, or the data of a 200 response, which is encoded as JSON.
+    Every request is recorded in `requests` as `(method, url, params, body)`.
+
+    Args:
+        handler (Handler): The function producing the responses.
+    """
+
+    def __init__(self, handler: Handler):
+        self.handler = handler
+        self.requests: List[Tuple[str, str, Dict[str, Any], Any]] = []
+        self._lock = threading.Lock()
+
+    def send(self, method, url, headers=None, params=None, body=None, timeout=None) -> TransportResponse:
+        data = json.loads(body) if body else None
+        with self._lock:
+            self.requests.append((method, url, dict(params or {}), data))
+
+        result = self.handler(method, url, headers or {}, params or {}, data)
+        if isinstance(result, TransportResponse):
+            return result
+        status_code, payload = result if isinstance(result, tuple) else (200, result)
+        content = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        return TransportResponse(status_code, content, {"Content-Type": "application/json"}, url)
+
+    def stream(self, method, url, headers=None, params=None, body=None, chunk_size=65536, timeout=None) -> Iterator[bytes]:
+        response = self.send(method, url, headers=headers, params=params, body=body, timeout=timeout)
+        response.raise_for_status()
+        for start in range(0, len(response.content), chunk_size):
+            yield response.content[start:start + chunk_size]
+
+
+class HedgedTransport(Transport):
+    """
+    Transport that cuts the latency tail of reads by hedging: when a GET has not been
+    answered after the recent 95th percentile latency, an identical backup request is
+    sent, and whichever answers first is used. The other one is cancelled if it hasn't
+    started yet, and otherwise its response is discarded when it arrives. Both requests
+    run under the caller's deadline.
+
+    Only GET requests are hedged, since they are safe to send twice. Each hedge costs a
+    request from the rate budget, so the share of hedged requests is capped.
+
+    Args:
+        transport (Transport): The transport to send the requests through.
+        quantile (float, optional): The latency quantile after which to hedge. Defaults to 0.95.
+        initial_delay (float, optional): The hedge delay in seconds until enough latencies are known. Defaults to 1.0.
+        min_delay (float, optional): The shortest hedge delay in seconds. Defaults to 0.05.
+        window (int, optional): How many recent latencies the quantile is computed over. Defaults to 200.
+        max_hedge_ratio (float, optional): The largest share of GET requests that may be hedged. Defaults to 0.1.
+        max_workers (int, optional): The threads sending primary and backup requests. Defaults to 16.
+    """
+
+    def __init__(self, transport: Transport, quantile: float = 0.95, initial_delay: float = 1.0, min_delay: float = 0.05,
+                 window: int = 200, max_hedge_ratio: float = 0.1, max_workers: int = 16):
+        self.transport = transport
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_hedge_ratio = max_hedge_ratio
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._latencies: deque = deque(maxlen=window)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+
+    def hedge_delay(self) -> float:
+        """
+        Returns how long a GET currently waits before its backup request is sent.
+        """
+        with self._lock:
+            # Too few samples for a meaningful tail
+            if len(self._latencies) < 20:
+                return self.initial_delay
+            ordered = sorted(self._latencies)
+        return max(self.min_delay, ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))])
+
+    def _timed_send(self, *args, **kwargs) -> TransportResponse:
+        started = time.monotonic()
+        response = self.transport.send(*args, **kwargs)
+        with self._lock:
+            self._latencies.append(time.monotonic() - started)
+        return response
+
+    def send(self, method, url, headers=None, params=None, body=None, timeout=None) -> TransportResponse:
+        if method.upper() != "GET":
+            return self.transport.send(method, url, headers=headers, params=params, body=body, timeout=timeout)
+
+        # Sent from the executor's threads, which don't see the caller's deadline otherwise
+        timed_send = propagate(self._timed_send)
+        primary = self._executor.submit(timed_send, method, url, headers=headers, params=params, body=body, timeout=timeout)
+        delay = self.hedge_delay()
+        with self._lock:
+            self.requests += 1
+            may_hedge = self.hedged < self.max_hedge_ratio * self.requests
+        done, _ = wait([primary], timeout=delay if timeout is None else min(delay, timeout))
+        if done or not may_hedge:
+            return primary.result()
+
+        with self._lock:
+            self.hedged += 1
+        backup = self._executor.submit(timed_send, method, url, headers=headers, params=params, body=body, timeout=timeout)
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if future is backup:
+                    with self._lock:
+                        self.hedge_wins += 1
+                loser = primary if future is backup else backup
+                loser.cancel()
+                loser.add_done_callback(_discard)
+                return response
+        raise error
+
+    def stream(self, method, url, headers=None, params=None, body=None, chunk_size=65536, timeout=None) -> Iterator[bytes]:
+        yield from self.transport.stream(method, url, headers=headers, params=params, body=body, chunk_size=chunk_size, timeout=timeout)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.transport.close()
+
+
+def _discard(future) -> None:
+    # The losing response of a hedge is dropped, releasing its connection if it holds one
+    if future.cancelled() or future.exception() is not None:
+        return
+    close = getattr(future.result(), "close", None)
+    if close:
+        close()
+
+
+class MeteredTransport(Transport):
+    """
+    Transport that counts the requests and bytes going through another transport, for
+    reporting the throughput of long transfers while they run, and optionally paces
+    them with a rate limiter.
+
+    With a limiter, every request first takes a token from it, and the waits are
+    counted. A 429 response pauses the limiter for its Retry-After time, and the
+    request is sent again up to `max_retries` times.
+
+    Args:
+        transport (Transport): The transport to send the requests through.
+        limiter (Optional[RateLimiter], optional): The rate budget of the requests. Defaults to None, sending them right away.
+        max_retries (int, optional): How often to resend a request answered with 429 when there is a limiter. Defaults to 3.
+        clock (Callable[[], float], optional): The monotonic clock, replaceable in tests. Defaults to time.monotonic.
+    """
+
+    def __init__(self, transport: Transport, limiter: Optional[RateLimiter] = None, max_retries: int = 3,
+                 clock: Callable[[], float] = time.monotonic):
+        self.transport = transport
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the counters: requests sent, error responses and failed sends, 429 responses, bytes sent and
+        received, and how many requests waited for the rate limit, for how many seconds in total.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "throttled": self.throttled,
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "waits": self.waits,
+                "wait_seconds": self.wait_seconds,
+            }
+
+    def _wait(self) -> None:
+        if self.limiter is None or self.limiter.try_acquire():
+            return
+        started = self._clock()
+        acquired = self.limiter.acquire(timeout=remaining())
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds += self._clock() - started
+        if not acquired:
+            raise DeadlineExceeded("Deadline exceeded waiting for the rate limit")
+
+    def _count(self, sent: int, received: int, error: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += sent
+            self.bytes_received += received
+            self.errors += error
+
+    def send(self, method, url, headers=None, params=None, body=None, timeout=None) -> TransportResponse:
+        attempts = 0
+        while True:
+            self._wait()
+            try:
+                response = self.transport.send(method, url, headers=headers, params=params, body=body, timeout=timeout)
+            except Exception:
+                self._count(len(body or b""), 0, True)
+                raise
+            self._count(len(body or b""), len(response.content), not response.ok)
+            if response.status_code != 429 or self.limiter is None:
+                return response
+
+            with self._lock:
+                self.throttled += 1
+            try:
+                retry_after = float(response.headers.get("Retry-After", 1))
+            except ValueError:
+                retry_after = 1.0
+            self.limiter.pause(retry_after)
+            attempts += 1
+            if attempts > self.max_retries:
+                return response
+
+    def stream(self, method, url, headers=None, params=None, body=None, chunk_size=65536, timeout=None) -> Iterator[bytes]:
+        self._wait()
+        self._count(len(body or b""), 0, False)
+        for chunk in self.transport.stream(method, url, headers=headers, params=params, body=body, chunk_size=chunk_size, timeout=timeout):
+            with self._lock:
+                self.bytes_received += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        self.transport.close()
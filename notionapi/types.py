@@ -1,29 +1,19 @@
-from typing import List, Optional, Union, Dict, Any, get_origin, get_args
+import importlib
+from typing import ClassVar, List, Optional, Tuple, Union, Dict, Any, get_origin, get_args
 from pydantic import BaseModel
 
 
 
 def initialize_type(type_name: str, **kwargs) -> Any:
-    type_mapping = {
-        "multi_select": MultiSelectObject,
-        "select": SelectObject,
-        "number": float,
-        # "people": List[People],
-        "date": DateObject,
-        "formula": FormulaObject,
-        # "relation": List[Relation],
-        # "text": Text,
-        "last_edited_time": LastEditedTimeObject,
-        "created_time": CreatedTimeObject,
-        "rich_text": RichTextObject,
-        "checkbox": CheckboxObject,
-        "rollup": RollupObject,
-        "url": URLObject,
-        "title": TitleObject
-    }
-    cls = type_mapping.get(type_name, None)
+    cls = PROPERTY_TYPES.get(type_name, None)
     if cls is None:
         raise ValueError(f"Unsupported type: {type_name}")
+
+    # The API returns relations and people as bare lists, the models wrap them
+    if type_name == "relation":
+        kwargs["relation"] = {"relation": kwargs.get("relation") or [], "has_more": kwargs.pop("has_more", None)}
+    elif type_name == "people":
+        kwargs["people"] = {"people": kwargs.get("people") or []}
     
     origin = get_origin(cls)
     args = get_args(cls)
@@ -61,6 +51,9 @@ def initialize_type(type_name: str, **kwargs) -> Any:
 class BaseObject(BaseModel):
     id: str = ""
 
+    # Fields that are left out of request bodies, see serialization.serialize
+    serialize_exclude: ClassVar[Tuple[str, ...]] = ('id', 'type', 'updatable')
+
     def dict(self, **kwargs) -> Dict[str, Any]:
         data = super().dict(**kwargs)
         data.pop('id', None)
@@ -89,12 +82,6 @@ class CreatedByType(BaseModel):
     object: Optional[str] = None
     id: Optional[str] = None
 
-class CreatedByObject(BaseObject):
-    id: str
-    type: str
-    created_by: CreatedByType
-    updatable: bool = False
-
 class CreatedTimeObject(BaseObject):
     type: str = "created_time"
     created_time: Optional[str] = ""
@@ -123,35 +110,6 @@ class DateObject(BaseObject):
         self.date.start = value
 
 
-#
-# Email
-#
-
-class EmailType(BaseModel):
-    email: Optional[str] = None
-
-class EmailObject(BaseObject):
-    type: str = "email"
-    email: EmailType
-    updatable: bool = True
-
-
-#
-# File
-#
-
-class FileObject(BaseModel):
-    name: Optional[str] = None
-    type: Optional[str] = None
-    external: Optional[dict] = None
-
-class FilesType(BaseModel):
-    files: Optional[List[FileObject]] = None
-
-class FilesObject(BaseObject):
-    type: str
-    files: FilesType
-    updatable: bool = True
 
 
 #
@@ -175,15 +133,6 @@ class FormulaObject(BaseObject):
 # Last Edited
 #
 
-class LastEditedByType(BaseModel):
-    object: Optional[str] = None
-    id: Optional[str] = None
-
-class LastEditedByObject(BaseObject):
-    type: str
-    last_edited_by: LastEditedByType
-    updatable: bool = False
-
 class LastEditedTimeObject(BaseObject):
     type: str = "last_edited_time"
     last_edited_time: Optional[str] = None
@@ -205,18 +154,6 @@ class MultiSelectObject(BaseObject):
     updatable: bool = True
 
 
-#
-# Number
-#
-
-class NumberType(BaseModel):
-    number: Optional[float] = None
-
-class NumberObject(BaseObject):
-    type: str
-    number: NumberType
-    updatable: bool = True
-
 
 #
 # People
@@ -231,18 +168,6 @@ class PeopleObject(BaseObject):
     updatable: bool = True
 
 
-#
-# Phone Number
-#
-
-class PhoneNumberType(BaseModel):
-    phone_number: Optional[str] = None
-
-class PhoneNumberObject(BaseObject):
-    type: str
-    phone_number: PhoneNumberType
-    updatable: bool = True
-
 
 #
 # Relation
@@ -265,6 +190,8 @@ class RelationObject(BaseObject):
 class RollupType(BaseModel):
     type: Optional[str] = None
     number: Optional[float] = None
+    date: Optional[DateType] = None
+    array: Optional[List[dict]] = None
     function: Optional[str] = None
 
 class RollupObject(BaseObject):
@@ -292,6 +219,64 @@ class TextType(BaseModel):
     plain_text: Optional[str] = ""
     href: Optional[str] = ""
 
+RICH_TEXT_LIMIT = 2000
+
+
+def split_text(content: str, limit: int = RICH_TEXT_LIMIT) -> List[str]:
+    """
+    Splits a string into chunks that fit Notion's rich text content limit.
+
+    Notion measures the limit in UTF-16 code units, so characters outside the
+    Basic Multilingual Plane count twice.
+
+    Args:
+        content (str): The text to split.
+        limit (int, optional): The maximum chunk length. Defaults to RICH_TEXT_LIMIT.
+
+    Returns:
+        List[str]: The chunks, in order. An empty string yields a single empty chunk.
+    """
+    if len(content) <= limit // 2 or len(content.encode("utf-16-le")) <= 2 * limit:
+        return [content]
+
+    chunks = []
+    start = 0
+    size = 0
+    for index, char in enumerate(content):
+        width = 2 if ord(char) > 0xFFFF else 1
+        if size + width > limit:
+            chunks.append(content[start:index])
+            start = index
+            size = 0
+        size += width
+    chunks.append(content[start:])
+    return chunks
+
+
+def text_to_rich_text(content: str, annotations: Optional[Dict[str, Any]] = None, link: Optional[str] = None) -> List[TextType]:
+    """
+    Builds rich text items for a string, splitting it at the rich text content limit.
+
+    Args:
+        content (str): The text content.
+        annotations (Optional[Dict[str, Any]], optional): Annotation flags such as bold or code. Defaults to None.
+        link (Optional[str], optional): The URL the text links to. Defaults to None.
+
+    Returns:
+        List[TextType]: One rich text item per chunk.
+    """
+    extra = {"annotations": AnnotationsType(**annotations).dict()} if annotations else {}
+    return [
+        TextType(
+            text={"content": chunk, "link": {"url": link} if link else None},
+            plain_text=chunk,
+            href=link,
+            **extra
+        )
+        for chunk in split_text(content)
+    ]
+
+
 class RichTextObject(BaseObject):
     type: str = "rich_text"
     rich_text: List[TextType] = [TextType()]
@@ -323,20 +308,6 @@ class SelectObject(BaseObject):
     updatable: bool = True
 
 
-#
-# Status
-#
-
-class StatusType(BaseModel):
-    id: Optional[str] = None
-    name: Optional[str] = None
-    color: Optional[str] = None
-
-class StatusObject(BaseObject):
-    type: str
-    status: StatusType
-    updatable: bool = True
-
 
 #
 # Title
@@ -359,29 +330,37 @@ class URLObject(BaseObject):
 
 
 #
-# Unique ID
-#
-
-class UniqueIDType(BaseModel):
-    number: Optional[int] = None
-    prefix: Optional[str] = None
-
-class UniqueIDObject(BaseObject):
-    type: str
-    unique_id: UniqueIDType
-    updatable: bool = False
-
-
-#
-# Verification
-#
-
-class VerificationType(BaseModel):
-    state: Optional[str] = None
-    verified_by: Optional[CreatedByType] = None
-    date: Optional[DateType] = None
-
-class VerificationObject(BaseObject):
-    type: str
-    verification: VerificationType
-    updatable: bool = False
+# Dispatch table for initialize_type, built once
+#
+
+PROPERTY_TYPES = {
+    "multi_select": MultiSelectObject,
+    "select": SelectObject,
+    "number": float,
+    "people": PeopleObject,
+    "date": DateObject,
+    "formula": FormulaObject,
+    "relation": RelationObject,
+    # "text": Text,
+    "last_edited_time": LastEditedTimeObject,
+    "created_time": CreatedTimeObject,
+    "rich_text": RichTextObject,
+    "checkbox": CheckboxObject,
+    "rollup": RollupObject,
+    "url": URLObject,
+    "title": TitleObject
+}
+
+
+def __getattr__(name: str) -> Any:
+    # Rarely used property models are defined on first access, see extra_types.py.
+    # Dunder lookups (such as __all__ during a star import) must not trigger the import.
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    extra_types = importlib.import_module(".extra_types", __package__)
+    try:
+        value = getattr(extra_types, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .notionapi import NotionAPI
+from .ratelimit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class _Batch:
+    def __init__(self, started: float):
+        self.started = started
+        self.properties: Dict[str, Any] = {}
+        self.updates = 0
+
+
+class WriteBehindBuffer:
+    """
+    Collects page property updates and writes them later, merging all updates of a page
+    made within a short window into a single PATCH request.
+
+    When the same property is updated several times before a flush, the last value wins.
+    Updates of one page are written in the order they were made: a page never has more
+    than one request in flight, and updates made meanwhile wait for the next one.
+    Different pages are written concurrently.
+
+    A page is written once its oldest pending update is `window` seconds old, or as soon
+    as it has `max_properties` pending properties. When `max_pages` pages are pending,
+    all of them are written. `flush` writes everything right away and waits for it.
+
+    Failed writes are reported to the error callbacks, or logged to the `notionapi.writebuffer`
+    logger without any, and are not retried.
+
+    Args:
+        api (NotionAPI): The client to write with.
+        window (float, optional): How long updates of a page are collected, in seconds. Defaults to 0.5.
+        max_properties (int, optional): Write a page as soon as this many of its properties are pending. Defaults to 50.
+        max_pages (int, optional): Write everything as soon as this many pages are pending. Defaults to 100.
+        max_workers (int, optional): How many pages to write concurrently. Defaults to 4.
+        limiter (Optional[RateLimiter], optional): A rate budget every write waits for. Defaults to None.
+        clock (Callable[[], float], optional): The monotonic clock used for the window. Defaults to time.monotonic.
+    """
+
+    def __init__(self, api: NotionAPI, window: float = 0.5, max_properties: int = 50, max_pages: int = 100, max_workers: int = 4,
+                 limiter: Optional[RateLimiter] = None, clock: Callable[[], float] = time.monotonic):
+        self.api = api
+        self.window = window
+        self.max_properties = max_properties
+        self.max_pages = max_pages
+        self.limiter = limiter
+        self.updates = 0
+        self.writes = 0
+
+        self._clock = clock
+        self._pending: Dict[str, _Batch] = {}
+        self._in_flight: set = set()
+        self._forcing = 0
+        self._closed = False
+        self._error_callbacks: List[Callable[[str, Dict[str, Any], Exception], None]] = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._condition = threading.Condition()
+        self._timer: Optional[threading.Thread] = None
+
+    def update(self, page_id: str, properties: Dict[str, Any]) -> None:
+        """
+        Queues an update of page properties, in the same form PageAPI.update takes them.
+
+        Args:
+            page_id (str): The ID of the page.
+            properties (Dict[str, Any]): The property values by property name.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The buffer is closed")
+            batch = self._pending.get(page_id)
+            if batch is None:
+                batch = self._pending[page_id] = _Batch(self._clock())
+            batch.properties.update(properties)
+            batch.updates += 1
+            self.updates += 1
+
+            if len(self._pending) >= self.max_pages:
+                self._dispatch(force=True)
+            elif len(batch.properties) >= self.max_properties:
+                self._dispatch(pages=[page_id], force=True)
+            self._start_timer()
+            self._condition.notify_all()
+
+    def on_error(self, callback: Callable[[str, Dict[str, Any], Exception], None]) -> None:
+        """
+        Registers a function to be called with the page ID, the properties and the exception when a write fails.
+        """
+        self._error_callbacks.append(callback)
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of pages with updates not written yet, including those being written.
+        """
+        with self._condition:
+            return len(set(self._pending) | self._in_flight)
+
+    def flush(self) -> None:
+        """
+        Writes all pending updates now and waits until they, and any made during the flush, are written.
+        """
+        with self._condition:
+            self._forcing += 1
+            try:
+                while self._pending or self._in_flight:
+                    self._dispatch(force=True)
+                    self._condition.wait()
+            finally:
+                self._forcing -= 1
+
+    def close(self) -> None:
+        """
+        Flushes the buffer and stops its threads. Further updates raise RuntimeError.
+        """
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._timer is not None:
+            self._timer.join()
+        self._executor.shutdown()
+
+    def __enter__(self) -> 'WriteBehindBuffer':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _start_timer(self) -> None:
+        if self._timer is None:
+            self._timer = threading.Thread(target=self._run_timer, name="notionapi-write-behind", daemon=True)
+            self._timer.start()
+
+    def _run_timer(self) -> None:
+        with self._condition:
+            while not self._closed:
+                self._dispatch(force=self._forcing > 0)
+                waiting = [batch.started for page_id, batch in self._pending.items() if page_id not in self._in_flight]
+                timeout = max(0.0, min(waiting) + self.window - self._clock()) if waiting else None
+                self._condition.wait(timeout)
+
+    def _dispatch(self, pages: Optional[List[str]] = None, force: bool = False) -> None:
+        # Called with the condition held
+        now = self._clock()
+        for page_id in list(pages if pages is not None else self._pending):
+            batch = self._pending.get(page_id)
+            if batch is None or page_id in self._in_flight:
+                continue
+            if force or now - batch.started >= self.window:
+                del self._pending[page_id]
+                self._in_flight.add(page_id)
+                self._executor.submit(self._write, page_id, batch)
+
+    def _write(self, page_id: str, batch: _Batch) -> None:
+        try:
+            if self.limiter:
+                self.limiter.acquire()
+            properties = self.api.page._prepare_properties(page_id, batch.properties)
+            if properties is None:
+                raise ValueError(f"Could not apply the property values to page {page_id}")
+            self.api.page._patch_properties(page_id, properties)
+            with self._condition:
+                self.writes += 1
+        except Exception as e:
+            if self._error_callbacks:
+                for callback in self._error_callbacks:
+                    callback(page_id, batch.properties, e)
+            else:
+                logger.error("Error writing properties of page %s: %s", page_id, e)
+        finally:
+            with self._condition:
+                self._in_flight.discard(page_id)
+                self._condition.notify_all()
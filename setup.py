@@ -9,6 +9,14 @@ setup(
         "pydantic",
         "typing"
     ],
+    entry_points={
+        "console_scripts": ["notionapi=notionapi.cli:main"]
+    },
+    extras_require={
+        "fast": ["orjson"],
+        "http2": ["httpx[http2]"],
+        "pandas": ["pandas"]
+    },
     author="Tony AI Champ",
     author_email="tony@aicha.mp",
     description="A Python module for interacting with the Notion API",
@@ -0,0 +1,41 @@
+import os
+
+from notionapi.crawler import WorkspaceCrawler
+from notionapi.notionapi import NotionAPI
+from notionapi.transport import InMemoryTransport
+
+
+def workspace(method, url, headers, params, body):
+    if url.endswith("/search"):
+        return {"object": "list", "results": [{"object": "page", "id": "root"}], "has_more": False, "next_cursor": None}
+    if url.endswith("/blocks/root/children"):
+        child = {"object": "block", "id": "child", "type": "child_page", "has_children": False}
+        return {"object": "list", "results": [child], "has_more": False, "next_cursor": None}
+    return {"object": "list", "results": [], "has_more": False, "next_cursor": None}
+
+
+def test_completed_crawl_removes_its_checkpoint(tmp_path):
+    api = NotionAPI("secret", transport=InMemoryTransport(workspace))
+    path = str(tmp_path / "crawl.json")
+
+    first = [item.id for item in WorkspaceCrawler(api, checkpoint_path=path, checkpoint_every=1).crawl()]
+    assert not os.path.exists(path)
+    second = [item.id for item in WorkspaceCrawler(api, checkpoint_path=path, checkpoint_every=1).crawl()]
+
+    assert first == ["root", "child"]
+    assert second == first
+
+
+def test_crawl_requests_no_children_below_max_depth():
+    requested = []
+
+    def recording(method, url, headers, params, body):
+        requested.append(url)
+        return workspace(method, url, headers, params, body)
+
+    api = NotionAPI("secret", transport=InMemoryTransport(recording))
+
+    items = [item.id for item in WorkspaceCrawler(api, max_depth=1).crawl(roots=[("page", "root")])]
+
+    assert items == ["child"]
+    assert not any(url.endswith("/blocks/child/children") for url in requested)